@@ -2,7 +2,16 @@ from __future__ import annotations
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, MutableMapping, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Literal,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Union,
+)
 
 import discord
 from redbot.core import Config, commands
@@ -646,7 +655,7 @@ class AdventureMixin(ABC):
     @abstractmethod
     async def get_leaderboard(
         self, positions: int = None, guild: discord.Guild = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         raise NotImplementedError()
 
     @abstractmethod
@@ -656,13 +665,13 @@ class AdventureMixin(ABC):
     @abstractmethod
     async def get_global_scoreboard(
         self, positions: int = None, guild: discord.Guild = None, keyword: str = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         raise NotImplementedError()
 
     @abstractmethod
     async def get_global_negaverse_scoreboard(
         self, positions: int = None, guild: discord.Guild = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         raise NotImplementedError()
 
     @abstractmethod
@@ -680,7 +689,7 @@ class AdventureMixin(ABC):
     @abstractmethod
     async def get_weekly_scoreboard(
         self, positions: int = None, guild: discord.Guild = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         raise NotImplementedError()
 
     #######################################################################
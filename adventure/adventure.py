@@ -25,7 +25,9 @@ from redbot.core.utils.predicates import ReactionPredicate
 from .adventureresult import AdventureResults
 from .adventureset import AdventureSetCommands
 from .backpack import BackPackCommands
+from .backpack_index import backpack_indexes
 from .bank import bank
+from .cache import character_cache
 from .cart import Trader
 from .character import CharacterCommands
 from .charsheet import Character, Item, calculate_sp, has_funds
@@ -41,6 +43,7 @@ from .leaderboards import LeaderboardCommands
 from .loadouts import LoadoutCommands
 from .loot import LootCommands
 from .negaverse import Negaverse
+from .rankings import adventure_rankings
 from .rebirth import RebirthCommands
 from .themeset import ThemesetCommands
 from .types import Monster
@@ -89,9 +92,12 @@ class Adventure(
         user_id: int,
     ):
         await self.config.user_from_id(user_id).clear()
-        await bank._config.user_from_id(
+        character_cache.invalidate(user_id)
+        adventure_rankings.update(user_id, None)
+        backpack_indexes.discard(user_id)
+        await bank._delete_account(
             user_id
-        ).clear()  # This will only ever touch the separate currency, leaving bot economy to be handled by core.
+        )  # This will only ever touch the separate currency, leaving bot economy to be handled by core.
 
     __version__ = "4.0.4"
 
@@ -335,6 +341,10 @@ class Adventure(
             await self._migrate_config(
                 from_version=await self.config.schema_version(), to_version=_SCHEMA_VERSION
             )
+            # Cached characters were built with the old theme's items, sets and pets
+            character_cache.clear()
+            adventure_rankings.clear()
+            backpack_indexes.clear()
             self._daily_bonus = await self.config.daily_bonus.all()
         except Exception as err:
             log.exception("There was an error starting up the cog", exc_info=err)
@@ -648,7 +658,7 @@ class Adventure(
                     if c.last_currency_check + 600 < time.time() or c.bal > c.last_known_currency:
                         c.last_known_currency = await bank.get_balance(user)
                         c.last_currency_check = time.time()
-                    await self.config.user(user).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
         if ctx.message.id in self._reward_message:
             extramsg = self._reward_message.pop(ctx.message.id)
             if extramsg:
@@ -1512,7 +1522,7 @@ class Adventure(
                             {"adventures": c.weekly_score.get("adventures", 0) + 1}
                         )
                         parsed_users.append(user)
-                    await self.config.user(user).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
             attack, diplomacy, magic, run_msg = await self.handle_run(
                 ctx.guild.id, attack, diplomacy, magic, shame=True
             )
@@ -1660,7 +1670,7 @@ class Adventure(
                             await bank.set_balance(user, 0)
                 c.adventures.update({"loses": c.adventures.get("loses", 0) + 1})
                 c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
-                await self.config.user(user).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
             loss_list = []
             result_msg += session.miniboss["defeat"]
             if len(repair_list) > 0:
@@ -2031,7 +2041,7 @@ class Adventure(
                     c.adventures.update({special_action: current_val + 1})
                     c.weekly_score.update({"adventures": c.weekly_score.get("adventures", 0) + 1})
                     parsed_users.append(user)
-                await self.config.user(user).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
 
     async def handle_run(self, guild_id, attack, diplomacy, magic, shame=False):
         runners = []
@@ -2601,7 +2611,7 @@ class Adventure(
                         special.legendary += 1
             if special:
                 c.treasure += special
-            await self.config.user(user).set(await c.to_json(ctx, self.config))
+            await c.save(ctx, self.config)
             return rebirth_text
 
     async def _adv_countdown(self, ctx: commands.Context, seconds, title) -> asyncio.Task:
@@ -2870,3 +2880,6 @@ class Adventure(
         for lock in self.locks.values():
             with contextlib.suppress(Exception):
                 lock.release()
+        character_cache.clear()
+        adventure_rankings.clear()
+        backpack_indexes.clear()
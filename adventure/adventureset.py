@@ -14,10 +14,12 @@ from redbot.core.utils.chat_formatting import bold, box, humanize_list, humanize
 
 from .abc import AdventureMixin
 from .bank import bank
+from .cache import character_cache
 from .charsheet import Character
 from .constants import Slot
 from .converters import DayConverter, PercentageConverter, parse_timedelta
 from .helpers import has_separated_economy, smart_embed
+from .rankings import adventure_rankings
 
 _ = Translator("Adventure", __file__)
 
@@ -388,6 +390,8 @@ class AdventureSetCommands(AdventureMixin):
         """[Owner] Lets you clear multiple users character sheets."""
         for user in users:
             await self.config.user(user).clear()
+            character_cache.invalidate(user.id)
+            adventure_rankings.update(user.id, None)
             await smart_embed(
                 ctx, _("{user}'s character sheet has been erased.").format(user=user)
             )
@@ -433,7 +437,7 @@ class AdventureSetCommands(AdventureMixin):
                     )
             with contextlib.suppress(KeyError):
                 del c.backpack[item.name]
-            await self.config.user(user).set(await c.to_json(self.config))
+            await c.save(ctx, self.config)
         await ctx.send(
             _("{item} removed from {user}.").format(
                 item=box(str(item), lang="ansi"), user=bold(user)
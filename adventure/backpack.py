@@ -2,7 +2,6 @@
 import asyncio
 import contextlib
 import logging
-import random
 import time
 from typing import Optional
 
@@ -16,7 +15,7 @@ from redbot.core.utils.chat_formatting import bold, box, humanize_list, humanize
 from .abc import AdventureMixin
 from .bank import bank
 from .charsheet import Character, Item
-from .constants import HeroClasses, Rarities, Slot
+from .constants import Rarities, Slot
 from .converters import (
     BackpackFilterParser,
     EquipableItemConverter,
@@ -25,7 +24,7 @@ from .converters import (
     RarityConverter,
     SlotConverter,
 )
-from .helpers import ConfirmView, _sell, escape, is_dev, smart_embed
+from .helpers import ConfirmView, _disassemble, _sell, escape, is_dev, smart_embed
 from .menus import BackpackMenu, BaseMenu, SimpleSource
 
 _ = Translator("Adventure", __file__)
@@ -50,9 +49,7 @@ class BackpackSellView(discord.ui.View):
     ):
         character.last_known_currency = await bank.get_balance(self.ctx.author)
         character.last_currency_check = time.time()
-        await self.cog.config.user(self.ctx.author).set(
-            await character.to_json(self.ctx, self.cog.config)
-        )
+        await character.save(self.ctx, self.cog.config)
         self.stop()
         pages = [page for page in pagify(msg, delims=["\n"], page_length=1900)]
         await BaseMenu(
@@ -132,15 +129,11 @@ class BackpackSellView(discord.ui.View):
             currency_name = await bank.get_currency_name(
                 self.ctx.guild,
             )
-            price = 0
             old_owned = self.item.owned
-            count = 0
-            async for _loop_counter in AsyncIter(range(0, self.item.owned), steps=50):
-                price += self.price
-                character.backpack[self.item.name].owned -= 1
-                if character.backpack[self.item.name].owned <= 0:
-                    del character.backpack[self.item.name]
-                count += 1
+            price = self.price * old_owned
+            character.backpack[self.item.name].owned -= old_owned
+            if character.backpack[self.item.name].owned <= 0:
+                del character.backpack[self.item.name]
             msg = _(
                 "**{author}** sold all their {old_item} for {price} {currency_name}.\n"
             ).format(
@@ -180,17 +173,10 @@ class BackpackSellView(discord.ui.View):
                 self.ctx.command.reset_cooldown(self.ctx)
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
-            price = 0
             old_owned = self.item.owned
-            count = 0
-            async for _loop_counter in AsyncIter(
-                range(1, character.backpack[self.item.name].owned), steps=50
-            ):
-                if character.backpack[self.item.name].owned == 1:
-                    break
-                character.backpack[self.item.name].owned -= 1
-                price += self.price
-                count += 1
+            count = max(character.backpack[self.item.name].owned - 1, 0)
+            character.backpack[self.item.name].owned -= count
+            price = self.price * count
 
             if price != 0:
                 msg = _(
@@ -318,7 +304,7 @@ class BackPackCommands(AdventureMixin):
                     )
 
                 c = await c.equip_item(equip, True, is_dev(ctx.author))  # FIXME:
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
         await ctx.send(equip_msg)
 
     @_backpack.command(name="eset", cooldown_after_parsing=True)
@@ -367,7 +353,7 @@ class BackPackCommands(AdventureMixin):
                 )
             for piece in pieces:
                 character = await character.equip_item(piece, from_backpack=True)
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             await smart_embed(
                 ctx,
                 _("I've equipped all pieces of `{set_name}` that you are able to equip.").format(
@@ -429,19 +415,12 @@ class BackPackCommands(AdventureMixin):
                     continue
                 index = min(item.rarity.value, 4)
                 if op == "single":
-                    if character.hc is not HeroClasses.tinkerer:
-                        roll = random.randint(0, 5)
-                        chests = 1
-                    else:
-                        roll = random.randint(0, 3)
-                        chests = random.randint(1, 2)
-                    if roll != 0:
-                        item.owned -= 1
-                        if item.owned <= 0:
-                            del character.backpack[item.name]
-                        await self.config.user(ctx.author).set(
-                            await character.to_json(ctx, self.config)
-                        )
+                    succeeded, chests = _disassemble(character, 1)
+                    item.owned -= 1
+                    if item.owned <= 0:
+                        del character.backpack[item.name]
+                    if not succeeded:
+                        await character.save(ctx, self.config)
                         return await smart_embed(
                             ctx,
                             _(
@@ -449,13 +428,8 @@ class BackPackCommands(AdventureMixin):
                             ).format(item.name),
                         )
                     else:
-                        item.owned -= 1
-                        if item.owned <= 0:
-                            del character.backpack[item.name]
                         character.treasure[index] += chests
-                        await self.config.user(ctx.author).set(
-                            await character.to_json(ctx, self.config)
-                        )
+                        await character.save(ctx, self.config)
                         return await smart_embed(
                             ctx,
                             _(
@@ -465,25 +439,14 @@ class BackPackCommands(AdventureMixin):
                 elif op == "all":
                     disassembled.add(item.name)
                     owned = item.owned
-                    async for _loop_counter in AsyncIter(range(0, owned), steps=100):
-                        if character.hc is not HeroClasses.tinkerer:
-                            roll = random.randint(0, 5)
-                            chests = 1
-                        else:
-                            roll = random.randint(0, 3)
-                            chests = random.randint(1, 2)
-                        if roll != 0:
-                            item.owned -= 1
-                            if item.owned <= 0 and item.name in character.backpack:
-                                del character.backpack[item.name]
-                            failed += 1
-                        else:
-                            item.owned -= 1
-                            if item.owned <= 0 and item.name in character.backpack:
-                                del character.backpack[item.name]
-                            character.treasure[index] += chests
-                            success += 1
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                    succeeded, chests = _disassemble(character, owned)
+                    item.owned -= owned
+                    if item.owned <= 0 and item.name in character.backpack:
+                        del character.backpack[item.name]
+                    character.treasure[index] += chests
+                    success += succeeded
+                    failed += owned - succeeded
+            await character.save(ctx, self.config)
             return await smart_embed(
                 ctx,
                 _(
@@ -556,15 +519,12 @@ class BackPackCommands(AdventureMixin):
                     if slot:
                         if item.slot is not slot:
                             continue
-                    item_price = 0
                     old_owned = item.owned
-                    async for _loop_counter in AsyncIter(range(0, old_owned), steps=100):
-                        item.owned -= 1
-                        item_price += _sell(c, item)
-                        log.debug(f"{item_price=}")
-                        if item.owned <= 0:
-                            del c.backpack[item.name]
-                    item_price = max(item_price, 0)
+                    item.owned -= old_owned
+                    item_price = max(_sell(c, item, amount=old_owned), 0)
+                    log.debug(f"{item_price=}")
+                    if item.owned <= 0:
+                        del c.backpack[item.name]
                     msg += _("{old_item} sold for {price}.\n").format(
                         old_item=str(old_owned) + " " + item.ansi,
                         price=humanize_number(item_price),
@@ -578,7 +538,7 @@ class BackPackCommands(AdventureMixin):
                         await bank.set_balance(ctx.author, e.max_balance)
                 c.last_known_currency = await bank.get_balance(ctx.author)
                 c.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
         msg_list = []
         new_msg = _("{author} sold all their{rarity} items for {price}.\n\n{items}").format(
             author=escape(ctx.author.display_name),
@@ -802,13 +762,9 @@ class BackPackCommands(AdventureMixin):
                                 else:
                                     item.owned = 1
                                     buy_user.backpack[item.name] = item
-                                await self.config.user(buyer).set(
-                                    await buy_user.to_json(ctx, self.config)
-                                )
+                                await buy_user.save(ctx, self.config)
                                 item.owned = newly_owned
-                                await self.config.user(ctx.author).set(
-                                    await c.to_json(ctx, self.config)
-                                )
+                                await c.save(ctx, self.config)
 
                             await trade_msg.edit(
                                 content=(
@@ -989,31 +945,20 @@ class BackPackCommands(AdventureMixin):
                 index = min(item.rarity.value, 4)
                 disassembled.add(item.name)
                 owned = item.owned
-                async for _loop_counter in AsyncIter(range(0, owned), steps=100):
-                    if character.hc is not HeroClasses.tinkerer:
-                        roll = random.randint(0, 5)
-                        chests = 1
-                    else:
-                        roll = random.randint(0, 3)
-                        chests = random.randint(1, 2)
-                    if roll != 0:
-                        item.owned -= 1
-                        if item.owned <= 0 and item.name in character.backpack:
-                            del character.backpack[item.name]
-                        failed += 1
-                    else:
-                        item.owned -= 1
-                        if item.owned <= 0 and item.name in character.backpack:
-                            del character.backpack[item.name]
-                        character.treasure[index] += chests
-                        success += 1
+                succeeded, chests = _disassemble(character, owned)
+                item.owned -= owned
+                if item.owned <= 0 and item.name in character.backpack:
+                    del character.backpack[item.name]
+                character.treasure[index] += chests
+                success += succeeded
+                failed += owned - succeeded
         if (not failed) and (not success):
             return await smart_embed(
                 ctx,
                 _("No items matched your query.").format(),
             )
         else:
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             return await smart_embed(
                 ctx,
                 _(
@@ -1068,13 +1013,10 @@ class BackPackCommands(AdventureMixin):
                 async for slot_name, slot_group in AsyncIter(slots, steps=100):
                     async for item_name, item in AsyncIter(slot_group, steps=100):
                         old_owned = item.owned
-                        item_price = 0
-                        async for _loop_counter in AsyncIter(range(0, old_owned), steps=100):
-                            item.owned -= 1
-                            item_price += _sell(character, item)
-                            if item.owned <= 0 and item.name in character.backpack:
-                                del character.backpack[item.name]
-                        item_price = max(item_price, 0)
+                        item.owned -= old_owned
+                        item_price = max(_sell(character, item, amount=old_owned), 0)
+                        if item.owned <= 0 and item.name in character.backpack:
+                            del character.backpack[item.name]
                         msg += _("{old_item} sold for {price}.\n").format(
                             old_item=str(old_owned) + " " + item.ansi,
                             price=humanize_number(item_price),
@@ -1087,7 +1029,7 @@ class BackPackCommands(AdventureMixin):
                         await bank.set_balance(ctx.author, e.max_balance)
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
             if total_price == 0:
                 return await smart_embed(
                     ctx,
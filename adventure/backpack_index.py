@@ -0,0 +1,293 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Set
+
+from .constants import Rarities, Slot
+
+# Rarities whose items wear down with rebirths, the only ones degrade filters look at
+DEGRADING = (Rarities.legendary, Rarities.ascended, Rarities.event)
+# Filter names and the item attribute they're on, the level filter goes by equip level instead
+STATS = {
+    "strength": "att",
+    "intelligence": "int",
+    "charisma": "cha",
+    "luck": "luck",
+    "dexterity": "dex",
+    "level": "level",
+    "degrade": "degrade",
+}
+RARITY_ORDER = {rarity: index for index, rarity in enumerate(reversed(Rarities))}
+# What an item is indexed by, it differs when an item comes back under its name with other stats
+fingerprint = attrgetter(
+    "slot", "rarity", "set", "att", "int", "cha", "luck", "dex", "lvl", "degrade", "total_stats"
+)
+# Past this share of the backpack changing, the index is built again rather than updated
+REBUILD_RATIO = 0.125
+# Memory budget of the kept indexes, counted in items across all of them
+INDEXED_ITEMS = 100_000
+
+
+class Column:
+    """The values of one stat, sorted, with the name of the item each one belongs to."""
+
+    __slots__ = ("values", "names")
+
+    def __init__(self, values: Dict[str, Any]):
+        self.names: List[str] = sorted(values, key=values.__getitem__)
+        self.values: List[Any] = [values[name] for name in self.names]
+
+    def add(self, value: Any, name: str) -> None:
+        index = bisect_right(self.values, value)
+        self.values.insert(index, value)
+        self.names.insert(index, name)
+
+    def remove(self, value: Any, name: str) -> None:
+        start = bisect_left(self.values, value)
+        end = bisect_right(self.values, value, start)
+        index = self.names.index(name, start, end)
+        del self.values[index]
+        del self.names[index]
+
+    def select(self, query: MutableMapping[str, Any], inclusive_max: bool = False) -> Set[str]:
+        """Names of the items matching a stat filter, as parsed by `BackpackFilterParser`."""
+        if (equal := query.get("equal")) is not None:
+            start = bisect_left(self.values, equal)
+            end = bisect_right(self.values, equal, start)
+        else:
+            start = bisect_right(self.values, query["min"])
+            if inclusive_max:
+                end = bisect_right(self.values, query["max"])
+            else:
+                end = bisect_left(self.values, query["max"])
+        return set(self.names[start:end])
+
+
+class BackpackIndex:
+    """Secondary indexes over a character's backpack.
+
+    Items are looked up by slot, rarity and set, and by ranges of their stats
+    through sorted columns, so a filter only goes through the items that
+    match it. The index follows the backpack by the names in it: `sync` adds
+    and removes what changed since it last looked. Once the character was
+    saved again, items are compared by their stats too, as an item can be
+    sold and come back under the same name with other stats.
+    """
+
+    def __init__(self, backpack: MutableMapping[str, Any], rebirths: int, version: Any = None):
+        self.rebirths = rebirths
+        self.version = version
+        self._build(backpack)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _build(self, backpack: MutableMapping[str, Any]) -> None:
+        self.names: Set[str] = set()
+        self.by_slot: Dict[Slot, Set[str]] = {}
+        self.by_rarity: Dict[Rarities, Set[str]] = {}
+        self.by_set: Dict[Optional[str], Set[str]] = {}
+        self.sort_keys: Dict[str, tuple] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._fingerprints: Dict[str, tuple] = {}
+        for name, item in backpack.items():
+            self._add(name, item)
+        records = self._records.items()
+        self.columns: Dict[str, Column] = {}
+        for column in STATS.values():
+            self.columns[column] = Column({name: r[column] for name, r in records if column in r})
+
+    def _add(self, name: str, item: Any) -> Dict[str, Any]:
+        record = {
+            "slot": item.slot,
+            "rarity": item.rarity,
+            "set": item.set,
+            "att": item.att,
+            "int": item.int,
+            "cha": item.cha,
+            "luck": item.luck,
+            "dex": item.dex,
+            "level": item_equip_level(item, self.rebirths),
+        }
+        if item.rarity in DEGRADING:
+            record["degrade"] = item.degrade
+        self.names.add(name)
+        self.by_slot.setdefault(item.slot, set()).add(name)
+        self.by_rarity.setdefault(item.rarity, set()).add(name)
+        self.by_set.setdefault(item.set, set()).add(name)
+        self.sort_keys[name] = (rarity_index(item.rarity), item.lvl, item.total_stats)
+        self._records[name] = record
+        self._fingerprints[name] = fingerprint(item)
+        return record
+
+    def add(self, name: str, item: Any) -> None:
+        record = self._add(name, item)
+        for column in STATS.values():
+            if column in record:
+                self.columns[column].add(record[column], name)
+
+    def remove(self, name: str) -> None:
+        record = self._records.pop(name)
+        self.names.discard(name)
+        self.by_slot[record["slot"]].discard(name)
+        self.by_rarity[record["rarity"]].discard(name)
+        self.by_set[record["set"]].discard(name)
+        del self.sort_keys[name]
+        del self._fingerprints[name]
+        for column in STATS.values():
+            if column in record:
+                self.columns[column].remove(record[column], name)
+
+    def sync(self, backpack: MutableMapping[str, Any], rebirths: int, version: Any = None) -> None:
+        """Catch up with the items added to, removed from and replaced in the backpack.
+
+        `version` changes whenever the character is saved, items are only
+        compared by their stats when it did.
+        """
+        if rebirths != self.rebirths:
+            # Equip levels and degrades all moved
+            self.rebirths = rebirths
+            self.version = version
+            self._build(backpack)
+            return
+        if version != self.version:
+            self.version = version
+            current = dict(zip(backpack.keys(), map(fingerprint, backpack.values())))
+            removed = {name for name, _ in self._fingerprints.items() - current.items()}
+            added = {name for name, _ in current.items() - self._fingerprints.items()}
+        elif len(backpack) == len(self.names) and self.names.issuperset(backpack):
+            return
+        else:
+            removed = self.names.difference(backpack)
+            added = set(backpack).difference(self.names)
+        if len(removed) + len(added) > max(len(self.names), 1) * REBUILD_RATIO:
+            self._build(backpack)
+            return
+        for name in removed:
+            self.remove(name)
+        for name in added:
+            self.add(name, backpack[name])
+
+    def with_rarity(self, rarities: Iterable[Rarities]) -> Set[str]:
+        return set().union(*(self.by_rarity.get(rarity, ()) for rarity in rarities))
+
+    def with_slot(self, slots: Iterable[Slot]) -> Set[str]:
+        return set().union(*(self.by_slot.get(slot, ()) for slot in slots))
+
+    def with_set(self, sets: Iterable[str]) -> Set[str]:
+        return set().union(*(self.by_set.get(name, ()) for name in sets))
+
+    def with_stat(self, stat: str, query: MutableMapping[str, Any]) -> Set[str]:
+        column = STATS[stat]
+        return self.columns[column].select(query, inclusive_max=column == "att")
+
+    def equippable(self, level: int) -> Set[str]:
+        return self.columns["level"].select({"min": float("-inf"), "max": level}, True)
+
+    def query(
+        self,
+        slots: List[Slot],
+        rarities: List[Rarities],
+        sets: List[str],
+        equippable: Optional[int],
+        stats: Dict[str, MutableMapping[str, Any]],
+        _except: bool,
+    ) -> Set[str]:
+        """Names of the items a backpack filter keeps, before matching their names.
+
+        `equippable` is the character's level when only equippable items are
+        wanted. With `_except`, items matching any of the filters are the ones
+        left out instead.
+        """
+        if _except:
+            left_out = []
+            if slots:
+                left_out.append(self.with_slot(slots))
+            if rarities:
+                left_out.append(self.with_rarity(rarities))
+            if sets:
+                left_out.append(self.with_set(sets))
+            if equippable is not None:
+                left_out.append(self.equippable(equippable))
+            for stat, query in stats.items():
+                if query:
+                    left_out.append(self.with_stat(stat, query))
+            return self.names.difference(*left_out)
+
+        candidates = []
+        if slots:
+            candidates.append(self.with_slot(slots))
+        if sets:
+            # Set filters only keep set items, whatever rarities were asked for
+            candidates.append(self.by_rarity.get(Rarities.set, set()))
+            candidates.append(self.with_set(sets))
+        elif rarities:
+            candidates.append(self.with_rarity(rarities))
+        if equippable is not None:
+            candidates.append(self.equippable(equippable))
+        for stat, query in stats.items():
+            if not query:
+                continue
+            if stat == "degrade":
+                # Only items that wear down are held to it
+                left_out = self.with_rarity(DEGRADING) - self.with_stat(stat, query)
+                candidates.append(self.names - left_out)
+            else:
+                candidates.append(self.with_stat(stat, query))
+        if not candidates:
+            return set(self.names)
+        candidates.sort(key=len)
+        return candidates[0].intersection(*candidates[1:])
+
+
+def item_equip_level(item: Any, rebirths: int) -> int:
+    """The level needed to equip an item after `rebirths` rebirths."""
+    if item.rarity is Rarities.event:
+        return item.lvl
+    return max(item.lvl - min(max(rebirths // 2 - 1, 0), 50), 1)
+
+
+def rarity_index(rarity: Rarities):
+    """Where a rarity sorts in backpacks, the rarest first."""
+    if rarity not in RARITY_ORDER:
+        return float("inf")
+    return RARITY_ORDER[rarity]
+
+
+class BackpackIndexes:
+    """The backpack index of every user that ran a filter lately.
+
+    An index is synced with the backpack it's asked for, so it doesn't need
+    to be told when the backpack changes.
+    """
+
+    def __init__(self, max_items: int = INDEXED_ITEMS):
+        self.max_items = max_items
+        # Least recently used first
+        self._indexes: OrderedDict[int, BackpackIndex] = OrderedDict()
+
+    def get(
+        self, user_id: int, backpack: MutableMapping[str, Any], rebirths: int, version: Any = None
+    ):
+        index = self._indexes.pop(user_id, None)
+        if index is None:
+            index = BackpackIndex(backpack, rebirths, version)
+        else:
+            index.sync(backpack, rebirths, version)
+        self._indexes[user_id] = index
+        items = sum(len(index) for index in self._indexes.values())
+        while items > self.max_items and len(self._indexes) > 1:
+            _, dropped = self._indexes.popitem(last=False)
+            items -= len(dropped)
+        return index
+
+    def discard(self, user_id: int) -> None:
+        self._indexes.pop(user_id, None)
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+backpack_indexes = BackpackIndexes()
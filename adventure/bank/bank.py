@@ -3,8 +3,10 @@ from __future__ import annotations
 import asyncio
 import datetime
 import logging
+from bisect import bisect_left, insort
 from functools import wraps
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+from weakref import WeakValueDictionary
 
 import discord
 from redbot.core import Config, bank, commands, errors
@@ -56,6 +58,8 @@ __all__ = [
 _MAX_BALANCE = 2**63 - 1
 
 _DEFAULT_MEMBER = {"balance": 0, "next_payday": 0}
+# What accounts that were never written to start with
+_NEW_ACCOUNT = {"balance": 250, "next_payday": 0}
 
 
 _config: Config = None
@@ -81,6 +85,120 @@ class AdventureAccount:
         self.next_payday = next_payday
 
 
+class _BalanceIndex:
+    """Every account of the separate economy, ranked from richest to poorest.
+
+    Loaded from config the first time a leaderboard is needed, and kept up to
+    date by every write the bank makes after that.
+    """
+
+    def __init__(self, accounts: Dict[int, dict]):
+        self.accounts: Dict[int, dict] = {
+            user_id: {**_DEFAULT_MEMBER, **data} for user_id, data in accounts.items()
+        }
+        self._ranking: List[Tuple[int, int]] = sorted(
+            (-account["balance"], user_id) for user_id, account in self.accounts.items()
+        )
+        self.total = sum(account["balance"] for account in self.accounts.values())
+
+    def __len__(self) -> int:
+        return len(self.accounts)
+
+    def update(self, user_id: int, **fields) -> None:
+        old = self.remove(user_id)
+        account = self.accounts[user_id] = {**(old or _DEFAULT_MEMBER), **fields}
+        insort(self._ranking, (-account["balance"], user_id))
+        self.total += account["balance"]
+
+    def remove(self, user_id: int) -> Optional[dict]:
+        account = self.accounts.pop(user_id, None)
+        if account is not None:
+            entry = (-account["balance"], user_id)
+            index = bisect_left(self._ranking, entry)
+            if index < len(self._ranking) and self._ranking[index] == entry:
+                del self._ranking[index]
+            self.total -= account["balance"]
+        return account
+
+    def position(self, user_id: int, guild: discord.Guild = None) -> Optional[int]:
+        """Rank of the account, counting only members of ``guild`` when one is given."""
+        account = self.accounts.get(user_id)
+        if account is None:
+            return None
+        index = bisect_left(self._ranking, (-account["balance"], user_id))
+        if guild is None:
+            return index + 1
+        ahead = self._ranking[:index]
+        return sum(1 for _, other_id in ahead if guild.get_member(other_id)) + 1
+
+    def iter_accounts(self) -> Iterator[Tuple[int, dict]]:
+        """Accounts from richest to poorest. Don't write to the bank while iterating."""
+        for _, user_id in self._ranking:
+            yield user_id, self.accounts[user_id]
+
+
+_index: Optional[_BalanceIndex] = None
+# Writes made while the index is loading, replayed onto it once it's loaded
+_index_writes: Optional[List[Tuple[int, Optional[dict]]]] = None
+# Bumped when the index is dropped, so one that was being loaded then isn't kept
+_index_version = 0
+_index_lock: Optional[asyncio.Lock] = None
+_account_locks: "WeakValueDictionary[int, asyncio.Lock]" = WeakValueDictionary()
+
+
+def _account_lock(user_id: int) -> asyncio.Lock:
+    lock = _account_locks.get(user_id)
+    if lock is None:
+        lock = _account_locks[user_id] = asyncio.Lock()
+    return lock
+
+
+async def _get_index() -> _BalanceIndex:
+    global _index, _index_lock, _index_writes
+    if _index is not None:
+        return _index
+    if _index_lock is None:
+        _index_lock = asyncio.Lock()
+    async with _index_lock:
+        if _index is not None:
+            return _index
+        version = _index_version
+        writes = _index_writes = []
+        try:
+            index = _BalanceIndex(await _config.all_users())
+        finally:
+            _index_writes = None
+        for user_id, fields in writes:
+            if fields is None:
+                index.remove(user_id)
+            else:
+                index.update(user_id, **fields)
+        if version == _index_version:
+            _index = index
+        return index
+
+
+def _index_account(user_id: int, **fields) -> None:
+    if _index is not None:
+        _index.update(user_id, **fields)
+    elif _index_writes is not None:
+        _index_writes.append((user_id, fields))
+
+
+def _unindex_account(user_id: int) -> None:
+    if _index is not None:
+        _index.remove(user_id)
+    elif _index_writes is not None:
+        _index_writes.append((user_id, None))
+
+
+def _drop_index() -> None:
+    """Forget the index, it's loaded again the next time it's needed."""
+    global _index, _index_version
+    _index_version += 1
+    _index = None
+
+
 def _encoded_current_time() -> int:
     """Get the current UTC time as a timestamp.
 
@@ -178,6 +296,7 @@ async def set_next_payday(member: Union[discord.Member, discord.User], amount: i
 
     group = _config.user(member)
     await group.next_payday.set(amount)
+    _index_account(member.id, next_payday=amount)
     return amount
 
 
@@ -234,8 +353,15 @@ async def set_balance(
         raise errors.BalanceTooHigh(
             user=member.display_name, max_balance=max_bal, currency_name=currency
         )
+    async with _account_lock(member.id):
+        return await _set_balance(member, amount)
+
+
+async def _set_balance(member: Union[discord.Member, discord.User], amount: int) -> int:
+    """Write a balance that was already checked, with the account locked."""
     group = _config.user(member)
     await group.balance.set(amount)
+    _index_account(member.id, balance=amount)
     return amount
 
 
@@ -265,16 +391,16 @@ async def withdraw_credits(member: discord.Member, amount: int, _forced: bool =
 
     if not isinstance(amount, (int, float)):
         raise TypeError("Withdrawal amount must be of type int, not {}.".format(type(amount)))
-    bal = await get_balance(member)
-    if amount > bal:
-        raise ValueError(
-            "Insufficient funds {} > {}".format(
-                humanize_number(amount, override_locale="en_US"),
-                humanize_number(bal, override_locale="en_US"),
+    async with _account_lock(member.id):
+        bal = await get_balance(member)
+        if amount > bal:
+            raise ValueError(
+                "Insufficient funds {} > {}".format(
+                    humanize_number(amount, override_locale="en_US"),
+                    humanize_number(bal, override_locale="en_US"),
+                )
             )
-        )
-
-    return await set_balance(member, bal - amount)
+        return await _set_balance(member, bal - amount)
 
 
 async def deposit_credits(member: discord.Member, amount: int, _forced: bool = False) -> int:
@@ -301,8 +427,16 @@ async def deposit_credits(member: discord.Member, amount: int, _forced: bool = F
         return await bank.deposit_credits(member=member, amount=amount)
     if not isinstance(amount, (int, float)):
         raise TypeError("Deposit amount must be of type int, not {}.".format(type(amount)))
-    bal = int(await get_balance(member))
-    return await set_balance(member, amount + bal)
+    guild = getattr(member, "guild", None)
+    max_bal = await get_max_balance(guild)
+    async with _account_lock(member.id):
+        bal = int(await get_balance(member))
+        if amount + bal > max_bal:
+            currency = await get_currency_name(guild)
+            raise errors.BalanceTooHigh(
+                user=member.display_name, max_balance=max_bal, currency_name=currency
+            )
+        return await _set_balance(member, amount + bal)
 
 
 async def transfer_credits(
@@ -368,6 +502,7 @@ async def wipe_bank(guild: Optional[discord.Guild] = None) -> None:
     if (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return await bank.wipe_bank(guild=guild)
     await _config.clear_all_users()
+    _drop_index()
 
 
 async def bank_prune(bot: Red, guild: discord.Guild = None, user_id: int = None) -> None:
@@ -417,6 +552,14 @@ async def bank_prune(bot: Red, guild: discord.Guild = None, user_id: int = None)
             user_id = str(user_id)
             if user_id in bank_data:
                 del bank_data[user_id]
+    _drop_index()
+
+
+async def _delete_account(user_id: int) -> None:
+    """Delete a user's account of the separate economy."""
+    async with _account_lock(user_id):
+        await _config.user_from_id(user_id).clear()
+        _unindex_account(user_id)
 
 
 async def get_leaderboard(
@@ -442,17 +585,14 @@ async def get_leaderboard(
     """
     if _forced or (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return await bank.get_leaderboard(positions=positions, guild=guild)
-    raw_accounts = await _config.all_users()
-    if guild is not None:
-        tmp = raw_accounts.copy()
-        for acc in tmp:
-            if not guild.get_member(acc):
-                del raw_accounts[acc]
-    sorted_acc = sorted(raw_accounts.items(), key=lambda x: x[1]["balance"], reverse=True)
-    if positions is None:
-        return sorted_acc
-    else:
-        return sorted_acc[:positions]
+    index = await _get_index()
+    sorted_acc = []
+    for user_id, account in index.iter_accounts():
+        if positions is not None and len(sorted_acc) >= positions:
+            break
+        if guild is None or guild.get_member(user_id):
+            sorted_acc.append((user_id, dict(account)))
+    return sorted_acc
 
 
 async def get_leaderboard_position(
@@ -473,6 +613,10 @@ async def get_leaderboard_position(
     TypeError
         If the bank is currently guild-specific and a `discord.User` object was passed in
     """
+    if not _forced and (cog := _bot.get_cog("Adventure")) is not None and cog._separate_economy:
+        # Matches get_leaderboard(guild=...), which only lists members of the guild
+        guild = None if await bank.is_global() else getattr(member, "guild", None)
+        return (await _get_index()).position(member.id, guild)
     if await is_global():
         guild = None
     else:
@@ -506,11 +650,12 @@ async def get_account(
     if _forced or (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return await bank.get_account(member)
 
-    all_accounts = await _config.all_users()
-    if member.id not in all_accounts:
-        acc_data = {"balance": 250, "next_payday": 0}
+    # An explicit default skips the registered one, so an account never written reads as None
+    raw = await _config.user(member).get_raw(default=None)
+    if raw is None:
+        acc_data = _NEW_ACCOUNT
     else:
-        acc_data = all_accounts[member.id]
+        acc_data = {**_DEFAULT_MEMBER, **raw}
     return AdventureAccount(**acc_data)
 
 
@@ -776,6 +921,11 @@ def cost(amount: int):
             return coro_or_command
 
 
+async def _get_total_balance() -> int:
+    """The credits in every account of the separate economy together."""
+    return (await _get_index()).total
+
+
 def _get_config(_forced: bool = False):
     if _forced or (cog := _bot.get_cog("Adventure")) is None or not cog._separate_economy:
         return bank._config
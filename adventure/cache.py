@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from .charsheet import Character
+
+# Characters nobody used for this long are dropped from the cache
+CHARACTER_IDLE_TIMEOUT = 30 * 60
+# Memory budget of the cache, counted in items across all cached backpacks and gear
+CHARACTER_CACHE_ITEMS = 100_000
+
+
+class CachedCharacter:
+    """A user's cached character, or the data it was last saved with.
+
+    Saving only stores the data, the character is built from it the next time
+    it's needed.
+    """
+
+    __slots__ = ("character", "data", "size", "last_used")
+
+    def __init__(self, character: Optional[Character] = None, data: Optional[dict] = None):
+        self.character = character
+        self.data = data
+        if character is not None:
+            self.size = len(character.backpack) + len(character.get_current_equipment()) + 1
+        else:
+            self.size = len(data.get("backpack", {})) + len(data.get("items", {})) + 1
+        self.last_used = time.monotonic()
+
+
+class CharacterCache:
+    """Characters kept in memory between commands, so they aren't rebuilt from config each time.
+
+    Cached characters are templates, every command gets its own copy to change.
+    Saving a character writes it through to the cache, anything else that changes
+    a user's data directly must `invalidate` them once the write is done.
+
+    Every invalidation bumps the user's version, which keeps a load that raced
+    with a save from being stored.
+    """
+
+    def __init__(
+        self, max_idle: float = CHARACTER_IDLE_TIMEOUT, max_items: int = CHARACTER_CACHE_ITEMS
+    ):
+        self.max_idle = max_idle
+        self.max_items = max_items
+        # Least recently used first
+        self._entries: OrderedDict[int, CachedCharacter] = OrderedDict()
+        self._locks: WeakValueDictionary[int, asyncio.Lock] = WeakValueDictionary()
+        self._versions: Dict[int, int] = {}
+        self._generation = 0
+        self._items = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lock(self, user_id: int) -> asyncio.Lock:
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+        return lock
+
+    def version(self, user_id: int) -> Tuple[int, int]:
+        return self._generation, self._versions.get(user_id, 0)
+
+    def get(self, user_id: int) -> Optional[CachedCharacter]:
+        self._evict_idle()
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            entry.last_used = time.monotonic()
+            self._entries.move_to_end(user_id)
+        return entry
+
+    def put(self, user_id: int, version: Tuple[int, int], character: Character) -> None:
+        """Cache a character that was built while the user was at `version`."""
+        if self.version(user_id) == version:
+            self._set(user_id, CachedCharacter(character=character))
+
+    def store(self, user_id: int, data: dict) -> None:
+        """Write through the data a character is being saved with."""
+        self._bump(user_id)
+        self._set(user_id, CachedCharacter(data=data))
+
+    def invalidate(self, user_id: int) -> None:
+        self._bump(user_id)
+        self._pop(user_id)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._items = 0
+
+    def _bump(self, user_id: int) -> None:
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+
+    def _set(self, user_id: int, entry: CachedCharacter) -> None:
+        self._pop(user_id)
+        self._entries[user_id] = entry
+        self._items += entry.size
+        while self._items > self.max_items and len(self._entries) > 1:
+            self._pop(next(iter(self._entries)))
+
+    def _pop(self, user_id: int) -> None:
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            self._items -= entry.size
+
+    def _evict_idle(self) -> None:
+        deadline = time.monotonic() - self.max_idle
+        while self._entries:
+            user_id, entry = next(iter(self._entries.items()))
+            if entry.last_used >= deadline:
+                break
+            self._pop(user_id)
+
+
+character_cache = CharacterCache()
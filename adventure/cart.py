@@ -97,7 +97,7 @@ class TraderModal(discord.ui.Modal):
                 item = self.item
                 item.owned = number
                 await c.add_to_backpack(item, number=number)
-                await self.cog.config.user(spender).set(await c.to_json(self.ctx, self.cog.config))
+                await c.save(self.ctx, self.cog.config)
                 await interaction.response.send_message(
                     box(
                         _(
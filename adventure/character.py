@@ -13,11 +13,13 @@ from redbot.core.utils.chat_formatting import bold, box, humanize_list, humanize
 
 from .abc import AdventureMixin
 from .bank import bank
+from .cache import character_cache
 from .charsheet import Character, Item
 from .constants import Rarities, Slot
 from .converters import EquipableItemConverter, EquipmentConverter, SkillConverter
 from .helpers import ConfirmView, _title_case, escape, smart_embed
 from .menus import BaseMenu, SimpleSource
+from .tables import ChainedPages
 
 _ = Translator("Adventure", __file__)
 
@@ -98,8 +100,9 @@ class CharacterCommands(AdventureMixin):
                     c.skill["att"] = 0
                     c.skill["cha"] = 0
                     c.skill["int"] = 0
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await self.config.user(ctx.author).last_skill_reset.set(int(time.time()))
+                    character_cache.invalidate(ctx.author.id)
                     await bank.withdraw_credits(ctx.author, offering)
                     await smart_embed(
                         ctx,
@@ -172,7 +175,7 @@ class CharacterCommands(AdventureMixin):
                     c.skill["pool"] -= amount
                     c.skill["int"] += amount
                     spend = "intelligence"
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 await smart_embed(
                     ctx,
                     _("{author}, you permanently raised your {spend} value by {amount}.").format(
@@ -284,10 +287,8 @@ class CharacterCommands(AdventureMixin):
         set_msg += loadout_display
         msg_list.append(box(set_msg, lang="ansi"))
         backpack_contents = await c.get_backpack(set_name=title_cased_set_name, clean=True)
-        if backpack_contents:
-            msg_list.extend(backpack_contents)
         await BaseMenu(
-            source=SimpleSource(msg_list),
+            source=SimpleSource(ChainedPages(msg_list, backpack_contents or [])),
             delete_message_after=True,
             clear_reactions_after=True,
             timeout=180,
@@ -327,7 +328,6 @@ class CharacterCommands(AdventureMixin):
         msg_len = len(msg)
         items_names = set()
         rows = []
-        msgs = []
         async for index, item in AsyncIter(items, steps=100).enumerate(start=1):
             item_name = str(item)
             slots = item.slot
@@ -337,10 +337,8 @@ class CharacterCommands(AdventureMixin):
             items_names.add((item_name, slots, slot_name))
             rows.append(item.row(c.lvl))
         tables = await c.make_backpack_tables(rows, msg)
-        for t in tables:
-            msgs.append(t)
         await BaseMenu(
-            source=SimpleSource([box(c, lang="ansi"), *msgs]),
+            source=SimpleSource(ChainedPages([box(c, lang="ansi")], tables)),
             delete_message_after=True,
             clear_reactions_after=True,
             timeout=180,
@@ -495,7 +493,7 @@ class CharacterCommands(AdventureMixin):
                         break
             if msg:
                 await ctx.send(box(msg, lang="ansi"))
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
             else:
                 await smart_embed(
                     ctx,
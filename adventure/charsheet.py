@@ -4,19 +4,21 @@ from __future__ import annotations
 import logging
 import random
 import time
-from copy import copy
+from copy import copy, deepcopy
 from datetime import date, datetime
+from itertools import chain
 from typing import Any, Dict, List, MutableMapping, Optional, Tuple, Union
 
 import discord
-from beautifultable import ALIGN_LEFT, BeautifulTable
 from discord.ext.commands import check
 from redbot.core import Config, commands
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.chat_formatting import box, escape, humanize_list, humanize_number
+from redbot.core.utils.chat_formatting import escape, humanize_list, humanize_number
 
+from .backpack_index import BackpackIndex, backpack_indexes, item_equip_level, rarity_index
 from .bank import bank
+from .cache import character_cache
 from .constants import (
     DEV_LIST,
     REBIRTH_LVL,
@@ -27,6 +29,8 @@ from .constants import (
     Slot,
     Treasure,
 )
+from .rankings import adventure_rankings
+from .tables import TablePages
 
 log = logging.getLogger("red.angiedale.adventure")
 
@@ -417,12 +421,7 @@ class Character:
         return self.lvl >= self.equip_level(item)
 
     def equip_level(self, item: Item, rebirths=None):
-        level = getattr(self, "rebirths", rebirths)
-        return (
-            item.lvl
-            if item.rarity is Rarities.event
-            else max(item.lvl - min(max(level // 2 - 1, 0), 50), 1)
-        )
+        return item_equip_level(item, getattr(self, "rebirths", rebirths))
 
     def get_stat_value(self, stat: str):
         """Calculates the stats dynamically for each slot of equipment."""
@@ -753,10 +752,7 @@ class Character:
 
     @staticmethod
     def get_rarity_index(rarity: Rarities):
-        if rarity not in [i for i in Rarities]:
-            return float("inf")
-        reverse_rarities = list(reversed(Rarities))
-        return reverse_rarities.index(rarity)
+        return rarity_index(rarity)
 
     async def get_sorted_backpack(
         self, backpack: dict, slot: Optional[Slot] = None, rarity: Optional[Rarities] = None
@@ -817,10 +813,7 @@ class Character:
                 self.backpack[item.name] = item
         return looted
 
-    async def make_backpack_tables(self, items: List[List[str]], title: str = "") -> List[str]:
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        tables = []
+    async def make_backpack_tables(self, items: List[List[str]], title: str = "") -> TablePages:
         headers = [
             "Name",
             "Slot",
@@ -834,22 +827,7 @@ class Character:
             "DEG",
             "SET",
         ]
-        table.columns.header = headers
-
-        footer = _("\nPage {page_num}").format(page_num=len(tables) + 1)
-        for item_index in range(len(items)):
-            footer = _("\nPage {page_num}").format(page_num=len(tables) + 1)
-            item = items[item_index]
-            table.rows.append(item)
-            if len(title + str(table) + footer) > 1900:
-                table.rows.pop()
-                tables.append(box(f"{title} {table} {footer}", lang="ansi"))
-                table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                table.set_style(BeautifulTable.STYLE_RST)
-                table.columns.header = headers
-                table.rows.append(item)
-        tables.append(box(f"{title} {table} {footer}", lang="ansi"))
-        return tables
+        return TablePages(headers, items, title)
 
     async def get_backpack(
         self,
@@ -953,185 +931,52 @@ class Character:
         no_match: Optional[str],
         rarity_exclude: List[str] = None,
     ):
-        tmp = {}
-
-        def _sort(item):
-            return self.get_rarity_index(item[1].rarity), item[1].lvl, item[1].total_stats
-
-        if not _except:
-            async for item_name in AsyncIter(backpack, steps=100):
-                item = backpack[item_name]
-                item_slots = item.slot
-                slot_name = item_slots.get_name()
-                if rarity_exclude is not None and item.rarity.name in rarity_exclude:
-                    continue
-
-                if no_match:
-                    actual_item_name = str(item)
-                    if ignore_case:
-                        if no_match.lower() in actual_item_name.lower():
-                            continue
-                    elif no_match in actual_item_name:
-                        continue
-                if match:
-                    actual_item_name = str(item)
-                    if ignore_case:
-                        if match.lower() not in actual_item_name.lower():
-                            continue
-                    elif match not in actual_item_name:
-                        continue
-                if slots and item_slots not in slots:
-                    continue
-                if sets and item.rarity is not Rarities.set:
-                    continue
-                elif rarities and item.rarity not in rarities:
-                    continue
-                if sets and item.set not in sets:
-                    continue
-                e_level = self.equip_level(item)
-                if equippable and self.lvl < e_level:
-                    continue
-                if degrade and item.rarity in [
-                    Rarities.legendary,
-                    Rarities.ascended,
-                    Rarities.event,
-                ]:
-                    if (d := degrade.get("equal")) is not None:
-                        if item.degrade != d:
-                            continue
-                    elif not degrade["min"] < item.degrade < degrade["max"]:
-                        continue
-                if level:
-                    if (d := level.get("equal")) is not None:
-                        if e_level != d:
-                            continue
-                    elif not level["min"] < e_level < level["max"]:
-                        continue
-                if dexterity:
-                    if (d := dexterity.get("equal")) is not None:
-                        if item.dex != d:
-                            continue
-                    elif not dexterity["min"] < item.dex < dexterity["max"]:
-                        continue
-                if luck:
-                    if (d := luck.get("equal")) is not None:
-                        if item.luck != d:
-                            continue
-                    elif not luck["min"] < item.luck < luck["max"]:
-                        continue
-                if charisma:
-                    if (d := charisma.get("equal")) is not None:
-                        if item.cha != d:
-                            continue
-                    elif not charisma["min"] < item.cha < charisma["max"]:
-                        continue
-                if intelligence:
-                    if (d := intelligence.get("equal")) is not None:
-                        if item.int != d:
-                            continue
-                    elif not intelligence["min"] < item.int < intelligence["max"]:
-                        continue
-                if strength:
-                    if (d := strength.get("equal")) is not None:
-                        if item.att != d:
-                            continue
-                    elif not strength["min"] < item.att <= strength["max"]:
-                        continue
-
-                if slot_name not in tmp:
-                    tmp[slot_name] = []
-                tmp[slot_name].append((item_name, item))
+        if backpack is self.backpack:
+            version = character_cache.version(self.user.id)
+            index = backpack_indexes.get(self.user.id, backpack, self.rebirths, version)
         else:
+            index = BackpackIndex(backpack, self.rebirths)
+        if _except:
             rarities = [] if rarities == [i for i in Rarities] else rarities
             slots = [] if slots == [i for i in Slot] else slots
-            async for item_name in AsyncIter(backpack, steps=100):
-                item = backpack[item_name]
-                item_slots = item.slot
-                slot_name = item_slots.get_name()
-                if rarity_exclude is not None and item.rarity in rarity_exclude:
-                    continue
+        stats = {
+            "strength": strength,
+            "intelligence": intelligence,
+            "charisma": charisma,
+            "luck": luck,
+            "dexterity": dexterity,
+            "level": level,
+            "degrade": degrade,
+        }
+        equip_up_to = self.lvl if equippable else None
+        found = index.query(slots, rarities, sets, equip_up_to, stats, _except)
+        if ignore_case:
+            match = match and match.lower()
+            no_match = no_match and no_match.lower()
 
-                if no_match:
-                    actual_item_name = str(item)
-                    if ignore_case:
-                        if no_match.lower() not in actual_item_name.lower():
-                            continue
-                    elif no_match not in actual_item_name:
-                        continue
-                if match:
-                    actual_item_name = str(item)
-                    if ignore_case:
-                        if match.lower() in actual_item_name.lower():
-                            continue
-                    elif match in actual_item_name:
-                        continue
-                if slots and item_slots in slots:
-                    continue
-                elif rarities and item.rarity in rarities:
-                    continue
-                if sets and item.set in sets:
+        tmp = {}
+        async for item_name in AsyncIter(found, steps=100):
+            item = backpack[item_name]
+            if rarity_exclude is not None and item.rarity.name in rarity_exclude:
+                continue
+            if match or no_match:
+                actual_item_name = str(item).lower() if ignore_case else str(item)
+                if match and (match in actual_item_name) is _except:
                     continue
-                e_level = self.equip_level(item)
-                if equippable and self.lvl >= e_level:
+                if no_match and (no_match in actual_item_name) is not _except:
                     continue
-                if degrade and item.rarity in [
-                    Rarities.legendary,
-                    Rarities.ascended,
-                    Rarities.event,
-                ]:
-                    if (d := degrade.get("equal")) is not None:
-                        if item.degrade == d:
-                            continue
-                    elif degrade["min"] < item.degrade < degrade["max"]:
-                        continue
-                if level:
-                    if (d := level.get("equal")) is not None:
-                        if e_level == d:
-                            continue
-                    elif level["min"] < e_level < level["max"]:
-                        continue
-                if dexterity:
-                    if (d := dexterity.get("equal")) is not None:
-                        if item.dex == d:
-                            continue
-                    elif dexterity["min"] < item.dex < dexterity["max"]:
-                        continue
-                if luck:
-                    if (d := luck.get("equal")) is not None:
-                        if item.luck == d:
-                            continue
-                    elif luck["min"] < item.luck < luck["max"]:
-                        continue
-                if charisma:
-                    if (d := charisma.get("equal")) is not None:
-                        if item.cha == d:
-                            continue
-                    elif charisma["min"] < item.cha < charisma["max"]:
-                        continue
-                if intelligence:
-                    if (d := intelligence.get("equal")) is not None:
-                        if item.int == d:
-                            continue
-                    elif intelligence["min"] < item.int < intelligence["max"]:
-                        continue
-                if strength:
-                    if (d := strength.get("equal")) is not None:
-                        if item.att == d:
-                            continue
-                    elif strength["min"] < item.att <= strength["max"]:
-                        continue
-                if slot_name not in tmp:
-                    tmp[slot_name] = []
-                tmp[slot_name].append((item_name, item))
+            if item.slot not in tmp:
+                tmp[item.slot] = []
+            tmp[item.slot].append((index.sort_keys[item_name], item_name, item))
 
-        slots = sorted(list(tmp.keys()), key=self.get_slot_index)
         final = []
-        async for (idx, slot_name) in AsyncIter(slots, steps=100).enumerate():
-            if tmp[slot_name]:
-                final.append((slot_name, sorted(tmp[slot_name], key=_sort)))
+        for slot in sorted(tmp, key=self.get_slot_index):
+            # Items sorting the same are listed by name
+            tmp[slot].sort(key=lambda entry: entry[:2])
+            final.append((slot.get_name(), [(name, item) for _, name, item in tmp[slot]]))
         return final
 
-    async def get_argparse_backpack(self, query: MutableMapping[str, Any]) -> List[str]:
+    async def get_argparse_backpack(self, query: MutableMapping[str, Any]) -> TablePages:
         delta = query.pop("delta", False)
         equippable = query.pop("equippable", False)
         sets = query.pop("set", [])
@@ -1171,9 +1016,7 @@ class Character:
         msg = _("{author}'s backpack\n\n").format(
             author=escape(self.user.display_name, formatting=True)
         )
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        tables = []
+        rows = []
         headers = [
             "Name",
             "Slot",
@@ -1191,19 +1034,10 @@ class Character:
         if sets or not rarities or "set" in rarities:
             headers.append("SET")
 
-        table.columns.header = headers
-
-        remainder = False
         async for slot_name, slot_group in AsyncIter(bkpk, steps=100):
             slot_name_org = slot_group[0][1].slot
             current_equipped = getattr(self, slot_name_org.name, None)
             async for item_name, item in AsyncIter(slot_group, steps=100):
-                if len(str(table)) > 1500:
-                    tables.append(box(msg + str(table) + f"\nPage {len(tables) + 1}", lang="ansi"))
-                    table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                    table.set_style(BeautifulTable.STYLE_RST)
-                    table.columns.header = headers
-                    remainder = False
                 if delta:
                     att = self.get_equipped_delta(current_equipped, item, "att")
                     cha = self.get_equipped_delta(current_equipped, item, "cha")
@@ -1240,11 +1074,8 @@ class Character:
                     data.append(
                         item.set or "N/A",
                     )
-                table.rows.append(data)
-                remainder = True
-        if remainder:
-            tables.append(box(msg + str(table) + f"\nPage {len(tables) + 1}", lang="ansi"))
-        return tables
+                rows.append(data)
+        return TablePages(headers, rows, msg)
 
     async def get_argparse_backpack_items(
         self, query: MutableMapping[str, Any], rarity_exclude: List[str] = None
@@ -1435,12 +1266,44 @@ class Character:
         user: Union[discord.Member, discord.User],
         daily_bonus_mapping: Dict[str, float],
     ):
-        """Return a Character object from config and user."""
-        data = await config.user(user).all()
+        """Return a Character object from config and user.
+
+        Characters are cached, this returns a copy of the cached one that's free
+        to be changed.
+        """
         try:
             balance = await bank.get_balance(user)
         except Exception:
             balance = 0
+        async with character_cache.lock(user.id):
+            entry = character_cache.get(user.id)
+            current_week = date.today().isocalendar()[1]
+            if (
+                entry is not None
+                and entry.character is not None
+                and entry.character.weekly_score["week"] >= current_week
+            ):
+                character = entry.character
+            else:
+                version = character_cache.version(user.id)
+                if entry is not None and entry.data is not None:
+                    data = deepcopy(entry.data)
+                else:
+                    data = await config.user(user).all()
+                character = await cls._from_data(ctx, config, user, data, daily_bonus_mapping)
+                character_cache.put(user.id, version, character)
+        return character.copy_for(ctx, user, balance, daily_bonus_mapping)
+
+    @classmethod
+    async def _from_data(
+        cls,
+        ctx: commands.Context,
+        config: Config,
+        user: Union[discord.Member, discord.User],
+        data: dict,
+        daily_bonus_mapping: Dict[str, float],
+    ):
+        """Build a Character from the user's config data, which is modified in the process."""
         equipment = {
             k: Item.from_json(ctx, v) if v else None
             for k, v in data["items"].items()
@@ -1528,7 +1391,7 @@ class Character:
             "loadouts": loadouts,
             "heroclass": heroclass,
             "skill": data["skill"],
-            "bal": balance,
+            "bal": 0,
             "user": user,
             "rebirths": data.pop("rebirths", 0),
             "set_items": data.get("set_items", 0),
@@ -1540,6 +1403,30 @@ class Character:
         hero_data["last_currency_check"] = data.get("last_currency_check", 0)
         return cls(**hero_data, ctx=ctx, daily_bonus_mapping=daily_bonus_mapping)
 
+    def copy_for(
+        self,
+        ctx: commands.Context,
+        user: Union[discord.Member, discord.User],
+        balance: int,
+        daily_bonus_mapping: Dict[str, float],
+    ) -> Character:
+        """Return a copy of this character for another command, sharing nothing it can change."""
+        memo = {
+            id(self._ctx): ctx,
+            id(self.user): user,
+            id(self.daily_bonus): daily_bonus_mapping,
+        }
+        # Items are flat, a shallow copy is enough and much cheaper than a deep one.
+        # An item equipped and in the backpack at once stays one item in the copy.
+        for item in chain(self.get_current_equipment(), self.backpack.values()):
+            if id(item) not in memo:
+                clone = copy(item)
+                clone._ctx = ctx
+                memo[id(item)] = clone
+        character = deepcopy(self, memo)
+        character.bal = balance
+        return character
+
     def get_set_item_count(self):
         count_set = 0
         last_slot = ""
@@ -1561,6 +1448,7 @@ class Character:
         return count_set
 
     async def to_json(self, ctx: commands.Context, config: Config) -> dict:
+        """Return the data to save this character with."""
         backpack = {}
         for k, v in self.backpack.items():
             for n, i in v.to_json().items():
@@ -1575,7 +1463,7 @@ class Character:
                 self.heroclass["pet"]["name"], self.heroclass["pet"]
             )
 
-        return {
+        data = {
             "adventures": self.adventures,
             "nega": self.nega,
             "weekly_score": self.weekly_score,
@@ -1607,6 +1495,22 @@ class Character:
             "last_skill_reset": self.last_skill_reset,
             "last_known_currency": self.last_known_currency,
         }
+        return data
+
+    async def save(self, ctx: commands.Context, config: Config) -> dict:
+        """Write this character to config, and cache it once the write went through."""
+        return await self.save_data(config, await self.to_json(ctx, config))
+
+    async def save_data(self, config: Config, data: dict) -> dict:
+        """Write data this character was turned into, like a rebirth, and cache it once written.
+
+        Saves of the same user are serialized, so the cache ends up with what was written last.
+        """
+        async with character_cache.lock(self.user.id):
+            await config.user(self.user).set(data)
+            character_cache.store(self.user.id, deepcopy(data))
+            adventure_rankings.update(self.user.id, data)
+        return data
 
     async def rebirth(self, dev_val: int = None) -> dict:
         if dev_val is None:
@@ -1663,7 +1567,7 @@ class Character:
 
         self.weekly_score.update({"rebirths": self.weekly_score.get("rebirths", 0) + 1})
         self.heroclass["cooldown"] = time.time() + 60  # Set skill cooldown to 60s from rebirth
-        return {
+        data = {
             "adventures": self.adventures,
             "nega": self.nega,
             "weekly_score": self.weekly_score,
@@ -1695,6 +1599,7 @@ class Character:
             "last_known_currency": 0,
             "last_currency_check": 0,
         }
+        return data
 
     def keep_equipped(self):
         items_to_keep = {}
@@ -194,9 +194,7 @@ class ClassAbilities(AdventureMixin):
                             for item in tinker_wep:
                                 del c.backpack[item.name]
                             if current_class is HeroClasses.tinkerer:
-                                await self.config.user(ctx.author).set(
-                                    await c.to_json(ctx, self.config)
-                                )
+                                await c.save(ctx, self.config)
                                 if tinker_wep:
                                     await class_msg.edit(
                                         content=box(
@@ -213,9 +211,7 @@ class ClassAbilities(AdventureMixin):
                                 c.heroclass["pet"] = {}
                                 c.heroclass = clz.to_json()
 
-                                await self.config.user(ctx.author).set(
-                                    await c.to_json(ctx, self.config)
-                                )
+                                await c.save(ctx, self.config)
                                 await self._clear_react(class_msg)
                                 await class_msg.edit(
                                     content=box(
@@ -273,7 +269,7 @@ class ClassAbilities(AdventureMixin):
                         c.heroclass["cooldown"] = (
                             max(300, (900 - max((c.luck - c.total_cha) * 2, 0))) + time.time()
                         )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await self._clear_react(class_msg)
                     await class_msg.edit(content=box(now_class_msg, lang="ansi"), view=None)
                     try:
@@ -442,9 +438,7 @@ class ClassAbilities(AdventureMixin):
                             await user_msg.edit(content=f"{pet_msg}\n{pet_msg2}\n{pet_msg3}")
                             c.heroclass["pet"] = pet_list[pet]
                             c.heroclass["catch_cooldown"] = time.time() + cooldown_time
-                            await self.config.user(ctx.author).set(
-                                await c.to_json(ctx, self.config)
-                            )
+                            await c.save(ctx, self.config)
                         elif roll == 1:
                             bonus = _("But they stepped on a twig and scared it away.")
                             pet_msg3 = box(
@@ -506,7 +500,7 @@ class ClassAbilities(AdventureMixin):
             if c.heroclass["cooldown"] <= time.time():
                 await self._open_chest(ctx, c.heroclass["pet"]["name"], Rarities.pet, character=c)
                 c.heroclass["cooldown"] = time.time() + cooldown_time
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
             else:
                 cooldown_time = c.heroclass["cooldown"] - time.time()
                 return await smart_embed(
@@ -540,7 +534,7 @@ class ClassAbilities(AdventureMixin):
                 )
             if c.heroclass["pet"]:
                 c.heroclass["pet"] = {}
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 return await smart_embed(
                     ctx,
                     _("{user} released their pet into the wild..").format(
@@ -584,7 +578,7 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
 
                     await smart_embed(
                         ctx,
@@ -669,7 +663,7 @@ class ClassAbilities(AdventureMixin):
                 c.heroclass["ability"] = True
                 c.heroclass["cooldown"] = time.time()
                 async with self.get_lock(c.user):
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     if good:
                         await smart_embed(
                             ctx,
@@ -872,7 +866,7 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await smart_embed(
                         ctx,
                         _("{skill} {c} is starting to froth at the mouth... {skill}").format(
@@ -930,7 +924,7 @@ class ClassAbilities(AdventureMixin):
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
 
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await smart_embed(
                         ctx,
                         _("{skill} {c} is focusing all of their energy... {skill}").format(
@@ -986,7 +980,7 @@ class ClassAbilities(AdventureMixin):
                 if c.heroclass["cooldown"] <= time.time():
                     c.heroclass["ability"] = True
                     c.heroclass["cooldown"] = time.time() + cooldown_time
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     await smart_embed(
                         ctx,
                         _("{skill} {c} is whipping up a performance... {skill}").format(
@@ -1197,7 +1191,7 @@ class ClassAbilities(AdventureMixin):
                     c.backpack[x.name].owned -= 1
                     if c.backpack[x.name].owned <= 0:
                         del c.backpack[x.name]
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 # save so the items are eaten up already
                 for item in c.get_current_equipment():
                     if item.rarity is Rarities.forged:
@@ -1234,10 +1228,10 @@ class ClassAbilities(AdventureMixin):
                             del c.backpack[item.name]
                         await ctx.send(created_item)
                         c.backpack[newitem.name] = newitem
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                     else:
                         c.heroclass["cooldown"] = time.time() + cooldown_time
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         mad_forge = box(
                             _(
                                 "{author}, {newitem} got mad at your rejection and blew itself up."
@@ -1248,7 +1242,7 @@ class ClassAbilities(AdventureMixin):
                 else:
                     c.heroclass["cooldown"] = time.time() + cooldown_time
                     c.backpack[newitem.name] = newitem
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                     forged_item = box(
                         _("{author}, your new {newitem} is lurking in your backpack.").format(
                             author=escape(ctx.author.display_name), newitem=newitem
@@ -12,12 +12,14 @@ from redbot.core.utils.chat_formatting import bold, box, humanize_number, pagify
 
 from .abc import AdventureMixin
 from .bank import bank
+from .cache import character_cache
 from .cart import Trader
 from .charsheet import Character
 from .constants import DEV_LIST, Rarities, Slot
 from .converters import RarityConverter, SlotConverter
 from .helpers import escape, is_dev
 from .menus import BaseMenu, SimpleSource
+from .rankings import adventure_rankings
 
 _ = Translator("Adventure", __file__)
 
@@ -98,7 +100,7 @@ class DevCommands(AdventureMixin):
                 return
             for _loop_counter in range(num):
                 await c.add_to_backpack(await self._genitem(ctx, rarity, slot))
-            await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+            await c.save(ctx, self.config)
         await ctx.invoke(self._backpack)
 
     @commands.command()
@@ -111,6 +113,8 @@ class DevCommands(AdventureMixin):
         """
         user_data = await self.config.user_from_id(user_id).all()
         await self.config.user(ctx.author).set(user_data)
+        character_cache.invalidate(ctx.author.id)
+        adventure_rankings.update(ctx.author.id, user_data)
         await ctx.tick()
 
     @commands.command()
@@ -150,8 +154,7 @@ class DevCommands(AdventureMixin):
                 else:
                     withdraw = bal
                     await bank.set_balance(target, 0)
-                character_data = await c.rebirth(dev_val=rebirth_level)
-                await self.config.user(target).set(character_data)
+                await c.save_data(self.config, await c.rebirth(dev_val=rebirth_level))
                 await ctx.send(
                     content=box(
                         _("{c}, congratulations on your rebirth.\nYou paid {bal}.").format(
@@ -184,7 +187,7 @@ class DevCommands(AdventureMixin):
                 c.heroclass["cooldown"] = 0
                 if "catch_cooldown" in c.heroclass:
                     c.heroclass["catch_cooldown"] = 0
-                await self.config.user(target).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
         await ctx.tick()
 
     @commands.command(name="adventurestats")
@@ -5,7 +5,6 @@ import time
 from typing import Literal, Union
 
 import discord
-from beautifultable import ALIGN_LEFT, BeautifulTable
 from redbot.core import commands
 from redbot.core.errors import BalanceTooHigh
 from redbot.core.i18n import Translator
@@ -18,6 +17,7 @@ from .constants import ANSITextColours, Rarities
 from .converters import RarityConverter, Stats
 from .helpers import escape, has_separated_economy, smart_embed
 from .menus import BaseMenu, SimpleSource
+from .tables import TablePages
 
 _ = Translator("Adventure", __file__)
 
@@ -91,7 +91,7 @@ class EconomyCommands(AdventureMixin):
             ):
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
 
     @commands_atransfer.command(name="withdraw", cooldown_after_parsing=True)
     @commands.guild_only()
@@ -266,34 +266,17 @@ class EconomyCommands(AdventureMixin):
             return
 
         sets = await character.get_set_count()
-        table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-        table.set_style(BeautifulTable.STYLE_RST)
-        table.columns.header = [
-            "Name",
-            "Unique Pieces",
-            "Unique Owned",
-        ]
-        msgs = []
-        for k, v in sets.items():
-            if len(str(table)) > 1500:
-                table.rows.sort("Name", reverse=False)
-                msgs.append(box(str(table) + f"\nPage {len(msgs) + 1}", lang="ansi"))
-                table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=500)
-                table.set_style(BeautifulTable.STYLE_RST)
-                table.columns.header = [
-                    "Name",
-                    "Unique Pieces",
-                    "Unique Owned",
-                ]
-            table.rows.append(
-                (
-                    k,
-                    f"{v[0]}",
-                    f" {v[1]}" if v[1] == v[0] else ANSITextColours.red.as_str(v[1]),
-                )
+        rows = [
+            (
+                k,
+                f"{v[0]}",
+                f" {v[1]}" if v[1] == v[0] else ANSITextColours.red.as_str(v[1]),
             )
-        table.rows.sort("Name", reverse=False)
-        msgs.append(box(str(table) + f"\nPage {len(msgs) + 1}", lang="ansi"))
+            for k, v in sorted(sets.items())
+        ]
+        msgs = TablePages(["Name", "Unique Pieces", "Unique Owned"], rows)
+        if not msgs:
+            return await smart_embed(ctx, _("There are no sets to show."))
         await BaseMenu(
             source=SimpleSource(msgs),
             delete_message_after=True,
@@ -349,7 +332,7 @@ class EconomyCommands(AdventureMixin):
             ):
                 character.last_known_currency = await bank.get_balance(ctx.author)
                 character.last_currency_check = time.time()
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
 
     # in economy since it affects the loot economy, might move later
     @commands.group()
@@ -402,7 +385,7 @@ class EconomyCommands(AdventureMixin):
                 log.exception("Error with the new character sheet", exc_info=exc)
                 return
             await c.add_to_backpack(item)
-            await self.config.user(user).set(await c.to_json(ctx, self.config))
+            await c.save(ctx, self.config)
         await ctx.send(
             box(
                 _(
@@ -469,7 +452,7 @@ class EconomyCommands(AdventureMixin):
                     c.treasure.set += number
                 else:
                     c.treasure.normal += number
-                await self.config.user(user).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 chests = c.treasure.ansi
                 await ctx.send(
                     box(
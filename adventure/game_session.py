@@ -337,9 +337,7 @@ class SpecialActionButton(discord.ui.Button):
             if c.heroclass["cooldown"] <= time.time():
                 c.heroclass["ability"] = True
                 c.heroclass["cooldown"] = time.time() + cooldown_time
-                await self.view.cog.config.user(user).set(
-                    await c.to_json(self.view.ctx, self.view.cog.config)
-                )
+                await c.save(self.view.ctx, self.view.cog.config)
                 msg = _("{bless} **{c}** is starting an inspiring sermon. {bless}").format(
                     c=escape(user.display_name), bless=self.view.cog.emojis.skills.bless
                 )
@@ -373,9 +371,7 @@ class SpecialActionButton(discord.ui.Button):
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time()
             async with self.view.cog.get_lock(c.user):
-                await self.view.cog.config.user(user).set(
-                    await c.to_json(self.view.ctx, self.view.cog.config)
-                )
+                await c.save(self.view.ctx, self.view.cog.config)
                 if good:
                     msg = _("{skill} **{c}** is focusing on the monster ahead...{skill}").format(
                         c=escape(user.display_name),
@@ -531,9 +527,7 @@ class SpecialActionButton(discord.ui.Button):
         if c.heroclass["cooldown"] <= time.time():
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
-            await self.view.cog.config.user(user).set(
-                await c.to_json(self.view.ctx, self.view.cog.config)
-            )
+            await c.save(self.view.ctx, self.view.cog.config)
             await smart_embed(
                 None,
                 _("{skill} **{c}** is starting to froth at the mouth... {skill}").format(
@@ -558,9 +552,7 @@ class SpecialActionButton(discord.ui.Button):
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
 
-            await self.view.cog.config.user(user).set(
-                await c.to_json(self.view.ctx, self.view.cog.config)
-            )
+            await c.save(self.view.ctx, self.view.cog.config)
             await smart_embed(
                 None,
                 _("{skill} **{c}** is focusing all of their energy... {skill}").format(
@@ -584,9 +576,7 @@ class SpecialActionButton(discord.ui.Button):
         if c.heroclass["cooldown"] <= time.time():
             c.heroclass["ability"] = True
             c.heroclass["cooldown"] = time.time() + cooldown_time
-            await self.view.cog.config.user(user).set(
-                await c.to_json(self.view.ctx, self.view.cog.config)
-            )
+            await c.save(self.view.ctx, self.view.cog.config)
             await smart_embed(
                 None,
                 _("{skill} **{c}** is whipping up a performance... {skill}").format(
@@ -1,8 +1,9 @@
+import math
 import random
 import re
 import time
 from enum import Enum
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 import discord
 from discord.ext.commands import CheckFailure
@@ -12,7 +13,7 @@ from redbot.core.utils.chat_formatting import escape as _escape
 from redbot.core.utils.common_filters import filter_various_mentions
 
 from .charsheet import Character, Item
-from .constants import DEV_LIST, Rarities
+from .constants import DEV_LIST, HeroClasses, Rarities
 
 _ = Translator("Adventure", __file__)
 
@@ -133,18 +134,57 @@ async def _remaining(epoch):
     return (out, finish, remaining)
 
 
-def _sell(c: Character, item: Item, *, amount: int = 1):
-    if item.rarity is Rarities.ascended:
-        base = (5000, 10000)
-    elif item.rarity is Rarities.legendary:
-        base = (1000, 2000)
-    elif item.rarity is Rarities.epic:
-        base = (500, 750)
-    elif item.rarity is Rarities.rare:
-        base = (250, 500)
-    else:
-        base = (10, 100)
-    price = random.randint(base[0], base[1]) * abs(item.max_main_stat)
+def binomial(n: int, p: float) -> int:
+    """How many of `n` independent tries succeed, each with a chance of `p`.
+
+    Takes the same time for any `n`, so rolling for thousands of copies of
+    an item doesn't take thousands of rolls.
+    """
+    if n <= 0 or p <= 0.0:
+        return 0
+    if p >= 1.0:
+        return n
+    if hasattr(random, "binomialvariate"):  # Python 3.12+
+        return random.binomialvariate(n, p)
+    if p > 0.5:
+        return n - binomial(n, 1.0 - p)
+    if n * p < 10.0:
+        # Devroye's geometric method, skipping from one success to the next
+        successes = tries = 0
+        c = math.log(1.0 - p)
+        while True:
+            tries += math.floor(math.log(1.0 - random.random()) / c) + 1
+            if tries > n:
+                return successes
+            successes += 1
+    # Hörmann's transformed rejection with squeeze (BTRS)
+    spq = math.sqrt(n * p * (1.0 - p))
+    b = 1.15 + 2.53 * spq
+    a = -0.0873 + 0.0248 * b + 0.01 * p
+    c = n * p + 0.5
+    vr = 0.92 - 4.2 / b
+    alpha = (2.83 + 5.1 / b) * spq
+    lpq = math.log(p / (1.0 - p))
+    m = math.floor((n + 1) * p)
+    h = math.lgamma(m + 1) + math.lgamma(n - m + 1)
+    while True:
+        u = random.random() - 0.5
+        us = 0.5 - abs(u)
+        k = math.floor((2.0 * a / us + b) * u + c)
+        if k < 0 or k > n:
+            continue
+        v = random.random()
+        if us >= 0.07 and v <= vr:
+            return k
+        v *= alpha / (a / (us * us) + b)
+        if v <= 0.0 or math.log(v) <= (
+            h - math.lgamma(k + 1) - math.lgamma(n - k + 1) + (k - m) * lpq
+        ):
+            return k
+
+
+def _sell_price(c: Character, item: Item, base: Tuple[int, int], roll: int) -> int:
+    price = roll * abs(item.max_main_stat)
     price += price * max(int((c.total_cha) / 1000), -1)
 
     if c.luck > 0:
@@ -158,6 +198,46 @@ def _sell(c: Character, item: Item, *, amount: int = 1):
     return max(price, base[0])
 
 
+def _sell(c: Character, item: Item, *, amount: int = 1):
+    """The price `amount` copies of an item sell for, every copy priced on its own roll."""
+    if item.rarity is Rarities.ascended:
+        base = (5000, 10000)
+    elif item.rarity is Rarities.legendary:
+        base = (1000, 2000)
+    elif item.rarity is Rarities.epic:
+        base = (500, 750)
+    elif item.rarity is Rarities.rare:
+        base = (250, 500)
+    else:
+        base = (10, 100)
+    rolls = base[1] - base[0] + 1
+    if amount <= rolls:
+        return sum(
+            _sell_price(c, item, base, random.randint(base[0], base[1])) for _ in range(amount)
+        )
+    # Share the copies out between the rolls they could get instead of rolling each one
+    price = 0
+    remaining = amount
+    for roll in range(base[0], base[1] + 1):
+        count = binomial(remaining, 1 / (base[1] - roll + 1))
+        if count:
+            price += count * _sell_price(c, item, base, roll)
+            remaining -= count
+            if not remaining:
+                break
+    return price
+
+
+def _disassemble(c: Character, amount: int = 1) -> Tuple[int, int]:
+    """Disassemble `amount` copies of an item, returns how many worked and the chests they gave."""
+    if c.hc is not HeroClasses.tinkerer:
+        success = binomial(amount, 1 / 6)
+        return success, success
+    success = binomial(amount, 1 / 4)
+    # Tinkerers get one or two chests out of every success
+    return success, success + binomial(success, 1 / 2)
+
+
 def is_dev(user: Union[discord.User, discord.Member]):
     return user.id in DEV_LIST
 
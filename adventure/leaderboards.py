@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
 import logging
-from datetime import date
-from typing import List
+from typing import Sequence
 
 import discord
 from redbot.core import commands
 from redbot.core.i18n import Translator
-from redbot.core.utils import AsyncIter
 
 from .abc import AdventureMixin
 from .helpers import smart_embed
@@ -19,6 +17,7 @@ from .menus import (
     ScoreboardSource,
     WeeklyScoreboardSource,
 )
+from .rankings import LEADERBOARD, NEGAVERSE, WEEKLY, adventure_rankings
 
 _ = Translator("Adventure", __file__)
 
@@ -30,7 +29,7 @@ class LeaderboardCommands(AdventureMixin):
 
     async def get_leaderboard(
         self, positions: int = None, guild: discord.Guild = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         """Gets the Adventure's leaderboard.
 
         Parameters
@@ -43,33 +42,11 @@ class LeaderboardCommands(AdventureMixin):
 
         Returns
         -------
-        `list` of `tuple`
+        `Sequence` of `tuple`
             The sorted leaderboard in the form of :code:`(user_id, raw_account)`
         """
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=100):
-            user_data = {}
-            for item in ["lvl", "rebirths", "set_items"]:
-                if item not in v:
-                    v.update({item: 0})
-            for vk, vi in v.items():
-                if vk in ["lvl", "rebirths", "set_items"]:
-                    user_data.update({vk: vi})
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get("rebirths", 0), x[1].get("lvl", 1), x[1].get("set_items", 0)),
-            reverse=True,
-        )
+        index = await adventure_rankings.get(self.config)
+        sorted_acc = index.entries(LEADERBOARD, guild)
         if positions is None:
             return sorted_acc
         else:
@@ -96,7 +73,7 @@ class LeaderboardCommands(AdventureMixin):
 
     async def get_global_scoreboard(
         self, positions: int = None, guild: discord.Guild = None, keyword: str = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         """Gets the bank's leaderboard.
 
         Parameters
@@ -109,7 +86,7 @@ class LeaderboardCommands(AdventureMixin):
 
         Returns
         -------
-        `list` of `tuple`
+        `Sequence` of `tuple`
             The sorted leaderboard in the form of :code:`(user_id, raw_account)`
 
         Raises
@@ -119,39 +96,8 @@ class LeaderboardCommands(AdventureMixin):
         """
         if keyword is None:
             keyword = "wins"
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for item in ["adventures", "rebirths"]:
-                if item not in v:
-                    if item == "adventures":
-                        v.update({item: {keyword: 0}})
-                    else:
-                        v.update({item: 0})
-
-            for vk, vi in v.items():
-                if vk in ["rebirths"]:
-                    user_data.update({vk: vi})
-                elif vk in ["adventures"]:
-                    for s, sv in vi.items():
-                        if s == keyword:
-                            user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get(keyword, 0), x[1].get("rebirths", 0)),
-            reverse=True,
-        )
+        index = await adventure_rankings.get(self.config)
+        sorted_acc = index.entries(keyword, guild)
         if positions is None:
             return sorted_acc
         else:
@@ -159,7 +105,7 @@ class LeaderboardCommands(AdventureMixin):
 
     async def get_global_negaverse_scoreboard(
         self, positions: int = None, guild: discord.Guild = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         """Gets the bank's leaderboard.
 
         Parameters
@@ -172,7 +118,7 @@ class LeaderboardCommands(AdventureMixin):
 
         Returns
         -------
-        `list` of `tuple`
+        `Sequence` of `tuple`
             The sorted leaderboard in the form of :code:`(user_id, raw_account)`
 
         Raises
@@ -180,29 +126,8 @@ class LeaderboardCommands(AdventureMixin):
         TypeError
             If the bank is guild-specific and no guild was specified
         """
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for vk, vi in v.items():
-                if vk in ["nega"]:
-                    for s, sv in vi.items():
-                        user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get("wins", 0), x[1].get("loses", 0)),
-            reverse=True,
-        )
+        index = await adventure_rankings.get(self.config)
+        sorted_acc = index.entries(NEGAVERSE, guild)
         if positions is None:
             return sorted_acc
         else:
@@ -269,7 +194,7 @@ class LeaderboardCommands(AdventureMixin):
 
     async def get_weekly_scoreboard(
         self, positions: int = None, guild: discord.Guild = None
-    ) -> List[tuple]:
+    ) -> Sequence[tuple]:
         """Gets the bank's leaderboard.
 
         Parameters
@@ -282,7 +207,7 @@ class LeaderboardCommands(AdventureMixin):
 
         Returns
         -------
-        `list` of `tuple`
+        `Sequence` of `tuple`
             The sorted leaderboard in the form of :code:`(user_id, raw_account)`
 
         Raises
@@ -290,38 +215,8 @@ class LeaderboardCommands(AdventureMixin):
         TypeError
             If the bank is guild-specific and no guild was specified
         """
-        current_week = date.today().isocalendar()[1]
-        keyword = "adventures"
-        raw_accounts = await self.config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
-        raw_accounts_new = {}
-        async for (k, v) in AsyncIter(raw_accounts.items(), steps=200):
-            user_data = {}
-            for item in ["weekly_score"]:
-                if item not in v:
-                    if item == "weekly_score":
-                        v.update({item: {keyword: 0, "rebirths": 0}})
-
-            for vk, vi in v.items():
-                if vk in ["weekly_score"]:
-                    if vi.get("week", -1) == current_week:
-                        for s, sv in vi.items():
-                            if s in [keyword]:
-                                user_data.update(vi)
-
-            if user_data:
-                user_data = {k: user_data}
-            raw_accounts_new.update(user_data)
-
-        sorted_acc = sorted(
-            raw_accounts_new.items(),
-            key=lambda x: (x[1].get(keyword, 0), x[1].get("rebirths", 0)),
-            reverse=True,
-        )
+        index = await adventure_rankings.get(self.config)
+        sorted_acc = index.entries(WEEKLY, guild)
         if positions is None:
             return sorted_acc
         else:
@@ -54,7 +54,7 @@ class LoadoutCommands(AdventureMixin):
                     return
             loadout = await Character.save_loadout(c)
             c.loadouts[name] = loadout
-            await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+            await c.save(ctx, self.config)
             await smart_embed(
                 ctx,
                 _("{author}, your current equipment has been saved to {name}.").format(
@@ -83,7 +83,7 @@ class LoadoutCommands(AdventureMixin):
                 )
             else:
                 del c.loadouts[name]
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 await smart_embed(
                     ctx,
                     _("{author}, loadout {name} has been deleted.").format(
@@ -172,7 +172,7 @@ class LoadoutCommands(AdventureMixin):
                 )
             else:
                 c = await c.equip_loadout(name)
-                await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                await c.save(ctx, self.config)
                 try:
                     c = await Character.from_json(ctx, self.config, ctx.author, self._daily_bonus)
                 except Exception as exc:
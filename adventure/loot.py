@@ -103,7 +103,7 @@ class LootCommands(AdventureMixin):
                         # atomically save reduced loot count then lock again when saving inside
                         # open chests
                         c.treasure[redux] -= number
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         items = await self._open_chests(ctx, box_type, number, character=c)
                         msg = _("{}, you've opened the following items:\n\n").format(
                             escape(ctx.author.display_name)
@@ -113,14 +113,12 @@ class LootCommands(AdventureMixin):
                             start=1
                         ):
                             rows.append(item.row(c.lvl))
-                        tables = await c.make_backpack_tables(rows, msg)
-                        for t in tables:
-                            msgs.append(t)
+                        msgs = await c.make_backpack_tables(rows, msg)
                     else:
                         # atomically save reduced loot count then lock again when saving inside
                         # open chests
                         c.treasure[redux] -= 1
-                        await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                        await c.save(ctx, self.config)
                         await self._open_chest(
                             ctx, ctx.author, box_type, character=c
                         )  # returns item and msg
@@ -307,7 +305,7 @@ class LootCommands(AdventureMixin):
                         author=escape(ctx.author.display_name),
                         chests=c.treasure.ansi,
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 else:
                     msg = failed_msg.format(
                         author=escape(ctx.author.display_name), amount=converted
@@ -331,7 +329,7 @@ class LootCommands(AdventureMixin):
                         author=escape(ctx.author.display_name),
                         chests=c.treasure.ansi,
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 else:
                     msg = failed_msg.format(
                         author=escape(ctx.author.display_name), amount=converted
@@ -355,7 +353,7 @@ class LootCommands(AdventureMixin):
                         author=escape(ctx.author.display_name),
                         chests=c.treasure.ansi,
                     )
-                    await self.config.user(ctx.author).set(await c.to_json(ctx, self.config))
+                    await c.save(ctx, self.config)
                 else:
                     msg = failed_msg.format(
                         author=escape(ctx.author.display_name), amount=converted
@@ -378,7 +376,7 @@ class LootCommands(AdventureMixin):
             else:
                 items[item_name] = item
             await character.add_to_backpack(item)
-        await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+        await character.save(ctx, self.config)
         return items
 
     async def _open_chest(
@@ -515,7 +513,7 @@ class LootCommands(AdventureMixin):
                 ),
                 view=None,
             )
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
             return
         await self._clear_react(open_msg)
         if view.result.value == 2:
@@ -548,14 +546,14 @@ class LootCommands(AdventureMixin):
             await self._clear_react(open_msg)
             character.last_known_currency = await bank.get_balance(ctx.author)
             character.last_currency_check = time.time()
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
         elif view.result.value == 1:
             equiplevel = character.equip_level(item)
             if is_dev(ctx.author):
                 equiplevel = 0
             if not character.can_equip(item):
                 await character.add_to_backpack(item)
-                await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+                await character.save(ctx, self.config)
                 return await smart_embed(
                     ctx,
                     f"{bold(ctx.author.display_name)}, you need to be level "
@@ -582,4 +580,4 @@ class LootCommands(AdventureMixin):
                 )
             await open_msg.edit(content=equip_msg, view=None)
             character = await character.equip_item(item, False, is_dev(ctx.author))
-            await self.config.user(ctx.author).set(await character.to_json(ctx, self.config))
+            await character.save(ctx, self.config)
@@ -351,11 +351,7 @@ class EconomySource(menus.ListPageSource):
         header = ""
         if menu.ctx.cog._separate_economy:
             if self._total_balance_sep is None:
-                accounts = await bank._config.all_users()
-                overall = 0
-                for key, value in accounts.items():
-                    overall += value["balance"]
-                self._total_balance_sep = overall
+                self._total_balance_sep = await bank._get_total_balance()
             _total_balance = self._total_balance_sep
         else:
             if self._total_balance_unified is None:
@@ -194,9 +194,7 @@ class Negaverse(AdventureMixin):
                 if items:
                     item_string = "\n".join([f"{v} x{i}" for v, i in items])
                     looted = box(f"{item_string}", lang="ansi")
-                    await self.config.user(ctx.author).set(
-                        await character.to_json(ctx, self.config)
-                    )
+                    await character.save(ctx, self.config)
                 loss_msg = _(
                     ", losing {loss} {currency_name} as {negachar} rifled through their belongings."
                 ).format(loss=loss_string, currency_name=currency_name, negachar=bold(negachar))
@@ -237,9 +235,7 @@ class Negaverse(AdventureMixin):
                     if items:
                         item_string = "\n".join([f"{v} {i}" for v, i in items])
                         looted = box(f"{item_string}", lang="ansi")
-                        await self.config.user(ctx.author).set(
-                            await character.to_json(ctx, self.config)
-                        )
+                        await character.save(ctx, self.config)
                 loss_msg = _(
                     ", losing {loss} {currency_name} as {negachar} rifled through their belongings."
                 ).format(loss=loss_string, currency_name=currency_name, negachar=bold(negachar))
@@ -344,9 +340,7 @@ class Negaverse(AdventureMixin):
                     if items:
                         item_string = "\n".join([f"{i}  - {v}" for v, i in items])
                         looted = box(f"{item_string}", lang="ansi")
-                        await self.config.user(ctx.author).set(
-                            await character.to_json(ctx, self.config)
-                        )
+                        await character.save(ctx, self.config)
                 loss_msg = _(
                     ", losing {loss} {currency_name} as {negachar} looted their backpack."
                 ).format(
@@ -413,9 +407,7 @@ class Negaverse(AdventureMixin):
                     changed = True
 
                 if changed:
-                    await self.config.user(ctx.author).set(
-                        await character.to_json(ctx, self.config)
-                    )
+                    await character.save(ctx, self.config)
 
     @_negaverse_command.error
     async def negaverse_error(self, ctx: commands.Context, error: Exception):
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import discord
+from redbot.core import Config
+
+# Boards are "leaderboard", "nega", "weekly", or the name of an adventure stat for the scoreboards
+LEADERBOARD = "leaderboard"
+NEGAVERSE = "nega"
+WEEKLY = "weekly"
+
+LEADERBOARD_FIELDS = ("lvl", "rebirths", "set_items")
+
+Entry = Tuple[tuple, int]
+
+
+def current_week() -> int:
+    return date.today().isocalendar()[1]
+
+
+def board_entry(board: str, data: dict, week: int) -> Optional[dict]:
+    """What a player shows up with on a board, or None if they aren't on it."""
+    if board == LEADERBOARD:
+        return {field: data.get(field, 0) for field in LEADERBOARD_FIELDS}
+    if board == NEGAVERSE:
+        return dict(data["nega"]) if data.get("nega") else None
+    if board == WEEKLY:
+        weekly = data.get("weekly_score") or {}
+        if weekly.get("week", -1) != week or "adventures" not in weekly:
+            return None
+        return dict(weekly)
+    entry = {"rebirths": data.get("rebirths", 0)}
+    adventures = data.get("adventures") or {board: 0}
+    if board in adventures:
+        entry.update(adventures)
+    return entry
+
+
+def board_key(board: str, entry: dict) -> tuple:
+    """The key players are ranked by on a board, lowest first."""
+    if board == LEADERBOARD:
+        fields = ("rebirths", "lvl", "set_items")
+    elif board == NEGAVERSE:
+        fields = ("wins", "loses")
+    elif board == WEEKLY:
+        fields = ("adventures", "rebirths")
+    else:
+        fields = (board, "rebirths")
+    return tuple(-entry.get(field, 0) for field in fields)
+
+
+def player_data(data: dict) -> dict:
+    """The part of a user's data the boards are built from."""
+    return {
+        "lvl": data.get("lvl", 0),
+        "rebirths": data.get("rebirths", 0),
+        "set_items": data.get("set_items", 0),
+        "adventures": dict(data.get("adventures") or {}),
+        "nega": dict(data.get("nega") or {}),
+        "weekly_score": dict(data.get("weekly_score") or {}),
+    }
+
+
+class RankedEntries(Sequence):
+    """A board as the menus page through it, in the form of ``(user_id, entry)``.
+
+    Entries are only looked up for the page that's shown.
+    """
+
+    def __init__(self, index: AdventureRankingIndex, board: str, ranking: List[Entry]):
+        self._index = index
+        self._board = board
+        self._ranking = ranking
+
+    def __len__(self) -> int:
+        return len(self._ranking)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return [self._entry(user_id) for _, user_id in self._ranking[item]]
+        return self._entry(self._ranking[item][1])
+
+    def _entry(self, user_id: int) -> Tuple[int, dict]:
+        return user_id, self._index.entry(self._board, user_id) or {}
+
+
+class AdventureRankingIndex:
+    """Leaderboard stats of every adventurer, with each board kept sorted.
+
+    A board is sorted the first time it's asked for and kept up to date from
+    then on as characters are saved. The weekly board starts over empty when
+    the week changes, as nobody has a score for the new week yet.
+    """
+
+    def __init__(self, players: Dict[int, dict]):
+        self._players: Dict[int, dict] = {
+            user_id: player_data(data) for user_id, data in players.items()
+        }
+        self._rankings: Dict[str, List[Entry]] = {}
+        self._week = current_week()
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def entry(self, board: str, user_id: int) -> Optional[dict]:
+        data = self._players.get(user_id)
+        if data is None:
+            return None
+        return board_entry(board, data, self._week)
+
+    def sort_key(self, board: str, user_id: int) -> Optional[tuple]:
+        entry = self.entry(board, user_id)
+        return None if entry is None else board_key(board, entry)
+
+    def update(self, user_id: int, data: Optional[dict]) -> None:
+        """Replace a player's stats with what they were saved with, or remove them."""
+        self._check_week()
+        old_keys = {board: self.sort_key(board, user_id) for board in self._rankings}
+        if data is None:
+            self._players.pop(user_id, None)
+        else:
+            self._players[user_id] = player_data(data)
+        for board, ranking in self._rankings.items():
+            old_key = old_keys[board]
+            if old_key is not None:
+                entry = (old_key, user_id)
+                index = bisect_left(ranking, entry)
+                if index < len(ranking) and ranking[index] == entry:
+                    del ranking[index]
+            new_key = self.sort_key(board, user_id)
+            if new_key is not None:
+                insort(ranking, (new_key, user_id))
+
+    def ranking(self, board: str) -> List[Entry]:
+        self._check_week()
+        try:
+            return self._rankings[board]
+        except KeyError:
+            pass
+        ranking = self._rank(board, self._players)
+        self._rankings[board] = ranking
+        return ranking
+
+    def entries(self, board: str, guild: Optional[discord.Guild] = None) -> RankedEntries:
+        """A board from best to worst, only counting members of `guild` if it's given."""
+        ranking = self.ranking(board)
+        if guild is not None:
+            if guild.member_count is not None and guild.member_count < len(ranking):
+                # Cheaper to rank the members than to go through everyone
+                ranking = self._rank(board, (member.id for member in guild.members))
+            else:
+                ranking = [entry for entry in ranking if guild.get_member(entry[1])]
+        return RankedEntries(self, board, ranking)
+
+    def _rank(self, board: str, user_ids: Iterable[int]) -> List[Entry]:
+        ranking = []
+        for user_id in user_ids:
+            key = self.sort_key(board, user_id)
+            if key is not None:
+                ranking.append((key, user_id))
+        ranking.sort()
+        return ranking
+
+    def _check_week(self) -> None:
+        week = current_week()
+        if week != self._week:
+            self._week = week
+            self._rankings.pop(WEEKLY, None)
+
+
+class AdventureRankings:
+    """The adventure leaderboards, loaded from config the first time one is shown.
+
+    After that they're only updated with the characters that are saved, and
+    with the users whose data is changed directly.
+    """
+
+    def __init__(self):
+        self._index: Optional[AdventureRankingIndex] = None
+        # Users saved while the boards are loading, replayed onto them once they're loaded
+        self._saved: Optional[List[Tuple[int, Optional[dict]]]] = None
+        self._version = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get(self, config: Config) -> AdventureRankingIndex:
+        if self._index is not None:
+            return self._index
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._index is not None:
+                return self._index
+            version = self._version
+            saved = self._saved = []
+            try:
+                index = AdventureRankingIndex(await config.all_users())
+            finally:
+                self._saved = None
+            for user_id, data in saved:
+                index.update(user_id, data)
+            # Cleared while loading, what was read might be outdated
+            if version == self._version:
+                self._index = index
+            return index
+
+    def update(self, user_id: int, data: Optional[dict]) -> None:
+        """Move a user on the boards to the data they were saved with, None if it was cleared."""
+        if self._index is not None:
+            self._index.update(user_id, data)
+        elif self._saved is not None:
+            self._saved.append((user_id, None if data is None else player_data(data)))
+
+    def clear(self) -> None:
+        """Forget the boards, they're loaded again when they're needed."""
+        self._version += 1
+        self._index = None
+
+
+adventure_rankings = AdventureRankings()
@@ -147,4 +147,4 @@ class RebirthCommands(AdventureMixin):
                 embed=None,
                 view=None,
             )
-            await self.config.user(ctx.author).set(await c.rebirth())
+            await c.save_data(self.config, await c.rebirth())
@@ -0,0 +1,166 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+from beautifultable import ALIGN_LEFT, BeautifulTable
+from beautifultable.utils import pre_process, termwidth
+from redbot.core.i18n import Translator
+from redbot.core.utils.chat_formatting import box
+
+_ = Translator("Adventure", __file__)
+
+# The longest a page can get, box markers aside
+PAGE_LENGTH = 1900
+TABLE_MAX_WIDTH = 500
+# Rendered pages kept around for the next time they're shown
+RENDERED_PAGES = 512
+
+Row = Tuple
+
+
+def new_table(headers: Iterable[str]) -> BeautifulTable:
+    table = BeautifulTable(default_alignment=ALIGN_LEFT, maxwidth=TABLE_MAX_WIDTH)
+    table.set_style(BeautifulTable.STYLE_RST)
+    table.columns.header = list(headers)
+    return table
+
+
+_TEMPLATE = new_table(["_"])
+
+
+@lru_cache(maxsize=4096)
+def _measure(cell) -> Tuple[int, int]:
+    """The width a cell takes up in a table, and the characters it adds past that."""
+    text = pre_process(cell, _TEMPLATE.detect_numerics, _TEMPLATE.precision, _TEMPLATE.sign.value)
+    width = termwidth(text)
+    return width, len(text) - width
+
+
+class _RenderedPages:
+    def __init__(self, max_pages: int = RENDERED_PAGES):
+        self.max_pages = max_pages
+        self._pages: OrderedDict = OrderedDict()
+
+    def get(self, key) -> Optional[str]:
+        page = self._pages.get(key)
+        if page is not None:
+            self._pages.move_to_end(key)
+        return page
+
+    def put(self, key, page: str) -> None:
+        self._pages[key] = page
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+
+rendered_pages = _RenderedPages()
+
+
+class TablePages(Sequence):
+    """The rows of a table split over as many pages as it takes to fit them in messages.
+
+    Page breaks are worked out from the width of every cell, the same way
+    BeautifulTable lays the table out, so finding them doesn't render anything.
+    A page is only rendered when it's shown, and cached by what's on it, so a
+    backpack that didn't change isn't rendered again.
+    """
+
+    def __init__(
+        self,
+        headers: Iterable[str],
+        rows: Iterable[Row],
+        title: str = "",
+        page_length: int = PAGE_LENGTH,
+    ):
+        self.headers = tuple(headers)
+        self.rows: List[Row] = [tuple(row) for row in rows]
+        self.title = title
+        self.page_length = page_length
+        self._starts = self._paginate() if self.rows else []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[index] for index in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("page index out of range")
+        end = self._starts[item + 1] if item + 1 < len(self) else len(self.rows)
+        rows = tuple(self.rows[self._starts[item] : end])
+        key = (self.title, self.headers, rows, item)
+        page = rendered_pages.get(key)
+        if page is None:
+            page = box(self.title + self._render(rows) + self._footer(item), lang="ansi")
+            rendered_pages.put(key, page)
+        return page
+
+    def _footer(self, page: int) -> str:
+        return _("\nPage {page_num}").format(page_num=page + 1)
+
+    def _render(self, rows: Iterable[Row]) -> str:
+        table = new_table(self.headers)
+        for row in rows:
+            table.rows.append(row)
+        return str(table)
+
+    def _paginate(self) -> List[int]:
+        header = [_measure(cell)[0] for cell in self.headers]
+        starts = [0]
+        widths = list(header)
+        extra = 0
+        for index, row in enumerate(self.rows):
+            cells = [_measure(cell) for cell in row]
+            new_widths = [max(width, cell[0]) for width, cell in zip(widths, cells)]
+            new_extra = extra + sum(cell[1] for cell in cells)
+            start = starts[-1]
+            if index > start and (
+                self._length(len(starts) - 1, start, index + 1, new_widths, new_extra)
+                > self.page_length
+            ):
+                starts.append(index)
+                new_widths = [max(width, cell[0]) for width, cell in zip(header, cells)]
+                new_extra = sum(cell[1] for cell in cells)
+            widths = new_widths
+            extra = new_extra
+        return starts
+
+    def _length(self, page: int, start: int, end: int, widths: List[int], extra: int) -> int:
+        """How long a page showing rows `start` to `end` is."""
+        footer = self._footer(page)
+        # Every column is padded by a space on both sides and separated by one more
+        line = sum(widths) + 3 * len(widths) - 1
+        if line > TABLE_MAX_WIDTH:
+            # The table would get wrapped, only rendering it tells how long it is
+            return len(self.title + self._render(self.rows[start:end]) + footer)
+        # Top border, header, header separator and bottom border around the rows
+        lines = end - start + 4
+        return len(self.title) + lines * line + extra + lines - 1 + len(footer)
+
+
+class ChainedPages(Sequence):
+    """Sequences of pages shown one after the other, like pages written out ahead of tables.
+
+    A page is only looked up when it's shown, so the tables stay lazy.
+    """
+
+    def __init__(self, *parts: Sequence):
+        self.parts = parts
+
+    def __len__(self) -> int:
+        return sum(len(part) for part in self.parts)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[index] for index in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if item >= 0:
+            for part in self.parts:
+                if item < len(part):
+                    return part[item]
+                item -= len(part)
+        raise IndexError("page index out of range")
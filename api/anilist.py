@@ -0,0 +1,181 @@
+import asyncio
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+ANILIST_URL = "https://graphql.anilist.co"
+
+QUERY_PATTERN = re.compile(
+    r"^\s*query\s*\((?P<variables>[^)]*)\)\s*\{\s*(?P<body>(?P<field>\w+).*)\}\s*$", re.S
+)
+VARIABLE_PATTERN = re.compile(r"\$(\w+)")
+
+
+class AniListBatcher:
+    """Combines AniList GraphQL queries sent close together into a single request.
+
+    Every query queued within `window` seconds of the first one is merged
+    into one document. Each query gets its variables suffixed and its
+    top level field aliased so the response can be split back up for
+    every caller.
+
+    Queries are expected to be in the form ``query ($var: Type, ...) { Field (...) { ... } }``
+    with exactly one top level field, which is what all of ours look like.
+    Anything else is sent on its own.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, window: float = 0.05, max_batch: int = 5):
+        self.session = session
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, dict, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def request(self, query: str, variables: Optional[dict] = None) -> dict:
+        """Queue a query and wait for its share of the batched response.
+
+        Returns the response in the same shape AniList would have returned
+        for the query on its own.
+        """
+        if variables is None:
+            variables = {}
+
+        if not QUERY_PATTERN.match(query):
+            return await self._post(query, variables)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((query, variables, future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+        return await future
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._flush_task = None
+        await self._send(self._take_pending())
+
+    def _flush_now(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        asyncio.create_task(self._send(self._take_pending()))
+
+    def _take_pending(self) -> List[Tuple[str, dict, asyncio.Future]]:
+        pending, self._pending = self._pending, []
+        return pending
+
+    def cancel(self) -> None:
+        """Cancel anything still waiting to be sent."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        for _, _, future in self._take_pending():
+            if not future.done():
+                future.cancel()
+
+    async def _send(self, batch: List[Tuple[str, dict, asyncio.Future]]) -> None:
+        if not batch:
+            return
+
+        if len(batch) == 1:
+            query, variables, future = batch[0]
+            try:
+                result = await self._post(query, variables)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            return
+
+        query, variables, fields = self.merge(
+            [(query, variables) for query, variables, _ in batch]
+        )
+
+        try:
+            response = await self._post(query, variables)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for index, result in enumerate(self.split(response, fields)):
+            future = batch[index][2]
+            if not future.done():
+                future.set_result(result)
+
+    async def _post(self, query: str, variables: dict) -> dict:
+        headers = {"content-type": "application/json"}
+        async with self.session.post(
+            ANILIST_URL,
+            data=json.dumps({"query": query, "variables": variables}),
+            headers=headers,
+        ) as response:
+            return await response.json()
+
+    @staticmethod
+    def merge(queries: List[Tuple[str, dict]]) -> Tuple[str, dict, List[str]]:
+        """Merge queries into one document, aliasing query `n` as `qn`.
+
+        Also returns the original top level field name of every query.
+        """
+        definitions = []
+        fields = []
+        bodies = []
+        merged_variables = {}
+
+        for index, (query, variables) in enumerate(queries):
+            match = QUERY_PATTERN.match(query)
+            fields.append(match.group("field"))
+
+            def rename(variable: re.Match) -> str:
+                return f"${variable.group(1)}_{index}"
+
+            for definition in match.group("variables").split(","):
+                if definition.strip():
+                    definitions.append(VARIABLE_PATTERN.sub(rename, definition.strip()))
+            body = VARIABLE_PATTERN.sub(rename, match.group("body").strip())
+            bodies.append(f"q{index}: {body}")
+
+            for name, value in variables.items():
+                merged_variables[f"{name}_{index}"] = value
+
+        query = "query (" + ", ".join(definitions) + ") {\n" + "\n".join(bodies) + "\n}"
+        return query, merged_variables, fields
+
+    @staticmethod
+    def split(response: dict, fields: List[str]) -> List[dict]:
+        """Split a merged response back into one response per query."""
+        data: Dict[str, dict] = response.get("data") or {}
+        errors: Dict[int, list] = {}
+        shared_errors = []
+
+        for error in response.get("errors") or []:
+            path = error.get("path") or []
+            if path and isinstance(path[0], str) and path[0].startswith("q"):
+                try:
+                    errors.setdefault(int(path[0][1:]), []).append(error)
+                    continue
+                except ValueError:
+                    pass
+            shared_errors.append(error)
+
+        results = []
+        for index, field in enumerate(fields):
+            result = {"data": None}
+            if f"q{index}" in data:
+                result["data"] = {field: data[f"q{index}"]}
+            query_errors = errors.get(index, []) + shared_errors
+            if query_errors:
+                result["errors"] = query_errors
+            results.append(result)
+
+        return results
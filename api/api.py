@@ -1,17 +1,29 @@
 import asyncio
+import codecs
 import datetime
-import json
 import logging
 import re
-from random import choice
+from typing import List, Optional
 
 import aiohttp
 import discord
 from redbot.core.bot import Red
+from redbot.core.utils.chat_formatting import box, humanize_number
 from redbot.core.utils.menus import DEFAULT_CONTROLS, commands, menu
 
+from .anilist import AniListBatcher
+from .cache import ResponseCache
+from .tenor import TenorError, TenorPools
+
 log = logging.getLogger("red.angiedale.api")
 
+YOUTUBE_VIDEO_ID = re.compile(r"{\"videoId\":\"(.{11})")
+# One character short of a full match, so nothing is found twice across chunks
+YOUTUBE_MATCH_OVERLAP = len('{"videoId":"') + 10
+YOUTUBE_RESULT_LIMIT = 10
+YOUTUBE_CHUNK_SIZE = 64 * 1024
+YOUTUBE_OFFLOAD_SIZE = 256 * 1024
+
 SEARCH_ANIME_MANGA_QUERY = """
 query ($id: Int, $page: Int, $search: String, $type: MediaType) {
     Page (page: $page, perPage: 10) {
@@ -137,6 +149,25 @@ class API(commands.Cog):
         self.bot = bot
         super().__init__()
 
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.anilist: Optional[AniListBatcher] = None
+        self.cache = ResponseCache()
+        self.tenor: Optional[TenorPools] = None
+
+    async def cog_load(self) -> None:
+        self.session = aiohttp.ClientSession()
+        self.anilist = AniListBatcher(self.session)
+        self.tenor = TenorPools(self.session)
+
+    async def cog_unload(self) -> None:
+        self.cache.cancel()
+        if self.anilist:
+            self.anilist.cancel()
+        if self.tenor:
+            self.tenor.cancel()
+        if self.session:
+            await self.session.close()
+
     async def red_delete_data_for_user(self, **kwargs):
         """Nothing to delete"""
         return
@@ -185,18 +216,14 @@ class API(commands.Cog):
             return items
 
     async def _request(self, query, variables=None):
-        if variables is None:
-            variables = {}
-
-        request_json = {"query": query, "variables": variables}
-
-        headers = {"content-type": "application/json"}
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://graphql.anilist.co", data=json.dumps(request_json), headers=headers
-            ) as response:
-                return await response.json()
+        # Batched with any other AniList lookups made around the same time
+        return await self.cache.get(
+            "anilist",
+            {"query": query, "variables": variables},
+            lambda: self.anilist.request(query, variables),
+            ttl=3600,
+            cacheable=lambda response: response.get("data") and not response.get("errors"),
+        )
 
     async def _search_anime_manga(self, ctx, cmd, entered_title):
         # Outputs MediaStatuses to strings
@@ -464,9 +491,13 @@ class API(commands.Cog):
 
             headers = {"content-type": "application/json"}
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    data = await response.json()
+            async def fetch():
+                async with self.session.get(url, headers=headers, params=params) as response:
+                    return await response.json()
+
+            data = await self.cache.get(
+                "urban", params["term"], fetch, ttl=21600, cacheable=lambda data: data.get("list")
+            )
 
         except aiohttp.ClientError:
             await ctx.send(
@@ -513,6 +544,7 @@ class API(commands.Cog):
             else:
                 messages = []
                 for ud in data["list"]:
+                    ud = dict(ud)  # Don't touch the cached response
                     ud.setdefault("example", "N/A")
                     message = (
                         "<{permalink}>\n {word} by {author}\n\n{description}\n\n"
@@ -559,38 +591,37 @@ class API(commands.Cog):
                 params["q"] = str(search).lower()
             else:
                 url = "https://api.tenor.com/v1/trending"
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as r:
-                    if r.status == 404:
-                        message = await ctx.maybe_send_embed("Unknown error")
-                        await asyncio.sleep(10)
-                        try:
-                            await message.delete()
-                        except (discord.errors.NotFound, discord.errors.Forbidden):
-                            pass
+
+            try:
+                result = await self.tenor.get(url, params)
+            except (TenorError, aiohttp.ClientError):
+                message = await ctx.maybe_send_embed("Unknown error")
+                await asyncio.sleep(10)
+                try:
+                    await message.delete()
+                except (discord.errors.NotFound, discord.errors.Forbidden):
+                    pass
+            else:
+                try:
+                    embed = discord.Embed(
+                        color=await self.bot.get_embed_color(ctx), title=result["title"]
+                    )
+                    if search:
+                        embed.set_author(name=f"Result for {search}")
                     else:
-                        data = await r.json(encoding="utf-8")
-                        try:
-                            result = choice(data["results"])
-                            embed = discord.Embed(
-                                color=await self.bot.get_embed_color(ctx), title=result["title"]
-                            )
-                            if search:
-                                embed.set_author(name=f"Result for {search}")
-                            else:
-                                embed.set_author(name=f"Trending image on tenor")
-                            embed.set_image(url=result["media"][0]["gif"]["url"])
-                            embed.set_footer(text="Powered by tenor")
-                            await ctx.send(embed=embed)
-                        except:
-                            message = await ctx.maybe_send_embed(
-                                "Could not find a gif for that search term."
-                            )
-                            await asyncio.sleep(10)
-                            try:
-                                await message.delete()
-                            except (discord.errors.NotFound, discord.errors.Forbidden):
-                                pass
+                        embed.set_author(name=f"Trending image on tenor")
+                    embed.set_image(url=result["media"][0]["gif"]["url"])
+                    embed.set_footer(text="Powered by tenor")
+                    await ctx.send(embed=embed)
+                except:
+                    message = await ctx.maybe_send_embed(
+                        "Could not find a gif for that search term."
+                    )
+                    await asyncio.sleep(10)
+                    try:
+                        await message.delete()
+                    except (discord.errors.NotFound, discord.errors.Forbidden):
+                        pass
 
         else:
             message = await ctx.maybe_send_embed("No api token")
@@ -600,23 +631,52 @@ class API(commands.Cog):
             except (discord.errors.NotFound, discord.errors.Forbidden):
                 pass
 
+    async def _youtube_search(self, query: str) -> List[str]:
+        """Read the search page chunk by chunk and stop once we have enough videos.
+
+        Pages are around a megabyte, so once that much comes in the scanning
+        is moved off the event loop.
+        """
+        headers = {"user-agent": "Red-cog/3.0"}
+        loop = asyncio.get_running_loop()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+        video_ids: List[str] = []
+        tail = ""
+        received = 0
+
+        async with self.session.get(
+            "https://www.youtube.com/results",
+            params={"search_query": query},
+            headers=headers,
+        ) as r:
+            large = (r.content_length or 0) >= YOUTUBE_OFFLOAD_SIZE
+            async for chunk in r.content.iter_chunked(YOUTUBE_CHUNK_SIZE):
+                received += len(chunk)
+                # Keep the end of the previous chunk around in case a match was cut in half
+                text = tail + decoder.decode(chunk)
+                tail = text[-YOUTUBE_MATCH_OVERLAP:]
+
+                if large or received >= YOUTUBE_OFFLOAD_SIZE:
+                    found = await loop.run_in_executor(None, YOUTUBE_VIDEO_ID.findall, text)
+                else:
+                    found = YOUTUBE_VIDEO_ID.findall(text)
+
+                for video_id in found:
+                    if video_id not in video_ids:
+                        video_ids.append(video_id)
+                if len(video_ids) >= YOUTUBE_RESULT_LIMIT:
+                    break
+
+        return [
+            f"https://www.youtube.com/watch?v={video_id}"
+            for video_id in video_ids[:YOUTUBE_RESULT_LIMIT]
+        ]
+
     async def _youtube_results(self, query: str):
         try:
-            headers = {"user-agent": "Red-cog/3.0"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://www.youtube.com/results",
-                    params={"search_query": query},
-                    headers=headers,
-                ) as r:
-                    result = await r.text()
-            yt_find = re.findall(r"{\"videoId\":\"(.{11})", result)
-            url_list = []
-            for track in yt_find:
-                url = f"https://www.youtube.com/watch?v={track}"
-                if url not in url_list:
-                    url_list.append(url)
-
+            url_list = await self.cache.get(
+                "youtube", query, lambda: self._youtube_search(query), ttl=3600, cacheable=bool
+            )
         except Exception as e:
             url_list = [f"Something went terribly wrong! [{e}]"]
 
@@ -630,3 +690,49 @@ class API(commands.Cog):
             await menu(ctx, result, DEFAULT_CONTROLS)
         else:
             await ctx.send("Nothing found. Try again later.")
+
+    @commands.is_owner()
+    @commands.group(hidden=True)
+    async def apicache(self, ctx: commands.Context):
+        """Inspect the API response cache."""
+
+    @apicache.command(name="stats")
+    async def apicache_stats(self, ctx: commands.Context):
+        """Show hit ratios for every cached endpoint."""
+        if not self.cache.stats:
+            return await ctx.send("Nothing has been looked up yet.")
+
+        lines = [
+            f"{'Endpoint':<10}{'Hits':>8}{'Stale':>8}{'Misses':>8}"
+            f"{'Refresh':>9}{'Errors':>8}{'Ratio':>8}"
+        ]
+        for endpoint, stats in sorted(self.cache.stats.items()):
+            lines.append(
+                f"{endpoint:<10}"
+                f"{stats.hits:>8}"
+                f"{stats.stale_hits:>8}"
+                f"{stats.misses:>8}"
+                f"{stats.refreshes:>9}"
+                f"{stats.errors:>8}"
+                f"{stats.hit_ratio:>8.1%}"
+            )
+        lines.append("")
+        lines.append(
+            f"{humanize_number(len(self.cache))} entries using "
+            f"{humanize_number(self.cache.size // 1024)}/"
+            f"{humanize_number(self.cache.max_size // 1024)} KiB, "
+            f"{humanize_number(self.cache.evictions)} evicted"
+        )
+        if self.tenor:
+            lines.append(
+                f"{humanize_number(len(self.tenor))} gif pools, "
+                f"{humanize_number(self.tenor.hits)} served from memory, "
+                f"{humanize_number(self.tenor.fetches)} tenor requests"
+            )
+        await ctx.send(box("\n".join(lines)))
+
+    @apicache.command(name="clear")
+    async def apicache_clear(self, ctx: commands.Context, endpoint: str = None):
+        """Clear the cache, or only the entries for one endpoint."""
+        self.cache.invalidate(endpoint)
+        await ctx.tick()
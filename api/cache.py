@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+log = logging.getLogger("red.angiedale.api")
+
+CacheKey = Tuple[str, Hashable]
+
+
+def normalize_query(query: Any) -> Hashable:
+    """Turn a query into a stable cache key.
+
+    Strings are lowercased and have their whitespace collapsed,
+    anything else is serialized with sorted keys.
+    """
+    if isinstance(query, str):
+        return " ".join(query.lower().split())
+    return json.dumps(query, sort_keys=True, default=str)
+
+
+class CacheEntry:
+    __slots__ = ("value", "size", "fetched_at")
+
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+        self.fetched_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+
+class EndpointStats:
+    __slots__ = ("hits", "stale_hits", "misses", "refreshes", "errors")
+
+    def __init__(self):
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    @property
+    def requests(self) -> int:
+        return self.hits + self.stale_hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        if not self.requests:
+            return 0.0
+        return (self.hits + self.stale_hits) / self.requests
+
+
+class ResponseCache:
+    """Size bounded TTL cache for API responses that serves stale entries while refreshing.
+
+    Entries younger than their `ttl` are served as is. Older entries are
+    still served for up to `stale_for` seconds past that, while a single
+    background task fetches a fresh copy. After that they count as missing.
+
+    The cache is kept under `max_size` bytes, measured by the serialized
+    size of each response, by evicting the least recently used entries.
+    """
+
+    def __init__(self, max_size: int = 8 * 1024 * 1024, stale_for: float = 86400):
+        self.max_size = max_size
+        self.stale_for = stale_for
+        self.size = 0
+        self.evictions = 0
+        self.stats: Dict[str, EndpointStats] = {}
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self._refreshing: Set[CacheKey] = set()
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(
+        self,
+        endpoint: str,
+        query: Any,
+        fetch: Callable[[], Awaitable[Any]],
+        ttl: float,
+        cacheable: Callable[[Any], bool] = lambda value: value is not None,
+    ) -> Any:
+        """Get a response from the cache, calling `fetch` when there's nothing usable.
+
+        `fetch` should raise on failure. Responses that `cacheable` rejects,
+        by default `None`, are returned without being stored.
+        """
+        key = (endpoint, normalize_query(query))
+        stats = self.stats.setdefault(endpoint, EndpointStats())
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            age = entry.age
+            if age < ttl:
+                stats.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < ttl + self.stale_for:
+                stats.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    task = asyncio.create_task(self._refresh(key, fetch, cacheable, stats))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_tasks.discard)
+                return entry.value
+
+        stats.misses += 1
+        return await self._fetch(key, fetch, cacheable, stats)
+
+    async def _fetch(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+        stats: EndpointStats,
+    ) -> Any:
+        """Fetch and store a response, sharing the request with anyone else waiting on it."""
+        try:
+            return await asyncio.shield(self._inflight[key])
+        except KeyError:
+            pass
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+        except BaseException as e:
+            stats.errors += 1
+            if not future.cancelled():
+                future.set_exception(e)
+                future.exception()  # Nobody might be waiting, don't warn about it
+            raise
+        else:
+            future.set_result(value)
+            if cacheable(value):
+                self._store(key, value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def _refresh(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Awaitable[Any]],
+        cacheable: Callable[[Any], bool],
+        stats: EndpointStats,
+    ) -> None:
+        stats.refreshes += 1
+        try:
+            await self._fetch(key, fetch, cacheable, stats)
+        except Exception as e:
+            log.debug(f"Background refresh of {key} failed, serving stale entry", exc_info=e)
+        finally:
+            self._refreshing.discard(key)
+
+    def _store(self, key: CacheKey, value: Any) -> None:
+        try:
+            size = len(json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            size = len(repr(value))
+
+        if size > self.max_size:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.size -= old.size
+
+        self._entries[key] = CacheEntry(value, size)
+        self.size += size
+
+        while self.size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """Drop every entry, or just the ones belonging to `endpoint`."""
+        for key in list(self._entries):
+            if endpoint is None or key[0] == endpoint:
+                self.size -= self._entries.pop(key).size
+
+    def cancel(self) -> None:
+        for task in self._refresh_tasks:
+            task.cancel()
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+log = logging.getLogger("red.angiedale.api")
+
+PoolKey = Tuple[str, Optional[str], str]
+
+
+class TenorError(Exception):
+    pass
+
+
+class GifPool:
+    __slots__ = ("url", "params", "results", "recent", "expires_at", "refill_task")
+
+    def __init__(self, url: str, params: dict, ttl: float, remember: int):
+        self.url = url
+        self.params = params
+        self.results: Deque[dict] = deque()
+        # Ids that were recently handed out, so a refill doesn't bring them right back
+        self.recent: Deque[str] = deque(maxlen=remember)
+        self.expires_at = time.monotonic() + ttl
+        self.refill_task: Optional[asyncio.Task] = None
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+class TenorPools:
+    """Per query pools of prefetched tenor results.
+
+    Gifs are handed out from memory and the pool is topped up in the
+    background whenever it drops below `watermark`. Results that were
+    handed out recently aren't added back in, and a pool is thrown away
+    `ttl` seconds after it was first filled.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        watermark: int = 10,
+        ttl: float = 1800,
+        max_pools: int = 500,
+    ):
+        self.session = session
+        self.watermark = watermark
+        self.ttl = ttl
+        self.max_pools = max_pools
+        self.hits = 0
+        self.fetches = 0
+        self._pools: Dict[PoolKey, GifPool] = {}
+
+    def __len__(self) -> int:
+        return len(self._pools)
+
+    async def get(self, url: str, params: dict) -> Optional[dict]:
+        """Get a gif for the query in `params`.
+
+        Returns `None` if tenor has nothing for it and raises :class:`TenorError`
+        if tenor couldn't be reached.
+        """
+        key = (url, params.get("q"), params["contentfilter"])
+        pool = self._pools.get(key)
+
+        if pool is None or pool.expired:
+            self._evict()
+            pool = self._pools[key] = GifPool(url, params, self.ttl, params["limit"] * 2)
+        else:
+            pool.params = params  # The token might have changed
+
+        if not pool.results:
+            if pool.refill_task is None:
+                pool.refill_task = asyncio.create_task(self._refill(pool))
+            await asyncio.shield(pool.refill_task)
+            if not pool.results:
+                self._pools.pop(key, None)
+                return None
+        else:
+            self.hits += 1
+
+        result = pool.results.popleft()
+        pool.recent.append(result["id"])
+
+        if len(pool.results) < self.watermark and pool.refill_task is None:
+            pool.refill_task = asyncio.create_task(self._background_refill(pool))
+
+        return result
+
+    async def _background_refill(self, pool: GifPool) -> None:
+        try:
+            await self._refill(pool)
+        except Exception as e:
+            log.debug(f"Failed to top up tenor pool for {pool.params.get('q')}", exc_info=e)
+
+    async def _refill(self, pool: GifPool) -> None:
+        try:
+            self.fetches += 1
+            async with self.session.get(pool.url, params=pool.params) as r:
+                if r.status == 404:
+                    raise TenorError("Unknown error")
+                data = await r.json(encoding="utf-8")
+
+            results: List[dict] = data.get("results") or []
+            pooled: Set[str] = {result["id"] for result in pool.results}
+            recent: Set[str] = set(pool.recent)
+            fresh = [
+                result
+                for result in results
+                if result.get("id") not in pooled and result.get("id") not in recent
+            ]
+            if not fresh:
+                # Tenor has nothing new for us, like with trending, so go
+                # through the ones we've seen again starting with the oldest
+                order = {result_id: index for index, result_id in enumerate(pool.recent)}
+                fresh = sorted(
+                    (result for result in results if result.get("id") not in pooled),
+                    key=lambda result: order.get(result.get("id"), -1),
+                )
+            else:
+                random.shuffle(fresh)
+            pool.results.extend(fresh)
+        finally:
+            pool.refill_task = None
+
+    def _evict(self) -> None:
+        """Drop expired pools, and the oldest ones if there's still too many."""
+        for key, pool in list(self._pools.items()):
+            if pool.expired:
+                self._drop(key)
+        while len(self._pools) >= self.max_pools:
+            self._drop(next(iter(self._pools)))
+
+    def _drop(self, key: PoolKey) -> None:
+        pool = self._pools.pop(key)
+        if pool.refill_task:
+            pool.refill_task.cancel()
+
+    def cancel(self) -> None:
+        for pool in self._pools.values():
+            if pool.refill_task:
+                pool.refill_task.cancel()
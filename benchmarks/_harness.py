@@ -0,0 +1,117 @@
+import asyncio
+import gc
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, Union
+
+
+class BenchResult:
+    """Timing and allocation figures for a single benchmark.
+
+    Attributes
+    ----------
+    name: :class:`str`
+        Name of the benchmark.
+    iterations: :class:`int`
+        How many times the target was called.
+    elapsed: :class:`float`
+        Total seconds spent inside the target, setup excluded.
+    allocated: :class:`int`
+        Bytes still held after a call (the result included),
+        averaged over a separate traced run.
+    peak: :class:`int`
+        Highest traced memory use in bytes seen during any single call.
+    """
+
+    def __init__(self, name: str, iterations: int, elapsed: float, allocated: int, peak: int):
+        self.name = name
+        self.iterations = iterations
+        self.elapsed = elapsed
+        self.allocated = allocated
+        self.peak = peak
+
+    @property
+    def per_second(self) -> float:
+        return self.iterations / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def per_call(self) -> float:
+        return self.elapsed / self.iterations if self.iterations else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.name:<24} "
+            f"{self.per_second:>12,.1f} ops/s  "
+            f"{self.per_call * 1e6:>10,.1f} us/op  "
+            f"{self.allocated / 1024:>9,.1f} KiB kept/op  "
+            f"{self.peak / 1024:>9,.1f} KiB peak"
+        )
+
+
+Target = Callable[..., Union[Any, Awaitable[Any]]]
+Setup = Callable[[], Tuple[tuple, dict]]
+
+
+async def _call(target: Target, args: tuple, kwargs: dict) -> Any:
+    result = target(*args, **kwargs)
+    if asyncio.iscoroutine(result):
+        result = await result
+    return result
+
+
+async def bench(
+    name: str,
+    target: Target,
+    setup: Optional[Setup] = None,
+    iterations: int = 1000,
+    warmup: int = 10,
+    traced: int = 50,
+) -> BenchResult:
+    """Time `target` and measure its allocations.
+
+    `setup` is called before every call and returns the `(args, kwargs)` to
+    call `target` with. Time spent in `setup` is not counted.
+
+    Allocations are measured in a separate, shorter run since tracemalloc
+    slows everything down enough to make the timings useless.
+    """
+
+    def arguments() -> Tuple[tuple, dict]:
+        return setup() if setup is not None else ((), {})
+
+    for _ in range(warmup):
+        await _call(target, *arguments())
+
+    gc.collect()
+    gc.disable()
+    try:
+        elapsed = 0.0
+        for _ in range(iterations):
+            args, kwargs = arguments()
+            start = time.perf_counter()
+            await _call(target, args, kwargs)
+            elapsed += time.perf_counter() - start
+    finally:
+        gc.enable()
+
+    allocated = 0
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(traced):
+            args, kwargs = arguments()
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = await _call(target, args, kwargs)
+            current, highest = tracemalloc.get_traced_memory()
+            allocated += max(current - before, 0)
+            peak = max(peak, highest - before)
+            del result
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(name, iterations, elapsed, allocated // max(traced, 1), peak)
+
+
+def report(results: List[BenchResult]) -> str:
+    return "\n".join(str(result) for result in results)
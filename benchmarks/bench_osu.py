@@ -0,0 +1,251 @@
+"""Offline benchmarks for the hot paths of the osu! cog.
+
+Recorded API responses in `fixtures/osu` are replayed through a fake
+`OssapiAsync` and the leaderboard is stored in mongomock, so no network,
+MongoDB server or Discord connection is needed.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_osu [--iterations N]
+
+The cog is written against Angiedale's fork of Red, with a stock Red the
+benchmarks are skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import json
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import discord
+import mongomock
+from ossapi import GameMode, OssapiAsync
+from ossapi import Score as OsuScore
+from ossapi import ScoreType
+from ossapi.ossapiv2_async import Domain, Grant, Scope
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks._harness import bench, report  # noqa: E402
+
+try:
+    from osu.osu import Osu
+    from osu.utils.beatmapparser import parse_beatmap
+    from osu.utils.classes import CommandParams, DatabaseLeaderboard
+except ImportError as e:
+    # Stock Red doesn't have the utilities the cog imports from the fork
+    OSU_IMPORT_ERROR: Optional[ImportError] = e
+else:
+    OSU_IMPORT_ERROR = None
+
+FIXTURES = Path(__file__).parent / "fixtures" / "osu"
+USER_ID = 5339515
+BEATMAP_FILE = FIXTURES / "2097898.osu"
+
+
+class FakeOssapi(OssapiAsync):
+    """`OssapiAsync` that answers from recorded responses instead of the API.
+
+    Responses are looked up by request path, `/users/1/scores/best`
+    turning into `users_1_scores_best.json`, and deserialized through
+    ossapi itself so the models are identical to live ones.
+    """
+
+    def __init__(self, fixtures: Path = FIXTURES):
+        self.fixtures = fixtures
+        self.requests = 0
+        self._responses: Dict[str, object] = {}
+        # What the endpoints check and deserialize with, set up by OssapiAsync's own init
+        self.scopes = [Scope.PUBLIC]
+        self.grant = Grant.CLIENT_CREDENTIALS
+        self.strict = False
+        self.domain = Domain.OSU
+        self.log = logging.getLogger("benchmarks.osu")
+        self._type_hints_cache = {}
+
+    async def _request(self, type_, method, url, params={}, data={}):
+        self.requests += 1
+        key = url.split("?")[0].strip("/").replace("/", "_")
+        if key == "beatmaps_lookup" and params.get("id") is not None:
+            # `beatmap()` looks maps up by id, answered like `/beatmaps/{id}`
+            key = f"beatmaps_{params['id']}"
+        try:
+            json_ = self._responses[key]
+        except KeyError:
+            with open(self.fixtures / f"{key}.json") as f:
+                json_ = self._responses[key] = json.load(f)
+        return self._instantiate_type(type_, copy.deepcopy(json_))
+
+
+class AsyncCollection:
+    """Awaitable facade over a mongomock collection matching the motor calls we use."""
+
+    def __init__(self, collection: mongomock.Collection):
+        self._collection = collection
+
+    async def find_one(self, *args, **kwargs):
+        return self._collection.find_one(*args, **kwargs)
+
+    async def replace_one(self, *args, **kwargs):
+        return self._collection.replace_one(*args, **kwargs)
+
+    async def update_one(self, *args, **kwargs):
+        return self._collection.update_one(*args, **kwargs)
+
+    def delete_many(self, *args, **kwargs):
+        return self._collection.delete_many(*args, **kwargs)
+
+
+class AsyncDatabase:
+    def __init__(self):
+        self._database = mongomock.MongoClient()["angiedaleosu"]
+
+    def __getitem__(self, name: str) -> AsyncCollection:
+        return AsyncCollection(self._database[name])
+
+    def __getattr__(self, name: str) -> AsyncCollection:
+        return self[name]
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.name = f"tracking-{channel_id}"
+        self.sent = 0
+
+    async def send(self, *args, **kwargs):
+        self.sent += 1
+
+
+class FakeBot:
+    def __init__(self):
+        self.channels: Dict[int, FakeChannel] = {}
+
+    def get_channel(self, channel_id: int) -> FakeChannel:
+        try:
+            return self.channels[channel_id]
+        except KeyError:
+            channel = self.channels[channel_id] = FakeChannel(channel_id)
+            return channel
+
+    async def get_embed_color(self, ctx) -> discord.Colour:
+        return discord.Colour.pink()
+
+
+class FakeContext:
+    guild = None
+    author = None
+
+
+def build_cog(api: FakeOssapi, bot: FakeBot) -> Osu:
+    """Create the cog without running `__init__`.
+
+    That would need Red's config and data manager. Only the attributes
+    used by the benchmarked paths are set.
+    """
+    cog: Osu = Osu.__new__(Osu)
+    cog.bot = bot
+    cog.api = api
+    cog.db = AsyncDatabase()
+    cog.db_connected = True
+    cog.leaderboard_tasks = set()
+    cog.tracking_cache = {}
+    return cog
+
+
+async def no_sleep(*args, **kwargs) -> None:
+    """Stand-in for `asyncio.sleep` so rate limit pauses don't end up in the timings."""
+    return None
+
+
+async def run(iterations: int) -> None:
+    api = FakeOssapi()
+    bot = FakeBot()
+    cog = build_cog(api, bot)
+    ctx = FakeContext()
+
+    scores: List[OsuScore] = await api.user_scores(
+        USER_ID, ScoreType.BEST, limit=100, mode=GameMode.OSU
+    )
+    extra_data = parse_beatmap(str(BEATMAP_FILE))
+    pretty_mode = cog.prettify_mode(GameMode.OSU)
+
+    stored = cog.scores_to_dict(scores)
+    fresh = copy.deepcopy(stored)
+    for index, entry in enumerate(fresh):  # Every other play is an improvement
+        if index % 2 == 0:
+            entry["created_at"] = f"2024-10-0{index + 1}T12:00:00+0000"
+            entry["pp"] += 4.2
+            entry["accuracy"] = min(entry["accuracy"] + 0.003, 1.0)
+    channels = [900000000000000000 + i for i in range(3)]
+
+    await cog.add_to_leaderboard(scores, GameMode.OSU)
+    leaderboard: Optional[DatabaseLeaderboard] = await cog.get_unranked_leaderboard(
+        scores[0].beatmap.id, GameMode.OSU
+    )
+    params = CommandParams((), [], [])
+    params.mode = GameMode.OSU
+
+    leaderboard_collection = cog.db[f"leaderboard_{GameMode.OSU.value}"]
+
+    def leaderboard_setup():
+        leaderboard_collection.delete_many({})
+        return (scores, GameMode.OSU), {}
+
+    results = [
+        await bench(
+            "parse_beatmap",
+            parse_beatmap,
+            lambda: ((str(BEATMAP_FILE),), {}),
+            iterations=max(iterations // 10, 1),
+        ),
+        await bench(
+            "score_embed_builder",
+            cog.score_embed_builder,
+            lambda: ((ctx, scores[2], extra_data, scores, pretty_mode, 2), {}),
+            iterations=iterations,
+        ),
+        await bench(
+            "tracking_payload",
+            cog.tracking_payload,
+            lambda: ((channels, stored, copy.deepcopy(fresh)), {}),
+            iterations=iterations,
+        ),
+        await bench(
+            "leaderboard_embed",
+            cog.leaderboard_embed,
+            lambda: ((ctx, leaderboard, params, USER_ID), {}),
+            iterations=iterations,
+        ),
+        await bench(
+            "add_to_leaderboard",
+            cog.add_to_leaderboard,
+            leaderboard_setup,
+            iterations=max(iterations // 10, 1),
+        ),
+    ]
+
+    print(report(results))
+    print(f"\nFake API requests served: {api.requests}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", "-n", type=int, default=1000)
+    args = parser.parse_args(argv)
+    if OSU_IMPORT_ERROR is not None:
+        print(f"Skipping the osu! benchmarks, the cog can't be imported: {OSU_IMPORT_ERROR}")
+        return
+
+    asyncio.sleep = no_sleep
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""Headless Monte Carlo simulator for the casino games.
+
+Plays rounds through the game coroutines of `games/casino.py`, with a stub
+context answering their prompts, and the slot machine in `games/games.py`,
+drawing from the real `Deck`. Wins are paid as `GameEngine` pays them. Reports
+the return to player, variance and throughput of every game for each
+payout multiplier setting.
+
+Rounds are split over worker processes, each seeded on its own, so results
+are reproducible for a given `--seed` and `--workers`.
+
+Run from the repository root::
+
+    python -m benchmarks.sim_casino [--rounds N] [--workers N] [--games Blackjack War ...]
+"""
+
+import argparse
+import asyncio
+import atexit
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from redbot.core import data_manager
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# The cog modules create their Config on import, which needs Red's data manager
+# set up. Outside a bot, point it to a throwaway JSON store, like
+# `data_manager.create_temp_config` does without saving it as an instance.
+if data_manager.basic_config is None:
+    _data_path = tempfile.mkdtemp(prefix="sim_casino-")
+    atexit.register(shutil.rmtree, _data_path, ignore_errors=True)
+    data_manager.basic_config = {
+        **data_manager.basic_config_default,
+        "DATA_PATH": _data_path,
+        "STORAGE_TYPE": "JSON",
+        "STORAGE_DETAILS": {},
+    }
+
+from games import casino  # noqa: E402
+from games.casino import Blackjack, Core, Double, War  # noqa: E402
+from games.data import guild_defaults  # noqa: E402
+from games.deck import Deck  # noqa: E402
+from games.engine import winnings  # noqa: E402
+from games.games import slot_payout, spin_slot  # noqa: E402
+from games.transaction import current_transaction  # noqa: E402
+
+BET = 100
+
+# Every game takes the bet and the multiplier setting and returns what the
+# engine pays back to the player, the stake not counted as lost yet.
+Game = Callable[["SimContext", int, Optional[float], argparse.Namespace], Awaitable[int]]
+
+
+async def no_sleep(*args, **kwargs) -> None:
+    """Stand-in for `asyncio.sleep`, the games pause between messages for the players to read."""
+
+
+class SimMessage:
+    def __init__(self, content: str = "", author=None, channel=None):
+        self.content = content
+        self.author = author
+        self.channel = channel
+
+    async def edit(self, **kwargs) -> None:
+        pass
+
+
+class SimMessageCache:
+    async def get_guild(self, guild) -> bool:
+        return False
+
+
+class SimTransaction:
+    """Stand-in for the player's `BetTransaction`, collecting what the game hands back."""
+
+    def __init__(self):
+        self.payout = 0
+
+    async def raise_stake(self, amount: int) -> None:
+        raise ValueError("The simulated strategies never double down.")
+
+    def credit(self, amount: int) -> None:
+        self.payout += amount
+
+
+class SimPlayer:
+    id = 0
+    name = mention = "Player"
+
+
+class SimChannel:
+    id = 0
+
+
+class SimContext(ABC):
+    """A context whose player answers the games' prompts with the strategy from the options.
+
+    The games show the score before every prompt, the simulated game classes
+    keep it here instead of building the embed. Replies go through the game's
+    own message check, one it doesn't accept times out like it would on Discord.
+    """
+
+    def __init__(self, options: argparse.Namespace):
+        self.options = options
+        self.author = SimPlayer()
+        self.channel = SimChannel()
+        self.guild = None
+        self.bot = self
+        self.score = 0
+
+    async def send(self, *args, **kwargs) -> SimMessage:
+        return SimMessage(author=self.bot, channel=self.channel)
+
+    async def wait_for(self, event, check=None, timeout=None) -> SimMessage:
+        message = SimMessage(self.reply(), self.author, self.channel)
+        if check is not None and not check(message):
+            raise asyncio.TimeoutError
+        return message
+
+    @abstractmethod
+    def reply(self) -> str:
+        """What the player answers the game's current prompt with."""
+
+
+class SilentContext(SimContext):
+    """For the games that never prompt the player."""
+
+    def reply(self) -> str:
+        return ""
+
+
+class BlackjackContext(SimContext):
+    def reply(self) -> str:
+        return "hit" if self.score < self.options.stand_on else "stay"
+
+
+class WarContext(SimContext):
+    def reply(self) -> str:
+        return self.options.war
+
+
+class DoubleContext(SimContext):
+    def reply(self) -> str:
+        return "cash out" if self.score >= self.options.cash_out else "double"
+
+
+class SimBlackjack(Blackjack):
+    @staticmethod
+    def bj_embed(ctx, ph, dh, count1, initial=False, outcome=None):
+        ctx.score = count1
+
+
+class SimDouble(Double):
+    @staticmethod
+    def double_embed(ctx, count, amount, outcome=None):
+        ctx.score = count
+
+
+CORE = Core(SimMessageCache())
+BLACKJACK = SimBlackjack(SimMessageCache())
+WAR = War(SimMessageCache())
+DOUBLE = SimDouble(SimMessageCache())
+
+
+async def settle(game: str, multiplier: Optional[float], play, *args) -> int:
+    """Play a round through the game's own coroutine, without the engine around it.
+
+    Returns what the engine would credit the player: the winnings of a win,
+    or what the game handed back on its own, like a blackjack push.
+    """
+    transaction = SimTransaction()
+    token = current_transaction.set(transaction)
+    try:
+        win, amount, _, _ = await play.__wrapped__(*args)
+    finally:
+        current_transaction.reset(token)
+    if win:
+        return winnings(game, amount, multiplier)
+    return transaction.payout
+
+
+async def play_allin(ctx, bet, multiplier, options):
+    # The multiplier is picked by the player, it's also what the bet is multiplied by
+    return await settle("Allin", multiplier, Core.play_allin, CORE, ctx, bet, int(multiplier))
+
+
+async def play_coin(ctx, bet, multiplier, options):
+    return await settle("Coin", multiplier, Core.play_coin, CORE, ctx, bet, options.coin)
+
+
+async def play_cups(ctx, bet, multiplier, options):
+    return await settle("Cups", multiplier, Core.play_cups, CORE, ctx, bet, str(options.cup))
+
+
+async def play_dice(ctx, bet, multiplier, options):
+    return await settle("Dice", multiplier, Core.play_dice, CORE, ctx, bet)
+
+
+async def play_hilo(ctx, bet, multiplier, options):
+    return await settle("Hilo", multiplier, Core.play_hilo, CORE, ctx, bet, options.hilo)
+
+
+async def play_craps(ctx, bet, multiplier, options):
+    return await settle("Craps", multiplier, Core.play_craps, CORE, ctx, bet)
+
+
+async def play_blackjack(ctx, bet, multiplier, options):
+    return await settle("Blackjack", multiplier, Blackjack.play, BLACKJACK, ctx, bet)
+
+
+async def play_war(ctx, bet, multiplier, options):
+    return await settle("War", multiplier, War.play, WAR, ctx, bet)
+
+
+async def play_double(ctx, bet, multiplier, options):
+    return await settle("Double", multiplier, Double.play, DOUBLE, ctx, bet)
+
+
+async def play_slot(ctx, bet, multiplier, options):
+    payout = slot_payout(spin_slot()[1])
+    if payout:
+        return payout["payout"](bet)
+    return 0
+
+
+GAMES: Dict[str, Game] = {
+    "Allin": play_allin,
+    "Blackjack": play_blackjack,
+    "Coin": play_coin,
+    "Craps": play_craps,
+    "Cups": play_cups,
+    "Dice": play_dice,
+    "Double": play_double,
+    "Hilo": play_hilo,
+    "Slot": play_slot,
+    "War": play_war,
+}
+
+CONTEXTS: Dict[str, Callable[[argparse.Namespace], SimContext]] = {
+    "Blackjack": BlackjackContext,
+    "Double": DoubleContext,
+    "War": WarContext,
+}
+
+
+class SimResult:
+    """Totals of a batch of simulated rounds, mergeable across workers.
+
+    Attributes
+    ----------
+    rounds: :class:`int`
+        How many rounds were played.
+    staked: :class:`int`
+        Credits bet over all rounds.
+    paid: :class:`int`
+        Credits paid back over all rounds.
+    sum_sq: :class:`float`
+        Sum of the squared return per credit bet, for the variance.
+    elapsed: :class:`float`
+        Seconds spent playing, summed over workers.
+    """
+
+    def __init__(self, rounds=0, staked=0, paid=0, sum_sq=0.0, elapsed=0.0):
+        self.rounds = rounds
+        self.staked = staked
+        self.paid = paid
+        self.sum_sq = sum_sq
+        self.elapsed = elapsed
+
+    def merge(self, other: "SimResult") -> None:
+        self.rounds += other.rounds
+        self.staked += other.staked
+        self.paid += other.paid
+        self.sum_sq += other.sum_sq
+        self.elapsed += other.elapsed
+
+    @property
+    def rtp(self) -> float:
+        return self.paid / self.staked if self.staked else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Variance of the return per credit bet."""
+        if self.rounds < 2:
+            return 0.0
+        mean = self.paid / self.staked
+        return max(self.sum_sq / self.rounds - mean * mean, 0.0) * self.rounds / (self.rounds - 1)
+
+    @property
+    def error(self) -> float:
+        """Standard error of the return to player."""
+        return math.sqrt(self.variance / self.rounds) if self.rounds else 0.0
+
+
+def simulate(
+    game: str, multiplier: Optional[float], rounds: int, seed: int, options: argparse.Namespace
+) -> SimResult:
+    """Play `rounds` rounds of `game` in this process."""
+    random.seed(seed)
+    asyncio.sleep = no_sleep
+    # The games draw from the module's deck, swap it for a shoe of the requested size
+    casino.deck = Deck(decks=options.decks)
+    casino.deck.new()
+    return asyncio.run(play_rounds(game, multiplier, rounds, options))
+
+
+async def play_rounds(
+    game: str, multiplier: Optional[float], rounds: int, options: argparse.Namespace
+) -> SimResult:
+    play = GAMES[game]
+    ctx = CONTEXTS.get(game, SilentContext)(options)
+    bet = options.bet
+    paid = 0
+    sum_sq = 0.0
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        payout = await play(ctx, bet, multiplier, options)
+        paid += payout
+        sum_sq += (payout / bet) ** 2
+    elapsed = time.perf_counter() - start
+
+    return SimResult(rounds, rounds * bet, paid, sum_sq, elapsed)
+
+
+def settings(game: str, options: argparse.Namespace) -> Sequence[Optional[float]]:
+    """The multiplier settings to simulate a game at."""
+    if game == "Allin":
+        return options.allin
+    if game in ("Double", "Slot"):
+        return (None,)
+    if options.multipliers:
+        return options.multipliers
+    return (guild_defaults["Games"][game]["Multiplier"],)
+
+
+def run(options: argparse.Namespace) -> List[Tuple[str, Optional[float], SimResult, float]]:
+    chunks = [options.rounds // options.workers] * options.workers
+    chunks[0] += options.rounds - sum(chunks)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=options.workers) as pool:
+        for game in options.games:
+            for multiplier in settings(game, options):
+                start = time.perf_counter()
+                futures = [
+                    pool.submit(simulate, game, multiplier, rounds, options.seed + i, options)
+                    for i, rounds in enumerate(chunks)
+                    if rounds
+                ]
+                total = SimResult()
+                for future in futures:
+                    total.merge(future.result())
+                results.append((game, multiplier, total, time.perf_counter() - start))
+    return results
+
+
+def report(results: List[Tuple[str, Optional[float], SimResult, float]]) -> str:
+    lines = [
+        f"{'Game':<10} {'Mult':>6} {'Rounds':>12} {'RTP':>9} {'+/-':>8} "
+        f"{'Variance':>10} {'Rounds/s':>14} {'Per worker':>14}"
+    ]
+    for game, multiplier, result, wall in results:
+        mult = "-" if multiplier is None else f"{multiplier:g}"
+        per_worker = result.rounds / result.elapsed if result.elapsed else float("inf")
+        lines.append(
+            f"{game:<10} {mult:>6} {result.rounds:>12,} {result.rtp:>8.2%} "
+            f"{result.error:>8.2%} {result.variance:>10.4f} "
+            f"{result.rounds / wall:>14,.0f} {per_worker:>14,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", "-n", type=int, default=1_000_000)
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--games", nargs="+", choices=sorted(GAMES), default=sorted(GAMES))
+    parser.add_argument(
+        "--multipliers",
+        nargs="+",
+        type=float,
+        help="Payout multipliers to try, the default settings are used otherwise.",
+    )
+    parser.add_argument("--bet", type=int, default=BET)
+    parser.add_argument("--allin", nargs="+", type=int, default=[2, 5, 10])
+    parser.add_argument("--decks", type=int, default=1, help="Decks in the card games' shoe.")
+    parser.add_argument("--stand-on", type=int, default=17, help="Blackjack: stay at this total.")
+    parser.add_argument("--cash-out", type=int, default=1, help="Double: cash out after N wins.")
+    parser.add_argument("--war", choices=("war", "surrender"), default="war")
+    parser.add_argument("--coin", choices=("heads", "tails"), default="heads")
+    parser.add_argument("--cup", type=int, choices=(1, 2, 3), default=1)
+    parser.add_argument("--hilo", choices=("low", "high", "7"), default="7")
+    options = parser.parse_args(argv)
+    options.workers = max(1, min(options.workers, options.rounds))
+
+    print(report(run(options)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
-from typing import Dict, Optional
+import pathlib
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import discord
 from redbot.core import Config
@@ -28,3 +30,181 @@ class OldMessageTypeManager:
         else:
             await self._config.guild_from_id(gid).use_old_style.clear()
             self._cached_guild[gid] = self._config.defaults["GUILD"]["use_old_style"]
+
+
+class MembershipTiers:
+    """The casino's memberships, best first, and the balances at which they change."""
+
+    def __init__(self, memberships: dict):
+        # Stable, so memberships with the same access keep their order like max() would
+        self.ranked: List[Tuple[str, dict]] = sorted(
+            memberships.items(), key=lambda item: item[1]["Access"], reverse=True
+        )
+        self.thresholds: List[int] = sorted(
+            {requirements["Credits"] for _, requirements in self.ranked if requirements["Credits"]}
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.ranked)
+
+    def crosses(self, old_balance: int, new_balance: int) -> bool:
+        """Whether going from one balance to the other can change someone's membership."""
+        low, high = sorted((old_balance, new_balance))
+        index = bisect_right(self.thresholds, low)
+        return index < len(self.thresholds) and self.thresholds[index] <= high
+
+    def qualify(self, user: discord.abc.User, balance: int, _global: bool = False) -> str:
+        """The best membership `user` meets the requirements of."""
+        now = discord.utils.utcnow()
+        roles = None
+        for name, requirements in self.ranked:
+            if requirements["Credits"] and balance < requirements["Credits"]:
+                continue
+            if _global:
+                if requirements["DOS"] and requirements["DOS"] > (now - user.created_at).days:
+                    continue
+            else:
+                if requirements["Role"]:
+                    if roles is None:
+                        roles = {x.name for x in user.roles} | {x.mention for x in user.roles}
+                    if requirements["Role"] not in roles:
+                        continue
+                if requirements["DOS"] and requirements["DOS"] > (now - user.joined_at).days:
+                    continue
+            return name
+        return "Basic"
+
+
+class CasinoSettingsCache:
+    """In memory snapshots of the casino settings, one per guild or a single global one.
+
+    Snapshots are shared, so don't modify them. Every invalidation bumps the
+    version of the snapshot, which keeps a read that raced with a settings
+    change from being stored.
+    """
+
+    def __init__(self, config: Config):
+        self._config: Config = config
+        self._is_global: Optional[bool] = None
+        # guild id, or None for the global casino: (version, settings)
+        self._snapshots: Dict[Optional[int], Tuple[Tuple[int, int], dict]] = {}
+        self._tiers: Dict[Optional[int], Tuple[dict, MembershipTiers]] = {}
+        self._versions: Dict[Optional[int], int] = {}
+        self._generation = 0
+
+    async def is_global(self) -> bool:
+        if self._is_global is not None:
+            return self._is_global
+        generation = self._generation
+        is_global = await self._config.Settings.Global()
+        if generation == self._generation:
+            self._is_global = is_global
+        return is_global
+
+    async def get(self, guild: Optional[discord.Guild]) -> dict:
+        key = None if await self.is_global() else guild.id
+        try:
+            return self._snapshots[key][1]
+        except KeyError:
+            pass
+
+        version = self.version(key)
+        group = self._config if key is None else self._config.guild_from_id(key)
+        settings = await group.all()
+        if self.version(key) == version:
+            self._snapshots[key] = (version, settings)
+        return settings
+
+    async def tiers(self, guild: Optional[discord.Guild]) -> MembershipTiers:
+        """The memberships of the guild's casino, or the global one, ranked."""
+        settings = await self.get(guild)
+        key = None if await self.is_global() else guild.id
+        try:
+            snapshot, tiers = self._tiers[key]
+        except KeyError:
+            pass
+        else:
+            if snapshot is settings:
+                return tiers
+        tiers = MembershipTiers(settings["Memberships"])
+        self._tiers[key] = (settings, tiers)
+        return tiers
+
+    def version(self, key: Optional[int]) -> Tuple[int, int]:
+        return self._generation, self._versions.get(key, 0)
+
+    def invalidate(self, guild: Optional[discord.Guild]) -> None:
+        """Drop the snapshot that settings changes made through `guild` affect."""
+        key = None if guild is None or self._is_global is not False else guild.id
+        self._versions[key] = self._versions.get(key, 0) + 1
+        self._snapshots.pop(key, None)
+        self._tiers.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every snapshot, and forget whether the casino is global."""
+        self._generation += 1
+        self._snapshots.clear()
+        self._tiers.clear()
+        self._is_global = None
+
+
+class TriviaListCache:
+    """Loaded trivia lists, kept until their file changes.
+
+    Lists are stored against their path along with the file's modification
+    time and size, a list whose file was changed is loaded again the next time
+    it's asked for. Directory listings are kept the same way. Cached lists are
+    shared, so don't modify them.
+    """
+
+    def __init__(self, loader: Callable[[pathlib.Path], dict]):
+        self._loader = loader
+        # path: ((mtime, size), trivia list)
+        self._lists: Dict[pathlib.Path, Tuple[Tuple[int, int], dict]] = {}
+        # directory: (mtime, paths)
+        self._listings: Dict[pathlib.Path, Tuple[int, List[pathlib.Path]]] = {}
+
+    @staticmethod
+    def _stamp(path: pathlib.Path) -> Tuple[int, int]:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: pathlib.Path) -> dict:
+        """The list at `path`, loading it if it isn't cached or its file changed."""
+        stamp = self._stamp(path)
+        try:
+            cached_stamp, trivia_list = self._lists[path]
+        except KeyError:
+            pass
+        else:
+            if cached_stamp == stamp:
+                return trivia_list
+        trivia_list = self._loader(path)
+        self._lists[path] = (stamp, trivia_list)
+        return trivia_list
+
+    def store(self, path: pathlib.Path, trivia_list: dict) -> None:
+        """Cache a list that was just loaded and written to `path`."""
+        self._lists[path] = (self._stamp(path), trivia_list)
+
+    def discard(self, path: pathlib.Path) -> None:
+        self._lists.pop(path, None)
+
+    def listing(self, directory: pathlib.Path) -> List[pathlib.Path]:
+        """The resolved paths of the lists in `directory`."""
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        paths = [p.resolve() for p in directory.glob("*.yaml")]
+        self._listings[directory] = (mtime, paths)
+        # Forget lists that were removed from the directory
+        for path in [p for p in self._lists if p.parent == directory and p not in paths]:
+            del self._lists[path]
+        return paths
+
+    def paths(self, directories: Iterable[pathlib.Path]) -> List[pathlib.Path]:
+        return [path for directory in directories for path in self.listing(directory)]
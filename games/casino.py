@@ -6,14 +6,13 @@ import random
 import discord
 
 # Red
-from redbot.core import bank
-from redbot.core.errors import BalanceTooHigh
 from redbot.core.utils.chat_formatting import box
 from redbot.core.utils.predicates import MessagePredicate
 
 # Casino
 from .deck import Deck
 from .engine import game_engine
+from .transaction import current_transaction
 
 deck = Deck()
 
@@ -211,7 +210,7 @@ class Blackjack:
 
     async def double_down(self, ctx, ph, dh, amount, condition2, message):
         try:
-            await bank.withdraw_credits(ctx.author, amount)
+            await current_transaction.get().raise_stake(amount)
         except ValueError:
             await ctx.send(
                 ("{} You can not cover the bet. Please choose hit or stay.").format(
@@ -251,10 +250,7 @@ class Blackjack:
             result = False
         elif dc == pc <= 21:
             outcome = "Pushed"
-            try:
-                await bank.deposit_credits(ctx.author, amount)
-            except BalanceTooHigh as e:
-                await bank.set_balance(ctx.author, e.max_balance)
+            current_transaction.get().credit(amount)
             result = False
         else:
             outcome = "House Wins!"
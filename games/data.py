@@ -6,11 +6,15 @@ from copy import deepcopy
 import discord
 from redbot.core import Config, bank
 
-from .cache import OldMessageTypeManager
+from .cache import CasinoSettingsCache, OldMessageTypeManager
+from .rankings import CasinoRankings
+from .transaction import PlayerLedger
 from .utils import is_input_unsupported, max_int, min_int
 
 user_defaults = {
     "Pending_Credits": 0,
+    # Bets that were placed but not settled yet, by bet id: {"Game": ..., "Stake": ...}
+    "Open_Bets": {},
     "Membership": {"Name": "Basic", "Assigned": False},
     "Played": {
         "Allin": 0,
@@ -34,6 +38,17 @@ user_defaults = {
         "War": 0,
         "Double": 0,
     },
+    "Net": {
+        "Allin": 0,
+        "Blackjack": 0,
+        "Coin": 0,
+        "Craps": 0,
+        "Cups": 0,
+        "Dice": 0,
+        "Hilo": 0,
+        "War": 0,
+        "Double": 0,
+    },
     "Cooldowns": {
         "Allin": 0,
         "Blackjack": 0,
@@ -133,6 +148,8 @@ guild_defaults = {
     },
 }
 
+BASIC_MEMBERSHIP = {"Reduction": 0, "Access": 0, "Color": "grey", "Bonus": 1}
+
 member_defaults = deepcopy(user_defaults)
 global_defaults = deepcopy(guild_defaults)
 global_defaults["Settings"]["Global"] = True
@@ -149,13 +166,17 @@ class Database:
     config: Config = Config.get_conf(
         _DataObj, identifier=1387000, cog_name="GamesCasino", force_registration=True
     )
+    # Shared by the cog and every game, so they don't each go back to config
+    settings_cache: CasinoSettingsCache = CasinoSettingsCache(config)
+    old_message_cache: OldMessageTypeManager = OldMessageTypeManager(config, enable_cache=True)
+    ledger: PlayerLedger = PlayerLedger()
+    rankings: CasinoRankings = CasinoRankings(config)
 
     def __init__(self):
         self.config.register_guild(**guild_defaults)
         self.config.register_global(schema_version=1, **global_defaults)
         self.config.register_member(**member_defaults)
         self.config.register_user(**user_defaults)
-        self.old_message_cache = OldMessageTypeManager(config=self.config, enable_cache=True)
         self.migration_task: asyncio.Task = None
         self.cog_ready_event: asyncio.Event = asyncio.Event()
 
@@ -212,6 +233,7 @@ class Database:
                                                 g_data_key
                                             ] = g_data_value_new
                 await self.config.schema_version.set(2)
+                self.settings_cache.clear()
             except Exception as e:
                 log.exception(
                     "Fatal Exception during Data migration to Scheme 2, Casino cog will not be loaded.",
@@ -223,7 +245,11 @@ class Database:
     async def casino_is_global(self):
         """Checks to see if the casino is storing data on
         a per server basis or globally."""
-        return await self.config.Settings.Global()
+        return await self.settings_cache.is_global()
+
+    async def casino_scope(self, ctx):
+        """The guild id the casino's data is stored under, or None when it's global."""
+        return None if await self.casino_is_global() else ctx.guild.id
 
     async def get_data(self, ctx, player=None):
         """
@@ -256,9 +282,24 @@ class Database:
         Returns a dictionary representation of casino's settings data
         and the player data.
         """
-        settings = await self.get_data(ctx)
         player_data = await self.get_data(ctx, player=player)
-        return await settings.all(), await player_data.all()
+        return await self.get_settings(ctx), await player_data.all()
+
+    async def get_settings(self, ctx):
+        """
+
+        :param ctx: Context Object
+        :return: Dictionary
+
+        Returns the cached casino settings for the guild, or the global ones.
+        The dictionary is shared, so it must not be modified. Anything that
+        writes settings must call `settings_changed` afterwards.
+        """
+        return await self.settings_cache.get(ctx.guild)
+
+    def settings_changed(self, ctx):
+        """Drops the cached settings the casino in `ctx` uses."""
+        self.settings_cache.invalidate(ctx.guild)
 
     async def _wipe_casino(self, ctx):
         """
@@ -270,6 +311,8 @@ class Database:
         This wipes everything, including member/user data.
         """
         await self.config.clear_all()
+        self.settings_cache.clear()
+        self.rankings.clear()
         msg = "{0.name} ({0.id}) wiped all casino data.".format(ctx.author)
         await ctx.send(msg)
 
@@ -279,6 +322,7 @@ class Database:
         """
         data = await self.get_data(ctx)
         await data.Settings.clear()
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) reset all casino settings.").format(ctx.author)
         await ctx.send(msg)
 
@@ -288,6 +332,7 @@ class Database:
         """
         data = await self.get_data(ctx)
         await data.Memberships.clear()
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) cleared all casino memberships.").format(ctx.author)
         await ctx.send(msg)
 
@@ -297,6 +342,7 @@ class Database:
         """
         data = await self.get_data(ctx)
         await data.Games.clear()
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) restored casino games to default settings.").format(ctx.author)
         await ctx.send(msg)
 
@@ -321,6 +367,8 @@ class Database:
         data = await self.get_data(ctx, player=player)
         await data.Played.clear()
         await data.Won.clear()
+        await data.Net.clear()
+        self.rankings.drop(await self.casino_scope(ctx))
 
         msg = ("{0.name} ({0.id}) reset all stats for {1.name} ({1.id}).").format(
             ctx.author, player
@@ -338,6 +386,7 @@ class Database:
         """
         data = await self.get_data(ctx, player=player)
         await data.clear()
+        self.rankings.drop(await self.casino_scope(ctx))
 
         msg = ("{0.name} ({0.id}) reset all data for {1.name} ({1.id}).").format(
             ctx.author, player
@@ -397,10 +446,8 @@ class Database:
             await self.config.clear_all_users()
             await self.config.clear_all_globals()
             await self.config.Settings.Global.set(False)
-
-    async def _update_cooldown(self, ctx, game, time):
-        player_data = await self.get_data(ctx, player=ctx.author)
-        await player_data.set_raw("Cooldowns", game, value=time)
+        self.settings_cache.clear()
+        self.rankings.clear()
 
     async def _get_player_membership(self, ctx, player):
         """
@@ -414,14 +461,13 @@ class Database:
         default basic membership. It will also set their new membership to the
         default.
         """
-        basic = {"Reduction": 0, "Access": 0, "Color": "grey", "Bonus": 1}
+        basic = BASIC_MEMBERSHIP
         player_data = await self.get_data(ctx, player=player)
         name = await player_data.Membership.Name()
         if name == "Basic":
             return name, basic
 
-        data = await self.get_data(ctx)
-        memberships = await data.Memberships.all()
+        memberships = (await self.get_settings(ctx))["Memberships"]
         try:
             return name, memberships[name]
         except KeyError:
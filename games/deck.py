@@ -2,36 +2,131 @@ import random
 from collections import deque
 from itertools import chain, product
 
+suites = (
+    ":clubs:",
+    ":diamonds:",
+    ":hearts:",
+    ":spades:",
+)
+face_cards = (
+    "King",
+    "Queen",
+    "Jack",
+    "Ace",
+)
+ranks = tuple(chain(range(2, 11), face_cards))
+
+bj_vals = {
+    "Jack": 10,
+    "Queen": 10,
+    "King": 10,
+    "Ace": 1,
+}
+war_values = {
+    "Jack": 11,
+    "Queen": 12,
+    "King": 13,
+    "Ace": 14,
+}
+
+# Lookup tables indexed by card number, a card's position in a fresh deck
+CARD_TUPLES = tuple(product(suites, ranks))
+CARD_NAMES = tuple("{1} {0}".format(*card) for card in CARD_TUPLES)
+BJ_VALUES = tuple(bj_vals.get(rank, rank) for _, rank in CARD_TUPLES)
+WAR_VALUES = tuple(war_values.get(rank, rank) for _, rank in CARD_TUPLES)
+ACES = frozenset(number for number, (_, rank) in enumerate(CARD_TUPLES) if rank == "Ace")
+
+
+class Card(int):
+    """A playing card stored as its number in a fresh deck.
+
+    It still indexes and unpacks like the `(suit, rank)` tuples cards
+    used to be, so `card[1]` is its rank.
+    """
+
+    __slots__ = ()
+
+    @property
+    def suit(self):
+        return CARD_TUPLES[self][0]
+
+    @property
+    def rank(self):
+        return CARD_TUPLES[self][1]
+
+    def __getitem__(self, index):
+        return CARD_TUPLES[self][index]
+
+    def __iter__(self):
+        return iter(CARD_TUPLES[self])
+
+    def __len__(self):
+        return 2
+
+    def __repr__(self):
+        return repr(CARD_TUPLES[self])
+
+    def __str__(self):
+        return CARD_NAMES[self]
+
+
+CARDS = tuple(Card(number) for number in range(len(CARD_TUPLES)))
+
+
+def bj_value(card):
+    if isinstance(card, Card):
+        return BJ_VALUES[card]
+    rank = card[1]
+    return bj_vals[rank] if isinstance(rank, str) else rank
+
+
+def is_ace(card):
+    if isinstance(card, Card):
+        return card in ACES
+    return card[1] == "Ace"
+
+
+class Hand(list):
+    """A hand of cards that keeps its blackjack total as cards are added.
+
+    Hands only ever grow, cards must be added with `append` or `extend`.
+    """
+
+    __slots__ = ("hard", "aces")
+
+    def __init__(self, cards=()):
+        super().__init__()
+        self.hard = 0
+        self.aces = 0
+        self.extend(cards)
+
+    def append(self, card):
+        super().append(card)
+        self.hard += bj_value(card)
+        if is_ace(card):
+            self.aces += 1
+
+    def extend(self, cards):
+        for card in cards:
+            self.append(card)
+
+    @property
+    def total(self):
+        if self.aces and self.hard <= 11:
+            return self.hard + 10
+        return self.hard
+
 
 class Deck:
-    """Creates a Deck of playing cards."""
-
-    suites = (
-        ":clubs:",
-        ":diamonds:",
-        ":hearts:",
-        ":spades:",
-    )
-    face_cards = (
-        "King",
-        "Queen",
-        "Jack",
-        "Ace",
-    )
-    bj_vals = {
-        "Jack": 10,
-        "Queen": 10,
-        "King": 10,
-        "Ace": 1,
-    }
-    war_values = {
-        "Jack": 11,
-        "Queen": 12,
-        "King": 13,
-        "Ace": 14,
-    }
-
-    def __init__(self):
+    """Creates a shoe of one or more decks of playing cards."""
+
+    suites = suites
+    face_cards = face_cards
+    bj_vals = bj_vals
+    war_values = war_values
+
+    def __init__(self, decks=1):
+        self.decks = decks
         self._deck = deque()
 
     def __len__(self):
@@ -50,21 +145,27 @@ class Deck:
         return self._deck
 
     def shuffle(self):
-        random.shuffle(self._deck)
+        cards = list(self._deck)
+        random.shuffle(cards)
+        self._deck = deque(cards)
 
     def war_count(self, card):
+        if isinstance(card, Card):
+            return WAR_VALUES[card]
         try:
             return self.war_values[card[1]]
         except KeyError:
             return card[1]
 
     def bj_count(self, hand: list, hole=False):
-        hand = self._hand_type(hand)
         if hole:
-            card = hand[0][1]
-            count = self.bj_vals[card] if isinstance(card, str) else card
+            count = bj_value(self._hand_type(hand)[0])
             return count if count > 1 else 11
 
+        if isinstance(hand, Hand):
+            return hand.total
+
+        hand = self._hand_type(hand)
         count = sum([self.bj_vals[y] if isinstance(y, str) else y for x, y in hand])
         if any("Ace" in pair for pair in hand) and count <= 11:
             count += 10
@@ -72,14 +173,18 @@ class Deck:
 
     @staticmethod
     def fmt_hand(hand: list):
-        return ["{} {}".format(y, x) for x, y in hand]
+        return [Deck.fmt_card(card) for card in hand]
 
     @staticmethod
     def fmt_card(card):
+        if isinstance(card, Card):
+            return CARD_NAMES[card]
         return "{1} {0}".format(*card)
 
     @staticmethod
     def hand_check(hand: list, card):
+        if card == "Ace" and isinstance(hand, Hand):
+            return hand.aces > 0
         return any(x[1] == card for x in hand)
 
     def split(self, position: int):
@@ -99,13 +204,13 @@ class Deck:
         return card
 
     def _check(self, num=1):
-        if num > 52:
+        if num > len(CARDS) * self.decks:
             raise ValueError("Can not exceed deck limit.")
         if len(self._deck) < num:
             self.new()
 
     def _hand_type(self, hand: list):
-        if isinstance(hand[0], tuple):
+        if isinstance(hand[0], (tuple, Card)):
             return hand
 
         try:
@@ -117,12 +222,10 @@ class Deck:
         self._check(num=num)
 
         if hand is None:
-            hand = []
+            hand = Hand()
+        take = self._deck.popleft if top else self._deck.pop
         for x in range(0, num):
-            if top:
-                hand.append(self._deck.popleft())
-            else:
-                hand.append(self._deck.pop())
+            hand.append(take())
 
         return hand
 
@@ -132,6 +235,6 @@ class Deck:
             del self._deck[0]
 
     def new(self):
-        cards = product(self.suites, chain(range(2, 11), ("King", "Queen", "Jack", "Ace")))
+        cards = list(CARDS * self.decks)
+        random.shuffle(cards)
         self._deck = deque(cards)
-        self.shuffle()
@@ -10,11 +10,22 @@ import discord
 
 # Red
 from redbot.core import bank
-from redbot.core.errors import BalanceTooHigh
 from redbot.core.utils.chat_formatting import humanize_number
 
 from . import utils
-from .data import Database
+from .data import BASIC_MEMBERSHIP, Database
+from .transaction import BetTransaction, current_transaction
+
+
+def winnings(game, amount, multiplier):
+    """What a game pays for a win of `amount`, before membership bonuses.
+
+    Allin and Double already won their multiplier, the others are paid the
+    game's multiplier setting on top.
+    """
+    if game == "Allin" or game == "Double":
+        return amount
+    return round(amount * multiplier)
 
 
 def game_engine(name=None, choice=None, choices=None):
@@ -28,8 +39,13 @@ def game_engine(name=None, choice=None, choices=None):
             engine = GameEngine(name, user_choice, choice, args[1], args[2])
             engine = GameEngine(name, choice, choices, args[1], args[2])
             if await engine.check_conditions():
-                result = await coro(*args, **kwargs)
-                await engine.game_teardown(result)
+                token = current_transaction.set(engine.transaction)
+                try:
+                    result = await coro(*args, **kwargs)
+                    await engine.game_teardown(result)
+                finally:
+                    current_transaction.reset(token)
+                    await engine.abandon()
 
         return wrapped
 
@@ -66,10 +82,22 @@ class GameEngine(Database):
         from config.
     bet: int
         The amount the player has wagered.
+    transaction: BetTransaction
+        Collects everything the bet changes for the player until it is settled.
 
     """
 
-    __slots__ = ("game", "choice", "choices", "ctx", "bet", "player", "guild")
+    __slots__ = (
+        "game",
+        "choice",
+        "choices",
+        "ctx",
+        "bet",
+        "player",
+        "guild",
+        "membership",
+        "transaction",
+    )
 
     def __init__(self, game, choice, choices, ctx, bet):
         self.game = game
@@ -79,6 +107,8 @@ class GameEngine(Database):
         self.ctx = ctx
         self.player = ctx.author
         self.guild = ctx.guild
+        self.membership = "Basic"
+        self.transaction = None
         super().__init__()
 
     async def check_conditions(self):
@@ -98,85 +128,92 @@ class GameEngine(Database):
         Cooldowns must be checked last so that the game doesn't trigger a cooldown if another
         condition has failed.
 
+        Placing the bet withdraws the stake and saves the bet as open with the game's
+        cooldown and play count. Everything else it changes is committed at once when
+        the game is settled. Bets a restart interrupted are refunded first.
 
-        """
-        settings, player_data = await super().get_all(self.ctx, self.player)
-        access = self.access_calculator(settings["Memberships"], player_data["Membership"]["Name"])
 
-        if not settings["Settings"]["Casino_Open"]:
-            error = "The Casino is closed."
-
-        elif not settings["Games"][self.game]["Open"]:
-            error = "{} is closed.".format(self.game)
-
-        elif settings["Games"][self.game]["Access"] > access:
-            error = (
-                "{} requires an access level of {}. Your current access level is {}. Obtain "
-                "a higher membership to play this game."
-            ).format(self.game, settings["Games"][self.game]["Access"], access)
-
-        elif self.choices is not None and self.choice not in self.choices:
-            error = ("Incorrect response. Accepted responses are:\n{}.").format(
-                utils.fmt_join(self.choices)
-            )
-
-        elif not self.bet_in_range(
-            settings["Games"][self.game]["Min"], settings["Games"][self.game]["Max"]
-        ):
-            error = "Your bet must be between " "{} and {}.".format(
-                settings["Games"][self.game]["Min"], settings["Games"][self.game]["Max"]
-            )
-
-        elif not await bank.can_spend(self.player, self.bet):
-            error = "You do not have enough credits to cover the bet."
-
-        else:
-            error = await self.check_cooldown(settings["Games"][self.game], player_data)
-
-        if error:
-            await self.ctx.send(error)
-            return False
-        else:
-            await bank.withdraw_credits(self.player, self.bet)
-            await self.update_stats(stat="Played")
-            return True
-
-    async def update_stats(self, stat: str):
         """
+        settings = await super().get_settings(self.ctx)
+        game_data = settings["Games"][self.game]
+        key = (await super().casino_scope(self.ctx), self.player.id)
+
+        async with self.ledger.lock(key):
+            player_instance = await super().get_data(self.ctx, player=self.player)
+            player_data = await player_instance.all()
+            if player_data["Open_Bets"]:
+                await self.ledger.refund_interrupted(key, self.player, player_instance)
+            transaction = BetTransaction(self.ledger, key, self.player, player_instance, self.game)
+            self.membership, perks = self.player_membership(settings, player_data, transaction)
+            access = self.access_calculator(settings["Memberships"], self.membership)
+
+            if not settings["Settings"]["Casino_Open"]:
+                error = "The Casino is closed."
+
+            elif not game_data["Open"]:
+                error = "{} is closed.".format(self.game)
+
+            elif game_data["Access"] > access:
+                error = (
+                    "{} requires an access level of {}. Your current access level is {}. Obtain "
+                    "a higher membership to play this game."
+                ).format(self.game, game_data["Access"], access)
+
+            elif self.choices is not None and self.choice not in self.choices:
+                error = ("Incorrect response. Accepted responses are:\n{}.").format(
+                    utils.fmt_join(self.choices)
+                )
+
+            elif not self.bet_in_range(game_data["Min"], game_data["Max"]):
+                error = "Your bet must be between " "{} and {}.".format(
+                    game_data["Min"], game_data["Max"]
+                )
+
+            elif self.bet < 0 or not await bank.can_spend(self.player, self.bet):
+                error = "You do not have enough credits to cover the bet."
 
-        :param stat: string
-            Must be Played or Won
-        :return: None
+            else:
+                error = self.check_cooldown(game_data, player_data, perks, transaction)
 
-        Updates either a player's win or played stat.
-        """
-        instance = await self.get_data(self.ctx, player=self.player)
-        current = await instance.get_raw(stat, self.game)
-        await instance.set_raw(stat, self.game, value=current + 1)
+            if not error:
+                try:
+                    await transaction.place(self.bet)
+                except ValueError:
+                    error = "You do not have enough credits to cover the bet."
+                else:
+                    self.transaction = transaction
+                    return True
 
-    async def check_cooldown(self, game_data, player_data):
+        await self.ctx.send(error)
+        return False
+
+    def check_cooldown(self, game_data, player_data, perks, transaction):
         """
 
         :param game_data: Dictionary
             Contains all the data pertaining to a particular game.
-        :param player_data: Object
-            User or member Object
+        :param player_data: Dictionary
+            The player's casino data.
+        :param perks: Dictionary
+            The perks of the player's membership.
+        :param transaction: BetTransaction
+            The bet being placed.
         :return: String or None
             Returns a string when a cooldown is remaining on a game, otherwise it will
             return None
 
-        Checks the time a player last played a game, and compares it with the set cooldown
-        for that game. If a user is still on cooldown, then a string detailing the time
-        remaining will be returned. Otherwise this will update their cooldown, and return None.
+        Checks the time a player last played a game and compares it with the set
+        cooldown for that game. If a user is still on cooldown, then a string detailing
+        the time remaining will be returned. Otherwise this will stamp their new
+        cooldown on the bet, and return None.
 
         """
         user_time = player_data["Cooldowns"][self.game]
         now = calendar.timegm(self.ctx.message.created_at.utctimetuple())
         base = game_data["Cooldown"]
-        membership = await super()._get_player_membership(self.ctx, self.player)
-        reduction = membership[1]["Reduction"]
+        reduction = perks["Reduction"]
         if now >= user_time - reduction:
-            await super()._update_cooldown(self.ctx, self.game, now + base)
+            transaction.cooldown = now + base
         else:
             seconds = int((user_time + reduction - now))
             remaining = utils.time_formatter(seconds)
@@ -185,42 +222,76 @@ class GameEngine(Database):
             )
             return msg
 
+    @staticmethod
+    def player_membership(settings, player_data, transaction):
+        """
+
+        :return: Membership name and a dictionary with the perks
+
+        Same as `Database._get_player_membership`, but working off data that was
+        already loaded. A membership that was deleted is reset on the bet.
+        """
+        name = player_data["Membership"]["Name"]
+        if name == "Basic":
+            return name, BASIC_MEMBERSHIP
+        try:
+            return name, settings["Memberships"][name]
+        except KeyError:
+            transaction.membership = {"Name": "Basic", "Assigned": False}
+            return "Basic", BASIC_MEMBERSHIP
+
     async def game_teardown(self, result):
-        data = await super().get_data(self.ctx)
-        settings = await data.all()
+        settings = await super().get_settings(self.ctx)
         message_obj: Optional[discord.Message]
 
         win, amount, msg, message_obj = result
 
         if not win:
+            await self.settle()
             embed = await self.build_embed(msg, settings, win, total=amount, bonus="")
             if (not await self.old_message_cache.get_guild(self.ctx.guild)) and message_obj:
                 return await message_obj.edit(content=self.player.mention, embed=embed)
             else:
                 return await self.ctx.send(self.player.mention, embed=embed)
 
-        player_data = await super().get_data(self.ctx, player=self.player)
-        await self.update_stats(stat="Won")
+        self.transaction.record("Won")
         if self.limit_check(settings, amount):
+            self.transaction.pending_credits = int(amount)
+            await self.settle()
             embed = await self.build_embed(msg, settings, win, total=amount, bonus="")
             return await self.limit_handler(
-                embed,
-                amount,
-                player_data,
-                settings["Settings"]["Payout_Limit"],
-                message=message_obj,
+                embed, amount, settings["Settings"]["Payout_Limit"], message=message_obj
             )
 
-        total, bonus = await self.deposit_winnings(amount, player_data, settings)
+        total, bonus = self.deposit_winnings(amount, settings)
+        await self.settle()
         embed = await self.build_embed(msg, settings, win, total=total, bonus=bonus)
         if (not await self.old_message_cache.get_guild(self.ctx.guild)) and message_obj:
             return await message_obj.edit(content=self.player.mention, embed=embed)
         else:
             return await self.ctx.send(self.player.mention, embed=embed)
 
-    async def limit_handler(self, embed, amount, player_instance, limit, message):
-        await player_instance.Pending_Credits.set(int(amount))
+    async def settle(self):
+        """Commits the bet and moves the player on the casino's leaderboards."""
+        transaction = self.transaction
+        await transaction.commit()
+        self.rankings.update(
+            transaction.key[0],
+            self.player.id,
+            self.game,
+            played=1,
+            won=transaction.stats["Won"],
+            net=transaction.balance_delta,
+        )
+
+    async def abandon(self):
+        """Refunds the bet if the game didn't settle it, it still counts as played."""
+        if await self.transaction.abandon():
+            self.rankings.update(
+                self.transaction.key[0], self.player.id, self.game, played=1, won=0, net=0
+            )
 
+    async def limit_handler(self, embed, amount, limit, message):
         if (not await self.old_message_cache.get_guild(self.ctx.guild)) and message:
             await message.edit(content=self.player.mention, embed=embed)
         else:
@@ -236,21 +307,14 @@ class GameEngine(Database):
 
         await self.player.send(msg)
 
-    async def deposit_winnings(self, amount, player_instance, settings):
-        multiplier = settings["Games"][self.game]["Multiplier"]
+    def deposit_winnings(self, amount, settings):
+        initial = winnings(self.game, amount, settings["Games"][self.game]["Multiplier"])
         if self.game == "Allin" or self.game == "Double":
-            try:
-                await bank.deposit_credits(self.player, amount)
-                return amount, "(+0)"
-            except BalanceTooHigh as e:
-                return await bank.set_balance(self.player, e.max_balance), "(+0)"
+            self.transaction.credit(initial)
+            return initial, "(+0)"
 
-        initial = round(amount * multiplier)
-        total, amt, msg = await self.calculate_bonus(initial, player_instance, settings)
-        try:
-            await bank.deposit_credits(self.player, total)
-        except BalanceTooHigh as e:
-            await bank.set_balance(self.player, e.max_balance)
+        total, amt, msg = self.calculate_bonus(initial, self.membership, settings)
+        self.transaction.credit(total)
         return total, msg
 
     def bet_in_range(self, minimum, maximum):
@@ -299,8 +363,7 @@ class GameEngine(Database):
             return access
 
     @staticmethod
-    async def calculate_bonus(amount, player_instance, settings):
-        membership = await player_instance.Membership.Name()
+    def calculate_bonus(amount, membership, settings):
         try:
             bonus_multiplier = settings["Memberships"][membership]["Bonus"]
         except KeyError:
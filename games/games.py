@@ -9,7 +9,19 @@ from collections import Counter, deque
 from enum import Enum
 from operator import itemgetter
 from random import choice
-from typing import Any, Dict, Final, Iterable, List, Literal, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
 import discord
 import schema
@@ -25,11 +37,19 @@ from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
 from tabulate import tabulate
 
 from . import utils
+from .cache import TriviaListCache
 from .casino import Blackjack, Core, Double, War
 from .checks import trivia_stop_check
 from .converters import finite_float
 from .data import Database
-from .session import TriviaSession
+from .rankings import (
+    ALL_GAMES,
+    METRICS,
+    TRIVIA_PRIORITY,
+    TriviaRankingIndex,
+    TriviaRankings,
+)
+from .session import TriviaSession, _parse_answers
 from .triviaschema import TRIVIA_LIST_SCHEMA, format_schema_error
 from .utils import is_input_unsupported
 
@@ -38,6 +58,11 @@ __all__ = ["get_core_lists"]
 log = logging.getLogger("red.angiedale.games")
 
 _SCHEMA_VERSION: Final[int] = 2
+MEMBERSHIP_BATCH_SIZE: Final[int] = 100
+MAX_SLOT_SPINS: Final[int] = 25
+CORE_LISTS_PATH: Final[pathlib.Path] = pathlib.Path(__file__).parent.resolve() / "data/lists"
+# Keys of a trivia list that aren't questions
+TRIVIA_LIST_META_KEYS: Final[Tuple[str, ...]] = ("$schema", "AUTHOR", "CONFIG")
 
 
 def is_owner_if_bank_global():
@@ -144,6 +169,39 @@ SLOT_PAYOUTS_MSG = (
 ).format(**SMReel.__dict__)
 
 
+def spin_slot() -> Tuple[Tuple[SMReel, SMReel, SMReel], ...]:
+    """Spins the three reels and returns the three rows they show, the middle one pays."""
+    default_reel = deque(cast(Iterable, SMReel))
+    reels = []
+    for i in range(3):
+        default_reel.rotate(random.randint(-999, 999))  # weeeeee
+        new_reel = deque(default_reel, maxlen=3)  # we need only 3 symbols
+        reels.append(new_reel)  # for each reel
+    return (
+        (reels[0][0], reels[1][0], reels[2][0]),
+        (reels[0][1], reels[1][1], reels[2][1]),
+        (reels[0][2], reels[1][2], reels[2][2]),
+    )
+
+
+def slot_payout(line: Tuple[SMReel, SMReel, SMReel]) -> Optional[Dict[str, Any]]:
+    """The entry in PAYOUTS that the middle row of a spin wins, if any."""
+    payout = PAYOUTS.get(line)
+    if not payout:
+        # Checks for two-consecutive-symbols special rewards
+        payout = PAYOUTS.get((line[0], line[1]), PAYOUTS.get((line[1], line[2])))
+    if not payout:
+        # Still nothing. Let's check for 3 generic same symbols
+        # or 2 consecutive symbols
+        has_three = line[0] == line[1] == line[2]
+        has_two = (line[0] == line[1]) or (line[1] == line[2])
+        if has_three:
+            payout = PAYOUTS["3 symbols"]
+        elif has_two:
+            payout = PAYOUTS["2 symbols"]
+    return payout
+
+
 def guild_only_check():
     async def pred(ctx: commands.Context):
         if await bank.is_global():
@@ -188,7 +246,11 @@ class Games(Database, commands.Cog):
         super().__init__()
         self.bot = bot
         self._cycle_task = asyncio.create_task(self.membership_updater())
-        self.trivia_sessions = []
+        # Channel id: the trivia session running in it
+        self.trivia_sessions: Dict[int, TriviaSession] = {}
+        self.trivia_lists = TriviaListCache(load_list)
+        self._trivia_prewarm_task = None
+        self._refund_task = None
         self.triviaconfig = Config.get_conf(
             self, identifier=1387000, cog_name="GamesTrivia", force_registration=True
         )
@@ -204,6 +266,9 @@ class Games(Database, commands.Cog):
         )
 
         self.triviaconfig.register_member(wins=0, games=0, total_score=0)
+        self.trivia_rankings = TriviaRankings(
+            self.triviaconfig, lambda guild_id: self.bot.get_guild(guild_id) is not None
+        )
 
         self.economyconfig = Config.get_conf(self, identifier=1387000, cog_name="Economy")
 
@@ -213,6 +278,17 @@ class Games(Database, commands.Cog):
                 from_version=await self.config.schema_version(), to_version=_SCHEMA_VERSION
             )
         )
+        self._trivia_prewarm_task = asyncio.create_task(self._prewarm_trivia_lists())
+        self._refund_task = asyncio.create_task(self.refund_interrupted_bets())
+
+    async def _prewarm_trivia_lists(self) -> None:
+        """Loads every trivia list into the cache, off the event loop."""
+        loop = asyncio.get_running_loop()
+        for path in self._all_lists():
+            try:
+                await loop.run_in_executor(None, self.trivia_lists.get, path)
+            except (OSError, InvalidListError) as exc:
+                log.warning("Could not load the trivia list %s: %s", path.stem, exc)
 
     async def red_delete_data_for_user(
         self,
@@ -225,6 +301,7 @@ class Games(Database, commands.Cog):
         async for guild_id, guild_data in AsyncIter(all_members2.items(), steps=100):
             if user_id in guild_data:
                 await super().config.member_from_ids(guild_id, user_id).clear()
+        self.rankings.clear()
 
         if requester != "discord_deleted_user":
             return
@@ -234,6 +311,7 @@ class Games(Database, commands.Cog):
         async for guild_id, guild_data in AsyncIter(all_members1.items(), steps=100):
             if user_id in guild_data:
                 await self.triviaconfig.member_from_ids(guild_id, user_id).clear()
+        self.trivia_rankings.clear()
 
     async def cog_before_invoke(self, ctx: commands.Context) -> None:
         if not self.cog_ready_event.is_set():
@@ -538,6 +616,7 @@ class Games(Database, commands.Cog):
         filepath = cog_data_path(self) / f"{name}.yaml"
         if filepath.exists():
             filepath.unlink()
+            self.trivia_lists.discard(filepath.resolve())
             await ctx.send(("Trivia {filename} was deleted.").format(filename=filepath.stem))
         else:
             await ctx.send(("Trivia file was not found."))
@@ -592,7 +671,7 @@ class Games(Database, commands.Cog):
             settings.update(config)
         settings["lists"] = dict(zip(categories, reversed(authors)))
         session = TriviaSession.start(ctx, trivia_dict, settings)
-        self.trivia_sessions.append(session)
+        self.trivia_sessions[ctx.channel.id] = session
         log.debug("New trivia session; #%s in %d", ctx.channel, ctx.guild.id)
 
     @trivia_stop_check()
@@ -664,11 +743,8 @@ class Games(Database, commands.Cog):
                 ).format(field_name=sort_by, prefix=ctx.clean_prefix)
             )
             return
-        guild = ctx.guild
-        data = await self.triviaconfig.all_members(guild)
-        data = {guild.get_member(u): d for u, d in data.items()}
-        data.pop(None, None)  # remove any members which aren't in the guild
-        await self.send_leaderboard(ctx, data, key, top)
+        index = await self.trivia_rankings.get(ctx.guild.id)
+        await self.send_leaderboard(ctx, index, key, top, ctx.guild.get_member)
 
     @trivia_leaderboard.command(name="global")
     async def trivia_leaderboard_global(
@@ -693,21 +769,8 @@ class Games(Database, commands.Cog):
                 ).format(field_name=sort_by, prefix=ctx.clean_prefix)
             )
             return
-        data = await self.triviaconfig.all_members()
-        collated_data = {}
-        for guild_id, guild_data in data.items():
-            guild = ctx.bot.get_guild(guild_id)
-            if guild is None:
-                continue
-            for member_id, member_data in guild_data.items():
-                member = guild.get_member(member_id)
-                if member is None:
-                    continue
-                collated_member_data = collated_data.get(member, Counter())
-                for v_key, value in member_data.items():
-                    collated_member_data[v_key] += value
-                collated_data[member] = collated_member_data
-        await self.send_leaderboard(ctx, collated_data, key, top)
+        index = await self.trivia_rankings.get(None)
+        await self.send_leaderboard(ctx, index, key, top, ctx.bot.get_user)
 
     @staticmethod
     def _get_sort_key(key: str):
@@ -719,21 +782,30 @@ class Games(Database, commands.Cog):
         elif key in ("total", "score", "answers", "correct"):
             return "total_score"
 
-    async def send_leaderboard(self, ctx: commands.Context, data: dict, key: str, top: int):
-        """Send the leaderboard from the given data.
+    async def send_leaderboard(
+        self,
+        ctx: commands.Context,
+        index: TriviaRankingIndex,
+        key: str,
+        top: int,
+        get_member: Callable[[int], Optional[discord.abc.User]],
+    ):
+        """Send the leaderboard from the given ranking index.
 
         Parameters
         ----------
         ctx : commands.Context
             The context to send the leaderboard to.
-        data : dict
-            The data for the leaderboard. This must map `discord.Member` ->
-            `dict`.
+        index : TriviaRankingIndex
+            The ranked stats of the leaderboard's players.
         key : str
             The field to sort the data by. Can be ``wins``, ``total_score``,
             ``games`` or ``average_score``.
         top : int
             The number of members to display on the leaderboard.
+        get_member : Callable
+            Gets the member or user of a player id, players it returns `None`
+            for are left out.
 
         Returns
         -------
@@ -741,34 +813,29 @@ class Games(Database, commands.Cog):
             The sent leaderboard messages.
 
         """
+        if key not in TRIVIA_PRIORITY:
+            raise ValueError(f"{key} is not a valid key.")
+        data = {}
+        for player_id in index.iter_players(key):
+            member = get_member(player_id)
+            if member is None:
+                continue
+            data[member] = index.stats(player_id)
+            if len(data) >= top:
+                break
         if not data:
             await ctx.send(("There are no scores on record!"))
             return
-        leaderboard = self._get_leaderboard(data, key, top)
+        leaderboard = self._get_leaderboard(data, top)
         ret = []
         for page in pagify(leaderboard, shorten_by=10):
             ret.append(await ctx.send(box(page, lang="py")))
         return ret
 
     @staticmethod
-    def _get_leaderboard(data: dict, key: str, top: int):
-        # Mix in average score
-        for member, stats in data.items():
-            if stats["games"] != 0:
-                stats["average_score"] = stats["total_score"] / stats["games"]
-            else:
-                stats["average_score"] = 0.0
-        # Sort by reverse order of priority
-        priority = ["average_score", "total_score", "wins", "games"]
-        try:
-            priority.remove(key)
-        except ValueError:
-            raise ValueError(f"{key} is not a valid key.")
-        # Put key last in reverse priority
-        priority.append(key)
+    def _get_leaderboard(data: dict, top: int):
+        # Members are already in rank order
         items = data.items()
-        for key in priority:
-            items = sorted(items, key=lambda t: t[1][key], reverse=True)
         max_name_len = max(map(lambda m: len(str(m)), data.keys()))
         # Headers
         headers = (
@@ -819,11 +886,18 @@ class Games(Database, commands.Cog):
         """
         channel = session.ctx.channel
         log.debug("Ending trivia session; #%s in %s", channel, channel.guild.id)
-        if session in self.trivia_sessions:
-            self.trivia_sessions.remove(session)
+        if self.trivia_sessions.get(channel.id) is session:
+            del self.trivia_sessions[channel.id]
         if session.scores:
             await self.update_leaderboard(session)
 
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Hands messages to the trivia session running in their channel, if any."""
+        session = self.trivia_sessions.get(message.channel.id)
+        if session is not None:
+            session.receive(message)
+
     async def update_leaderboard(self, session):
         """Update the leaderboard with the given scores.
 
@@ -834,15 +908,32 @@ class Games(Database, commands.Cog):
 
         """
         max_score = session.settings["max_score"]
-        for member, score in session.scores.items():
-            if member.id == session.ctx.bot.user.id:
-                continue
-            stats = await self.triviaconfig.member(member).all()
-            if score == max_score:
-                stats["wins"] += 1
-            stats["total_score"] += score
-            stats["games"] += 1
-            await self.triviaconfig.member(member).set(stats)
+        results = [
+            (member, int(score == max_score), score)
+            for member, score in session.scores.items()
+            if member.id != session.ctx.bot.user.id
+        ]
+        if not results:
+            return
+        groups = [self.triviaconfig.member(member) for member, _, _ in results]
+        old_stats = await asyncio.gather(*(group.all() for group in groups))
+        new_stats = [
+            {
+                "wins": stats["wins"] + wins,
+                "games": stats["games"] + 1,
+                "total_score": stats["total_score"] + score,
+            }
+            for stats, (_, wins, score) in zip(old_stats, results)
+        ]
+        try:
+            await asyncio.gather(*(group.set(stats) for group, stats in zip(groups, new_stats)))
+        except Exception:
+            # Some of the writes may have gone through, reload the leaderboards when next shown
+            self.trivia_rankings.drop(session.ctx.guild.id)
+            self.trivia_rankings.drop(None)
+            raise
+        for member, wins, score in results:
+            self.trivia_rankings.update(member.guild.id, member.id, wins, 1, score)
 
     def get_trivia_list(self, category: str) -> dict:
         """Get the trivia list corresponding to the given category.
@@ -855,7 +946,8 @@ class Games(Database, commands.Cog):
         Returns
         -------
         `dict`
-            A dict mapping questions (`str`) to answers (`list` of `str`).
+            A dict mapping questions (`str`) to answers (`tuple` of `str`).
+            It's shared with the cache and must not be modified.
 
         """
         try:
@@ -863,7 +955,7 @@ class Games(Database, commands.Cog):
         except StopIteration:
             raise FileNotFoundError("Could not find the `{}` category.".format(category))
 
-        return get_list(path)
+        return self.trivia_lists.get(path)
 
     async def _save_trivia_list(
         self, ctx: commands.Context, attachment: discord.Attachment
@@ -940,6 +1032,7 @@ class Games(Database, commands.Cog):
                 )
             )
             return
+        self.trivia_lists.store(file.resolve(), compile_list(trivia_dict))
 
         await ctx.send(("Saved Trivia list as {filename}.").format(filename=filename))
 
@@ -949,22 +1042,22 @@ class Games(Database, commands.Cog):
             discord.TextChannel, discord.VoiceChannel, discord.StageChannel, discord.Thread
         ],
     ) -> TriviaSession:
-        return next(
-            (session for session in self.trivia_sessions if session.ctx.channel == channel), None
-        )
+        return self.trivia_sessions.get(channel.id)
 
     def _all_lists(self) -> List[pathlib.Path]:
-        personal_lists = [p.resolve() for p in cog_data_path(self).glob("*.yaml")]
-
-        return personal_lists + get_core_lists()
+        return self.trivia_lists.paths((cog_data_path(self).resolve(), CORE_LISTS_PATH))
 
     def cog_unload(self):
-        for session in self.trivia_sessions:
+        for session in self.trivia_sessions.values():
             session.force_stop()
 
-        self.cycle_task.cancel()
+        self._cycle_task.cancel()
         if self.migration_task:
             self.migration_task.cancel()
+        if self._trivia_prewarm_task:
+            self._trivia_prewarm_task.cancel()
+        if self._refund_task:
+            self._refund_task.cancel()
 
     @commands.command()
     @commands.guild_only()
@@ -1086,9 +1179,37 @@ class Games(Database, commands.Cog):
 
         - `<bid>` The amount to bet on the slot machine. Winning payouts are higher when you bet more.
         """
+        if await self._slot_conditions(ctx, bid):
+            await self.slot_machine(ctx.author, ctx.channel, bid)
+
+    @commands.command(name="multislot", aliases=["slots"])
+    @guild_only_check()
+    async def multi_slot(self, ctx: commands.Context, bid: int, spins: int):
+        """Spin the slot machine several times in a row.
+
+        Every spin has the same odds as `[p]slot`, they are all paid out at once
+        and put you on cooldown for as long as that many single spins would.
+
+        Example:
+        - `[p]multislot 50 10`
+
+        **Arguments**
+
+        - `<bid>` The amount to bet on each spin.
+        - `<spins>` How many times to spin, up to 25.
+        """
+        if not 1 <= spins <= MAX_SLOT_SPINS:
+            await ctx.send(
+                ("You can spin between 1 and {max_spins} times.").format(max_spins=MAX_SLOT_SPINS)
+            )
+            return
+        if await self._slot_conditions(ctx, bid, spins):
+            await self.multi_slot_machine(ctx.author, ctx.channel, bid, spins)
+
+    async def _slot_conditions(self, ctx: commands.Context, bid: int, spins: int = 1) -> bool:
+        """Checks the player can bet `bid` on `spins` spins, and puts them on cooldown if so."""
         author = ctx.author
         guild = ctx.guild
-        channel = ctx.channel
         if await bank.is_global():
             valid_bid = (
                 await self.economyconfig.SLOT_MIN() <= bid <= await self.economyconfig.SLOT_MAX()
@@ -1107,32 +1228,24 @@ class Games(Database, commands.Cog):
 
         if (now - last_slot) < slot_time:
             await ctx.send(("You're on cooldown, try again in a bit."))
-            return
+            return False
         if not valid_bid:
             await ctx.send(("That's an invalid bid amount, sorry :/"))
-            return
-        if not await bank.can_spend(author, bid):
+            return False
+        if not await bank.can_spend(author, bid * spins):
             await ctx.send(("You ain't got enough money, friend."))
-            return
+            return False
+        # Every spin after the first one adds a cooldown
+        now += slot_time * (spins - 1)
         if await bank.is_global():
             await self.economyconfig.user(author).last_slot.set(now)
         else:
             await self.economyconfig.member(author).last_slot.set(now)
-        await self.slot_machine(author, channel, bid)
+        return True
 
     @staticmethod
     async def slot_machine(author, channel, bid):
-        default_reel = deque(cast(Iterable, SMReel))
-        reels = []
-        for i in range(3):
-            default_reel.rotate(random.randint(-999, 999))  # weeeeee
-            new_reel = deque(default_reel, maxlen=3)  # we need only 3 symbols
-            reels.append(new_reel)  # for each reel
-        rows = (
-            (reels[0][0], reels[1][0], reels[2][0]),
-            (reels[0][1], reels[1][1], reels[2][1]),
-            (reels[0][2], reels[1][2], reels[2][2]),
-        )
+        rows = spin_slot()
 
         slot = "~~\n~~"  # Mobile friendly
         for i, row in enumerate(rows):  # Let's build the slot to show
@@ -1143,19 +1256,7 @@ class Games(Database, commands.Cog):
                 sign, *[c.value for c in row]  # pylint: disable=no-member
             )
 
-        payout = PAYOUTS.get(rows[1])
-        if not payout:
-            # Checks for two-consecutive-symbols special rewards
-            payout = PAYOUTS.get((rows[1][0], rows[1][1]), PAYOUTS.get((rows[1][1], rows[1][2])))
-        if not payout:
-            # Still nothing. Let's check for 3 generic same symbols
-            # or 2 consecutive symbols
-            has_three = rows[1][0] == rows[1][1] == rows[1][2]
-            has_two = (rows[1][0] == rows[1][1]) or (rows[1][1] == rows[1][2])
-            if has_three:
-                payout = PAYOUTS["3 symbols"]
-            elif has_two:
-                payout = PAYOUTS["2 symbols"]
+        payout = slot_payout(rows[1])
 
         pay = 0
         if payout:
@@ -1199,6 +1300,59 @@ class Games(Database, commands.Cog):
             )
         )
 
+    @staticmethod
+    async def multi_slot_machine(author, channel, bid, spins):
+        # How many spins won each multiplier
+        wins = Counter()
+        pay = 0
+        for _ in range(spins):
+            payout = slot_payout(spin_slot()[1])
+            if payout:
+                multiplier = payout["payout"](1)
+                wins[multiplier] += 1
+                pay += payout["payout"](bid)
+
+        cost = bid * spins
+        then = await bank.get_balance(author)
+        now = then - cost + pay
+        try:
+            await bank.set_balance(author, now)
+        except errors.BalanceTooHigh as exc:
+            await bank.set_balance(author, exc.max_balance)
+            now = exc.max_balance
+            await channel.send(
+                (
+                    "You've reached the maximum amount of {currency}! "
+                    "Please spend some more \N{GRIMACING FACE}\n{old_balance} -> {new_balance}!"
+                ).format(
+                    currency=await bank.get_currency_name(getattr(channel, "guild", None)),
+                    old_balance=humanize_number(then),
+                    new_balance=humanize_number(exc.max_balance),
+                )
+            )
+
+        results = [
+            ("Bet * {multiplier}: {count}").format(multiplier=multiplier, count=count)
+            for multiplier, count in sorted(wins.items(), reverse=True)
+        ]
+        results.append(("Nothing: {count}").format(count=spins - sum(wins.values())))
+        await channel.send(
+            (
+                "{author.mention} spun the slot machine {spins} times!\n{results}\n\n"
+                + ("Your bids: {spins} * {bid}")
+                + ("\n{old_balance} - {cost} (Your bids) + {pay} (Winnings) → {new_balance}!")
+            ).format(
+                author=author,
+                spins=spins,
+                results=box("\n".join(results)),
+                bid=humanize_number(bid),
+                cost=humanize_number(cost),
+                old_balance=humanize_number(then),
+                new_balance=humanize_number(now),
+                pay=humanize_number(pay),
+            )
+        )
+
     @commands.command()
     @guild_only_check()
     async def slotpayout(self, ctx: commands.Context):
@@ -1550,6 +1704,92 @@ class Games(Database, commands.Cog):
         embed.set_footer(text=disclaimer)
         await ctx.send(embed=embed)
 
+    @casino.command(name="leaderboard", aliases=["lboard"])
+    async def casino_leaderboard(
+        self, ctx: commands.Context, sort_by: str = "net", game: str = ALL_GAMES, top: int = 10
+    ):
+        """Shows the casino's top players.
+
+        `<sort_by>` can be any of the following fields:
+         - `played`  : games played
+         - `wins`    : games won
+         - `winrate` : percentage of games won, after 10 games
+         - `net`     : credits won minus credits lost
+
+        `<game>` is the game to rank players in, all games by default.
+        `<top>` is the number of ranks to show on the leaderboard.
+
+        Net profit only counts bets settled since it started being tracked.
+        """
+        metric = self._get_casino_sort_key(sort_by)
+        if metric is None:
+            return await ctx.send(
+                (
+                    "Unknown field `{field_name}`, see `{prefix}help casino leaderboard` "
+                    "for valid fields to sort by."
+                ).format(field_name=sort_by, prefix=ctx.clean_prefix)
+            )
+        if top < 1:
+            return await ctx.send(("The number of ranks to show must be at least 1."))
+        settings = await super().get_settings(ctx)
+        games = {name.lower(): name for name in settings["Games"]}
+        games[ALL_GAMES.lower()] = ALL_GAMES
+        try:
+            game = games[game.lower()]
+        except KeyError:
+            return await ctx.send(
+                ("Unknown game `{}`. Accepted games are:\n{}.").format(
+                    game, utils.fmt_join(sorted(games.values()))
+                )
+            )
+
+        scope = await super().casino_scope(ctx)
+        index = await self.rankings.get(scope)
+        table = []
+        for player_id in index.iter_players(metric, game):
+            if scope is None:
+                player = ctx.bot.get_user(player_id)
+            else:
+                player = ctx.guild.get_member(player_id)
+            if player is None:
+                continue
+            played, won, net = index.totals(player_id, game)
+            table.append(
+                (
+                    len(table) + 1,
+                    str(player),
+                    humanize_number(played),
+                    humanize_number(won),
+                    "{:.1%}".format(won / played),
+                    humanize_number(net),
+                )
+            )
+            if len(table) >= top:
+                break
+
+        if not table:
+            return await ctx.send(("There are no players on record!"))
+        headers = ("Rank", "Player", "Played", "Won", "Win %", "Net")
+        msg = "{} Casino | {}\n\n{}".format(
+            settings["Settings"]["Casino_Name"], game, tabulate(table, headers=headers)
+        )
+        for page in pagify(msg, shorten_by=10):
+            await ctx.send(box(page, lang="md"))
+
+    @staticmethod
+    def _get_casino_sort_key(key: str):
+        key = key.lower()
+        if key in METRICS:
+            return key
+        elif key in ("games", "plays"):
+            return "played"
+        elif key in ("won", "win"):
+            return "wins"
+        elif key in ("rate", "win%", "%"):
+            return "winrate"
+        elif key in ("profit", "credits"):
+            return "net"
+
     @casino.command()
     @commands.max_concurrency(1, commands.BucketType.guild)
     @commands.admin_or_permissions(administrator=True)
@@ -1587,6 +1827,7 @@ class Games(Database, commands.Cog):
 
         current = await self.old_message_cache.get_guild(guild=ctx.guild)
         await self.old_message_cache.set_guild(guild=ctx.guild, set_to=not current)
+        self.settings_changed(ctx)
 
         await ctx.send(
             ("Casino message type set to {type}.").format(
@@ -1660,6 +1901,7 @@ class Games(Database, commands.Cog):
 
         settings = await super().get_data(ctx)
         await settings.Settings.Payout_Limit.set(limit)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) set the payout limit to {1}.").format(ctx.author, limit)
         await ctx.send(msg)
 
@@ -1673,6 +1915,7 @@ class Games(Database, commands.Cog):
         settings = await super().get_data(ctx)
         status = await settings.Settings.Payout_Switch()
         await settings.Settings.Payout_Switch.set(not status)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) turned the payout limit {1}.").format(
             ctx.author, "OFF" if status else "ON"
         )
@@ -1689,6 +1932,7 @@ class Games(Database, commands.Cog):
 
         status = await settings.Settings.Casino_Open()
         await settings.Settings.Casino_Open.set(not status)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) {2} the {1} Casino.").format(
             ctx.author, name, "closed" if status else "opened"
         )
@@ -1705,6 +1949,7 @@ class Games(Database, commands.Cog):
 
         settings = await super().get_data(ctx)
         await settings.Settings.Casino_Name.set(name)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) set the casino name to {1}.").format(ctx.author, name)
         await ctx.send(msg)
 
@@ -1723,6 +1968,7 @@ class Games(Database, commands.Cog):
             return
 
         await settings.Games.set_raw(game.title(), "Multiplier", value=multiplier)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) set {1}'s multiplier to {2}.").format(
             ctx.author, game.title(), multiplier
         )
@@ -1761,6 +2007,7 @@ class Games(Database, commands.Cog):
             )
 
         await settings.Games.set_raw(game.title(), "Cooldown", value=seconds)
+        self.settings_changed(ctx)
         cool = utils.cooldown_formatter(seconds)
         msg = ("{0.name} ({0.id}) set {1}'s cooldown to {2}.").format(
             ctx.author, game.title(), cool
@@ -1786,6 +2033,7 @@ class Games(Database, commands.Cog):
             return await ctx.send(("You can't set a minimum higher than the game's maximum bid."))
 
         await settings.Games.set_raw(game.title(), "Min", value=minimum)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) set {1}'s minimum bid to {2}.").format(
             ctx.author, game.title(), minimum
         )
@@ -1810,6 +2058,7 @@ class Games(Database, commands.Cog):
             return await ctx.send(("You can't set a maximum lower than the game's minimum bid."))
 
         await settings.Games.set_raw(game.title(), "Max", value=maximum)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) set {1}'s maximum bid to {2}.").format(
             ctx.author, game.title(), maximum
         )
@@ -1831,6 +2080,7 @@ class Games(Database, commands.Cog):
             return await ctx.send(("Go home. You're drunk."))
 
         await data.Games.set_raw(game.title(), "Access", value=access)
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) changed the access level for {1} to {2}.").format(
             ctx.author, game, access
         )
@@ -1846,6 +2096,7 @@ class Games(Database, commands.Cog):
 
         status = await instance.Games.get_raw(game.title(), "Open")
         await instance.Games.set_raw(game.title(), "Open", value=(not status))
+        self.settings_changed(ctx)
         msg = ("{0.name} ({0.id}) {2} the game {1}.").format(
             ctx.author, game, "closed" if status else "opened"
         )
@@ -1865,99 +2116,152 @@ class Games(Database, commands.Cog):
             log.error("Casino error in membership_updater:\n", exc_info=True)
 
     async def global_updater(self):
-        while True:
-            users = await self.config.all_users()
-            if not users:
-                break
-            memberships = await self.config.Memberships.all()
-            if not memberships:
-                break
-            for user in users:
-                user_obj = self.bot.get_user(user)
-                if not user_obj:
-                    # user isn't in the cache so we can probably
-                    # ignore them without issue
-                    continue
-                async with self.config.user(user_obj).Membership() as user_data:
-                    if user_data["Name"] not in memberships:
-                        user_data["Name"] = "Basic"
-                        user_data["Assigned"] = False
-                await self.process_user(memberships, user_obj, _global=True)
-            break
+        users = await self.config.all_users()
+        if not users:
+            return
+        tiers = await self.settings_cache.tiers(None)
+        if not tiers:
+            return
+        balances = await self.get_balances()
+        if balances is None:
+            return
+
+        changes = []
+        for user, user_data in users.items():
+            user_obj = self.bot.get_user(user)
+            if not user_obj:
+                # user isn't in the cache so we can probably
+                # ignore them without issue
+                continue
+            balance = balances.get(user)
+            if balance is None:
+                balance = await bank.get_balance(user_obj)
+            membership = tiers.qualify(user_obj, balance, _global=True)
+            if self.membership_changed(user_data["Membership"], membership):
+                changes.append((self.config.user(user_obj), membership))
+        await self.write_memberships(changes)
 
     async def local_updater(self):
-        while True:
-            guilds = await self.config.all_guilds()
-            if not guilds:
-                break
-            for guild in guilds:
-                guild_obj = self.bot.get_guild(guild)
-                if not guild_obj:
-                    continue
-                users = await self.config.all_members(guild_obj)
-                if not users:
-                    continue
-                memberships = await self.config.guild(guild_obj).Memberships.all()
-                if not memberships:
+        guilds = await self.config.all_guilds()
+        for guild in guilds:
+            guild_obj = self.bot.get_guild(guild)
+            if not guild_obj:
+                continue
+            users = await self.config.all_members(guild_obj)
+            if not users:
+                continue
+            tiers = await self.settings_cache.tiers(guild_obj)
+            if not tiers:
+                continue
+            balances = await self.get_balances(guild_obj)
+            if balances is None:
+                continue
+
+            changes = []
+            for user, user_data in users.items():
+                user_obj = guild_obj.get_member(user)
+                if not user_obj:
                     continue
-                for user in users:
-                    user_obj = guild_obj.get_member(user)
-                    if not user_obj:
-                        continue
-                    async with self.config.member(user_obj).Membership() as user_data:
-                        if user_data["Name"] not in memberships:
-                            user_data["Name"] = "Basic"
-                            user_data["Assigned"] = False
-                    await self.process_user(memberships, user_obj)
-            break
-
-    async def process_user(self, memberships, user, _global=False):
-        qualified = []
+                balance = balances.get(user)
+                if balance is None:
+                    balance = await bank.get_balance(user_obj)
+                membership = tiers.qualify(user_obj, balance)
+                if self.membership_changed(user_data["Membership"], membership):
+                    changes.append((self.config.member(user_obj), membership))
+            await self.write_memberships(changes)
+
+    async def get_balances(self, guild=None):
+        """Every balance in the bank in one go, or None if the bank doesn't match the casino."""
         try:
-            bal = await bank.get_balance(user)
-        except AttributeError:
+            return {
+                user_id: account["balance"]
+                for user_id, account in await bank.get_leaderboard(guild=guild)
+            }
+        except TypeError:
             log.error(
                 "Casino is in global mode, while economy is in local mode. "
                 "Economy must be global if Casino is global. Either change casino "
                 "back to local with the casinoset mode command or make your economy "
                 "global with the bankset toggleglobal command."
             )
-            return
-        for name, requirements in memberships.items():
-            if _global:
-                if requirements["Credits"] and bal < requirements["Credits"]:
-                    continue
-                elif (
-                    requirements["DOS"]
-                    and requirements["DOS"] > (user.created_at.now() - user.created_at).days
-                ):
-                    continue
-                else:
-                    qualified.append((name, requirements["Access"]))
-            else:
-                role_list = [x.name for x in user.roles]
-                role_list += [x.mention for x in user.roles]
-                if requirements["Credits"] and bal < requirements["Credits"]:
-                    continue
-                elif requirements["Role"] and requirements["Role"] not in role_list:
-                    continue
-                elif (
-                    requirements["DOS"]
-                    and requirements["DOS"] > (user.joined_at.now() - user.joined_at).days
-                ):
+            return None
+
+    @staticmethod
+    def membership_changed(current, membership):
+        return current["Name"] != membership or current["Assigned"]
+
+    @staticmethod
+    async def write_memberships(changes):
+        """Writes the memberships that moved, a batch at a time."""
+        for i in range(0, len(changes), MEMBERSHIP_BATCH_SIZE):
+            await asyncio.gather(
+                *(
+                    group.Membership.set({"Name": membership, "Assigned": False})
+                    for group, membership in changes[i : i + MEMBERSHIP_BATCH_SIZE]
+                )
+            )
+
+    async def refund_interrupted_bets(self):
+        """Refunds the stakes of the bets that were still open when the bot last stopped.
+
+        Players that can't be found get theirs back when they next bet.
+        """
+        await self.bot.wait_until_red_ready()
+        await self.cog_ready_event.wait()
+        players = []
+        if await super().casino_is_global():
+            # With a bank per guild, which one the stakes came from isn't known
+            if not await bank.is_global():
+                return
+            for user_id, data in (await self.config.all_users()).items():
+                if data["Open_Bets"]:
+                    players.append((None, self.bot.get_user(user_id)))
+        else:
+            for guild_id, members in (await self.config.all_members()).items():
+                guild = self.bot.get_guild(guild_id)
+                if guild is None:
                     continue
-                else:
-                    qualified.append((name, requirements["Access"]))
+                for member_id, data in members.items():
+                    if data["Open_Bets"]:
+                        players.append((guild_id, guild.get_member(member_id)))
+
+        for scope, player in players:
+            if player is None:
+                continue
+            group = self.config.user(player) if scope is None else self.config.member(player)
+            key = (scope, player.id)
+            try:
+                async with self.ledger.lock(key):
+                    await self.ledger.refund_interrupted(key, player, group)
+            except Exception:
+                log.error(f"Casino error refunding the bets of {player.id}:\n", exc_info=True)
 
-        membership = max(qualified, key=itemgetter(1))[0] if qualified else "Basic"
-        if _global:
-            async with self.config.user(user).Membership() as data:
-                data["Name"] = membership
-                data["Assigned"] = False
+    @commands.Cog.listener()
+    async def on_red_bank_set_balance(self, payload):
+        """Moves a player to their new membership as soon as their balance crosses a tier."""
+        if not self.cog_ready_event.is_set():
+            return
+        user = self.bot.get_user(payload.recipient.id)
+        if user is None:
+            return
+        if await super().casino_is_global():
+            members = [(None, user)]
+        elif payload.guild is not None:
+            members = [(payload.guild, payload.guild.get_member(user.id))]
         else:
-            async with self.config.member(user).Membership() as data:
-                data["Name"] = membership
-                data["Assigned"] = False
+            members = [(guild, guild.get_member(user.id)) for guild in user.mutual_guilds]
+
+        for guild, member in members:
+            if member is None:
+                continue
+            tiers = await self.settings_cache.tiers(guild)
+            if not tiers.crosses(payload.recipient_old_balance, payload.recipient_new_balance):
+                continue
+            group = self.config.user(member) if guild is None else self.config.member(member)
+            current = await group.Membership()
+            membership = tiers.qualify(member, payload.recipient_new_balance, guild is None)
+            if self.membership_changed(current, membership):
+                await group.Membership.set({"Name": membership, "Assigned": False})
 
     @staticmethod
     async def basic_check(ctx, game, games, base):
@@ -2031,6 +2335,8 @@ class Membership(Database):
             await self.timeout
         except ExitProcess:
             await self.ctx.send(("Process exited."))
+        finally:
+            self.settings_changed(self.ctx)
 
     async def delete(self):
         memberships = await self.coro.all()
@@ -2432,8 +2738,7 @@ class Membership(Database):
 
 def get_core_lists() -> List[pathlib.Path]:
     """Return a list of paths for all trivia lists packaged with the bot."""
-    core_lists_path = pathlib.Path(__file__).parent.resolve() / "data/lists"
-    return list(core_lists_path.glob("*.yaml"))
+    return list(CORE_LISTS_PATH.glob("*.yaml"))
 
 
 def get_list(path: pathlib.Path) -> Dict[str, Any]:
@@ -2458,5 +2763,18 @@ def get_list(path: pathlib.Path) -> Dict[str, Any]:
     return trivia_dict
 
 
+def compile_list(trivia_dict: Dict[str, Any]) -> Dict[str, Any]:
+    """Returns a validated trivia list with its answers already parsed."""
+    return {
+        key: value if key in TRIVIA_LIST_META_KEYS else _parse_answers(value)
+        for key, value in trivia_dict.items()
+    }
+
+
+def load_list(path: pathlib.Path) -> Dict[str, Any]:
+    """Returns the trivia list at the given path in the form it's cached in."""
+    return compile_list(get_list(path))
+
+
 class ExitProcess(Exception):
     pass
@@ -0,0 +1,277 @@
+import asyncio
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import discord
+from redbot.core import Config
+
+# Players need this many games before they're ranked by win rate
+WIN_RATE_MIN_PLAYED = 10
+ALL_GAMES = "All"
+METRICS = ("played", "wins", "winrate", "net")
+
+# played, won, net
+Totals = List[int]
+Entry = Tuple[tuple, int]
+
+TRIVIA_FIELDS = ("wins", "games", "total_score")
+# The fields trivia players are ranked by when sorting on a field, most important first
+TRIVIA_PRIORITY = {
+    "wins": ("wins", "games", "total_score", "average_score"),
+    "average_score": ("average_score", "games", "wins", "total_score"),
+    "total_score": ("total_score", "games", "wins", "average_score"),
+    "games": ("games", "wins", "total_score", "average_score"),
+}
+
+
+def move(ranking: List[Entry], player: int, old_key: Optional[tuple], new_key: Optional[tuple]):
+    """Move a player in a sorted ranking from one sort key to another."""
+    if old_key is not None:
+        entry = (old_key, player)
+        index = bisect_left(ranking, entry)
+        if index < len(ranking) and ranking[index] == entry:
+            del ranking[index]
+    if new_key is not None:
+        insort(ranking, (new_key, player))
+
+
+def sort_key(metric: str, totals: Totals) -> Optional[tuple]:
+    """The key a player is ranked by, lowest first, or None if they aren't ranked."""
+    played, won, net = totals
+    if not played:
+        return None
+    if metric == "played":
+        return (-played, -won)
+    if metric == "wins":
+        return (-won, -played)
+    if metric == "winrate":
+        if played < WIN_RATE_MIN_PLAYED:
+            return None
+        return (-won / played, -played)
+    return (-net, -played)
+
+
+class RankingIndex:
+    """Casino stats of every player of one casino, with rankings kept sorted.
+
+    Rankings are built the first time they're asked for and kept up to date
+    from then on as stats come in.
+    """
+
+    def __init__(self, players: Dict[int, dict]):
+        self._totals: Dict[int, Dict[str, Totals]] = {}
+        self._rankings: Dict[Tuple[str, str], List[Entry]] = {}
+        for player, data in players.items():
+            totals = self._totals[player] = {}
+            overall = totals[ALL_GAMES] = [0, 0, 0]
+            for game, played in data.get("Played", {}).items():
+                won = data.get("Won", {}).get(game, 0)
+                net = data.get("Net", {}).get(game, 0)
+                totals[game] = [played, won, net]
+                overall[0] += played
+                overall[1] += won
+                overall[2] += net
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def totals(self, player: int, game: str = ALL_GAMES) -> Totals:
+        return self._totals.get(player, {}).get(game, [0, 0, 0])
+
+    def update(self, player: int, game: str, played: int, won: int, net: int) -> None:
+        totals = self._totals.setdefault(player, {ALL_GAMES: [0, 0, 0]})
+        for key in (game, ALL_GAMES):
+            current = totals.setdefault(key, [0, 0, 0])
+            old = list(current)
+            current[0] += played
+            current[1] += won
+            current[2] += net
+            for metric in METRICS:
+                ranking = self._rankings.get((metric, key))
+                if ranking is not None:
+                    move(ranking, player, sort_key(metric, old), sort_key(metric, current))
+
+    def ranking(self, metric: str, game: str = ALL_GAMES) -> List[Entry]:
+        try:
+            return self._rankings[(metric, game)]
+        except KeyError:
+            pass
+        if metric not in METRICS:
+            raise ValueError(f"{metric} is not a valid metric.")
+        ranking = []
+        for player, totals in self._totals.items():
+            key = sort_key(metric, totals.get(game, [0, 0, 0]))
+            if key is not None:
+                ranking.append((key, player))
+        ranking.sort()
+        self._rankings[(metric, game)] = ranking
+        return ranking
+
+    def iter_players(self, metric: str, game: str = ALL_GAMES) -> Iterator[int]:
+        """Player ids from best to worst. Don't update the index while iterating."""
+        for _, player in self.ranking(metric, game):
+            yield player
+
+
+class TriviaRankingIndex:
+    """Trivia stats of every player of one leaderboard, with rankings kept sorted."""
+
+    def __init__(self, players: Dict[int, dict]):
+        self._stats: Dict[int, dict] = {
+            player: {field: data.get(field, 0) for field in TRIVIA_FIELDS}
+            for player, data in players.items()
+        }
+        self._rankings: Dict[str, List[Entry]] = {}
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def stats(self, player: int) -> dict:
+        """The player's stats, with their average score mixed in."""
+        stats = dict(self._stats.get(player) or dict.fromkeys(TRIVIA_FIELDS, 0))
+        stats["average_score"] = stats["total_score"] / stats["games"] if stats["games"] else 0.0
+        return stats
+
+    def sort_key(self, key: str, player: int) -> tuple:
+        stats = self.stats(player)
+        return tuple(-stats[field] for field in TRIVIA_PRIORITY[key])
+
+    def update(self, player: int, wins: int, games: int, total_score: int) -> None:
+        old_keys = {
+            key: self.sort_key(key, player) if player in self._stats else None
+            for key in self._rankings
+        }
+        stats = self._stats.setdefault(player, dict.fromkeys(TRIVIA_FIELDS, 0))
+        stats["wins"] += wins
+        stats["games"] += games
+        stats["total_score"] += total_score
+        for key, ranking in self._rankings.items():
+            move(ranking, player, old_keys[key], self.sort_key(key, player))
+
+    def ranking(self, key: str) -> List[Entry]:
+        try:
+            return self._rankings[key]
+        except KeyError:
+            pass
+        if key not in TRIVIA_PRIORITY:
+            raise ValueError(f"{key} is not a valid key.")
+        ranking = sorted((self.sort_key(key, player), player) for player in self._stats)
+        self._rankings[key] = ranking
+        return ranking
+
+    def iter_players(self, key: str) -> Iterator[int]:
+        """Player ids from best to worst. Don't update the index while iterating."""
+        for _, player in self.ranking(key):
+            yield player
+
+
+class _Rankings(ABC):
+    """Ranking indexes loaded from config on first use, one per guild or a global one.
+
+    Stats that change while an index is loading are applied to it once it's
+    loaded, the load reading them as they were when it started.
+    """
+
+    def __init__(self, config: Config):
+        self._config: Config = config
+        self._indexes: Dict[Optional[int], object] = {}
+        self._versions: Dict[Optional[int], int] = {}
+        self._generation = 0
+        self._locks: Dict[Optional[int], asyncio.Lock] = {}
+        # Updates that came in while the index of a scope was loading
+        self._loading: Dict[Optional[int], List[tuple]] = {}
+
+    @abstractmethod
+    async def _load(self, scope: Optional[int]):
+        """Build the index of a guild, or the global one when `scope` is None, from config."""
+
+    async def get(self, scope: Optional[int]):
+        """The index of a guild, or the global one when `scope` is None."""
+        try:
+            return self._indexes[scope]
+        except KeyError:
+            pass
+
+        async with self._locks.setdefault(scope, asyncio.Lock()):
+            if scope in self._indexes:
+                return self._indexes[scope]
+            version = self.version(scope)
+            updates = self._loading[scope] = []
+            try:
+                index = await self._load(scope)
+            finally:
+                del self._loading[scope]
+            for update in updates:
+                index.update(*update)
+            # Dropped or cleared while loading, what was read might be outdated
+            if self.version(scope) == version:
+                self._indexes[scope] = index
+            return index
+
+    def version(self, scope: Optional[int]) -> Tuple[int, int]:
+        return self._generation, self._versions.get(scope, 0)
+
+    def drop(self, scope: Optional[int]) -> None:
+        """Forget an index, it's loaded again when it's needed."""
+        self._versions[scope] = self._versions.get(scope, 0) + 1
+        self._indexes.pop(scope, None)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._indexes.clear()
+
+    def _update(self, scope: Optional[int], *update) -> None:
+        index = self._indexes.get(scope)
+        if index is not None:
+            index.update(*update)
+        elif scope in self._loading:
+            self._loading[scope].append(update)
+
+
+class CasinoRankings(_Rankings):
+    """The ranking indexes of every casino, one per guild or a single global one.
+
+    An index is loaded from config the first time a leaderboard of that
+    casino is shown, after that it's only updated with settled bets.
+    """
+
+    async def _load(self, scope: Optional[int]) -> RankingIndex:
+        if scope is None:
+            return RankingIndex(await self._config.all_users())
+        return RankingIndex(await self._config.all_members(discord.Object(id=scope)))
+
+    def update(
+        self, scope: Optional[int], player: int, game: str, played: int, won: int, net: int
+    ) -> None:
+        self._update(scope, player, game, played, won, net)
+
+
+class TriviaRankings(_Rankings):
+    """The trivia leaderboards of every guild, and the global one summing them up.
+
+    Indexes are loaded from config the first time a leaderboard is shown, after
+    that they're only updated with the scores of finished sessions.
+    """
+
+    def __init__(self, config: Config, has_guild: Callable[[int], bool]):
+        super().__init__(config)
+        # Stats of guilds the bot isn't in anymore aren't counted globally
+        self._has_guild = has_guild
+
+    async def _load(self, scope: Optional[int]) -> TriviaRankingIndex:
+        if scope is not None:
+            return TriviaRankingIndex(await self._config.all_members(discord.Object(id=scope)))
+        players: Dict[int, dict] = {}
+        for guild_id, members in (await self._config.all_members()).items():
+            if not self._has_guild(guild_id):
+                continue
+            for member_id, data in members.items():
+                stats = players.setdefault(member_id, dict.fromkeys(TRIVIA_FIELDS, 0))
+                for field in TRIVIA_FIELDS:
+                    stats[field] += data.get(field, 0)
+        return TriviaRankingIndex(players)
+
+    def update(self, guild: int, player: int, wins: int, games: int, total_score: int) -> None:
+        for scope in (guild, None):
+            self._update(scope, player, wins, games, total_score)
@@ -2,6 +2,7 @@
 import asyncio
 import logging
 import random
+import re
 import time
 from collections import Counter
 
@@ -28,8 +29,8 @@ class TriviaSession:
         This object assumes the session was started in `ctx.channel`
         by `ctx.author`.
     question_list : `dict`
-        A list of tuples mapping questions (`str`) to answers (`list` of
-        `str`).
+        A list of tuples mapping questions (`str`) to answers (`tuple` of
+        `str`), already parsed by `_parse_answers` when the list was cached.
     settings : `dict`
         Settings for the trivia session, with values for the following:
          - ``max_score`` (`int`)
@@ -57,6 +58,9 @@ class TriviaSession:
         self.count = 0
         self._last_response = time.time()
         self._task = None
+        # The current question's answer check, and where a correct answer is put
+        self._check = None
+        self._answer = None
 
     @classmethod
     def start(cls, ctx, question_list, settings):
@@ -151,7 +155,6 @@ class TriviaSession:
 
         """
         for question, answers in self.question_list:
-            answers = _parse_answers(answers)
             yield question, answers
 
     async def wait_for_answer(self, answers, delay: float, timeout: float):
@@ -177,10 +180,10 @@ class TriviaSession:
             :code:`True` if the session wasn't interrupted.
 
         """
+        self._check = self.check_answer(answers)
+        self._answer = asyncio.get_running_loop().create_future()
         try:
-            message = await self.ctx.bot.wait_for(
-                "message", check=self.check_answer(answers), timeout=delay
-            )
+            message = await asyncio.wait_for(self._answer, timeout=delay)
         except asyncio.TimeoutError:
             if time.time() - self._last_response >= timeout:
                 await self.ctx.send(("Guys...? Well, I guess I'll stop then."))
@@ -213,8 +216,23 @@ class TriviaSession:
             self.scores[message.author] += 1
             reply = ("You got it {user}! **+1** to you!").format(user=message.author.display_name)
             await self.ctx.send(reply)
+        finally:
+            self._check = None
+            self._answer = None
         return True
 
+    def receive(self, message: discord.Message):
+        """Check a message sent in the session's channel against the current question.
+
+        Messages are routed here by the cog instead of every session waiting on
+        every message the bot sees.
+        """
+        answer = self._answer
+        if answer is None or answer.done():
+            return
+        if self._check(message):
+            answer.set_result(message)
+
     def check_answer(self, answers):
         """Get a predicate to check for correct answers.
 
@@ -233,7 +251,7 @@ class TriviaSession:
             The message predicate.
 
         """
-        answers = tuple(s.lower() for s in answers)
+        matcher = AnswerMatcher(answers)
 
         def _pred(message: discord.Message):
             early_exit = (
@@ -243,15 +261,7 @@ class TriviaSession:
                 return False
 
             self._last_response = time.time()
-            guess = message.content.lower()
-            guess = normalize_smartquotes(guess)
-            for answer in answers:
-                if " " in answer and answer in guess:
-                    # Exact matching, issue #331
-                    return True
-                elif any(word == answer for word in guess.split(" ")):
-                    return True
-            return False
+            return matcher.match(message.content)
 
         return _pred
 
@@ -281,6 +291,14 @@ class TriviaSession:
         channel = self.ctx.channel
         LOG.debug("Force stopping trivia session; #%s in %s", channel, channel.guild.id)
 
+    @staticmethod
+    async def _pay_winner(winner: discord.Member, payout: int):
+        LOG.debug("Paying trivia winner: %d credits --> %s", payout, winner)
+        try:
+            await bank.deposit_credits(winner, payout)
+        except errors.BalanceTooHigh as e:
+            await bank.set_balance(winner, e.max_balance)
+
     async def pay_winners(self, multiplier: float):
         """Pay the winner(s) of this trivia session.
 
@@ -309,12 +327,7 @@ class TriviaSession:
         payout = int(top_score * multiplier / len(winners))
         if payout <= 0:
             return
-        for winner in winners:
-            LOG.debug("Paying trivia winner: %d credits --> %s", payout, winner)
-            try:
-                await bank.deposit_credits(winner, payout)
-            except errors.BalanceTooHigh as e:
-                await bank.set_balance(winner, e.max_balance)
+        await asyncio.gather(*(self._pay_winner(winner, payout) for winner in winners))
         if len(winners) > 1:
             msg = (
                 "Congratulations {users}! You have each received {num} {currency} for winning!"
@@ -334,6 +347,33 @@ class TriviaSession:
         await self.ctx.send(msg)
 
 
+class AnswerMatcher:
+    """The answers to a question, compiled once to check guesses against.
+
+    Answers of a single word must be one of the words of a guess, answers
+    with spaces in them only need to appear somewhere in it (issue #331).
+    """
+
+    __slots__ = ("words", "phrases", "min_length")
+
+    def __init__(self, answers):
+        answers = {s.lower() for s in answers}
+        self.words = frozenset(answer for answer in answers if " " not in answer)
+        phrases = sorted((answer for answer in answers if " " in answer), key=len, reverse=True)
+        self.phrases = re.compile("|".join(map(re.escape, phrases))) if phrases else None
+        self.min_length = min(map(len, answers), default=0)
+
+    def match(self, content: str) -> bool:
+        guess = content.lower()
+        # Too short to contain any of the answers
+        if len(guess) < self.min_length:
+            return False
+        guess = normalize_smartquotes(guess)
+        if self.phrases is not None and self.phrases.search(guess):
+            return True
+        return not self.words.isdisjoint(guess.split(" "))
+
+
 def _parse_answers(answers):
     """Parse the raw answers to readable strings.
 
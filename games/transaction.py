@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, Optional, Set, Tuple
+from uuid import uuid4
+from weakref import WeakValueDictionary
+
+import discord
+from redbot.core import Config, bank
+from redbot.core.errors import BalanceTooHigh
+
+log = logging.getLogger("red.angiedale.games.transaction")
+
+# Guild id, or None for the global casino, and the player's id
+PlayerKey = Tuple[Optional[int], int]
+
+# The transaction of the game running in the current command, if any
+current_transaction: ContextVar[Optional["BetTransaction"]] = ContextVar(
+    "current_transaction", default=None
+)
+
+
+class PlayerLedger:
+    """Keeps track of the bets that are open but not settled yet.
+
+    Every open bet is also stored in the player's ``Open_Bets``, the ones this
+    process isn't running anymore were interrupted and get refunded.
+    """
+
+    def __init__(self):
+        self._locks: "WeakValueDictionary[PlayerKey, asyncio.Lock]" = WeakValueDictionary()
+        self._open: Dict[PlayerKey, Set["BetTransaction"]] = {}
+
+    def lock(self, key: PlayerKey) -> asyncio.Lock:
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        return lock
+
+    def bet_ids(self, key: PlayerKey) -> Set[str]:
+        return {transaction.bet_id for transaction in self._open.get(key, ())}
+
+    def open(self, transaction: "BetTransaction") -> None:
+        self._open.setdefault(transaction.key, set()).add(transaction)
+
+    def close(self, transaction: "BetTransaction") -> None:
+        transactions = self._open.get(transaction.key)
+        if transactions is None:
+            return
+        transactions.discard(transaction)
+        if not transactions:
+            del self._open[transaction.key]
+
+    async def refund_interrupted(
+        self, key: PlayerKey, player: discord.abc.User, group: Config
+    ) -> int:
+        """Refund the bets stored as open that aren't running, the caller must hold the lock.
+
+        Returns the credits refunded.
+        """
+        running = self.bet_ids(key)
+        async with group.Open_Bets() as open_bets:
+            interrupted = {
+                bet_id: bet for bet_id, bet in open_bets.items() if bet_id not in running
+            }
+            for bet_id in interrupted:
+                del open_bets[bet_id]
+        refunded = 0
+        for bet in interrupted.values():
+            log.info(
+                f"Refunding {bet['Stake']} credits to {player} ({player.id}), "
+                f"their {bet['Game']} game was interrupted before it was settled."
+            )
+            await deposit(player, bet["Stake"])
+            refunded += bet["Stake"]
+        return refunded
+
+
+class BetTransaction:
+    """Everything a single bet changes for a player.
+
+    Placing the bet withdraws the stake and saves it as open, along with the
+    game being played and its cooldown. The payout and the other stats are
+    collected while the game runs and written in one go by `commit`, which
+    closes the bet. A game that never gets settled has its stake refunded,
+    by `abandon` or, if the bot stopped, by `PlayerLedger.refund_interrupted`.
+    """
+
+    __slots__ = (
+        "ledger",
+        "key",
+        "bet_id",
+        "player",
+        "group",
+        "game",
+        "stake",
+        "payout",
+        "stats",
+        "cooldown",
+        "membership",
+        "pending_credits",
+        "settled",
+    )
+
+    def __init__(
+        self,
+        ledger: PlayerLedger,
+        key: PlayerKey,
+        player: discord.abc.User,
+        group: Config,
+        game: str,
+    ):
+        self.ledger = ledger
+        self.key = key
+        self.bet_id = uuid4().hex
+        self.player = player
+        self.group = group
+        self.game = game
+        self.stake = 0
+        self.payout = 0
+        self.stats: Counter = Counter()
+        self.cooldown: Optional[int] = None
+        self.membership: Optional[dict] = None
+        self.pending_credits: Optional[int] = None
+        self.settled = False
+
+    @property
+    def balance_delta(self) -> int:
+        return self.payout - self.stake
+
+    async def place(self, stake: int) -> None:
+        """Withdraw the stake and open the bet, the caller must hold the player's lock.
+
+        Raises `ValueError` if the player can't cover the stake.
+        """
+        await bank.withdraw_credits(self.player, stake)
+        self.stake = stake
+        try:
+            async with self.group.all() as data:
+                data["Played"][self.game] = data["Played"].get(self.game, 0) + 1
+                if self.cooldown is not None:
+                    data["Cooldowns"][self.game] = self.cooldown
+                data["Open_Bets"][self.bet_id] = {"Game": self.game, "Stake": stake}
+        except Exception:
+            await deposit(self.player, stake)
+            raise
+        self.ledger.open(self)
+
+    async def raise_stake(self, amount: int) -> None:
+        """Put `amount` more credits on this bet, raising `ValueError` if they can't be covered."""
+        async with self.ledger.lock(self.key):
+            await bank.withdraw_credits(self.player, amount)
+            try:
+                await self.group.Open_Bets.set_raw(self.bet_id, "Stake", value=self.stake + amount)
+            except Exception:
+                await deposit(self.player, amount)
+                raise
+            self.stake += amount
+
+    def credit(self, amount: int) -> None:
+        self.payout += amount
+
+    def record(self, stat: str) -> None:
+        self.stats[stat] += 1
+
+    async def commit(self) -> None:
+        """Write the player's data, closing the bet, then pay out, once."""
+        if self.settled:
+            return
+        async with self.ledger.lock(self.key):
+            async with self.group.all() as data:
+                for stat, increment in self.stats.items():
+                    data[stat][self.game] = data[stat].get(self.game, 0) + increment
+                data["Net"][self.game] = data["Net"].get(self.game, 0) + self.balance_delta
+                if self.membership is not None:
+                    data["Membership"] = self.membership
+                if self.pending_credits is not None:
+                    data["Pending_Credits"] = self.pending_credits
+                data["Open_Bets"].pop(self.bet_id, None)
+            self.settled = True
+            self.ledger.close(self)
+            await deposit(self.player, self.payout)
+
+    async def abandon(self) -> bool:
+        """Close a bet that wasn't settled, refunding its stake.
+
+        Returns whether there was a bet to close.
+        """
+        if self.settled:
+            return False
+        async with self.ledger.lock(self.key):
+            self.settled = True
+            self.ledger.close(self)
+            await self.group.Open_Bets.clear_raw(self.bet_id)
+            if self.stake:
+                log.info(
+                    f"Refunding {self.stake} credits to {self.player} ({self.player.id}), "
+                    f"their {self.game} game ended without being settled."
+                )
+                await deposit(self.player, self.stake)
+        return True
+
+
+async def deposit(player: discord.abc.User, amount: int) -> None:
+    """Deposit credits to a player, filling their account up to the maximum balance."""
+    if amount <= 0:
+        return
+    try:
+        await bank.deposit_credits(player, amount)
+    except BalanceTooHigh as e:
+        await bank.set_balance(player, e.max_balance)
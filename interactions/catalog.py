@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from pathlib import Path
+from random import randrange
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+log = logging.getLogger("red.angiedale.interactions")
+
+
+class ImageCatalog:
+    """The bundled interaction images, loaded into memory once.
+
+    Files are only stat'ed every `check_interval` seconds and only read
+    again when their modification time changed.
+    """
+
+    def __init__(self, path: Path, check_interval: float = 60):
+        self.path = path
+        self.check_interval = check_interval
+        # action: (images, mtime, last checked)
+        self._images: Dict[str, Tuple[List[str], float, float]] = {}
+
+    def load_all(self) -> None:
+        for file in self.path.glob("*.json"):
+            self.get(file.stem)
+
+    def get(self, action: str) -> List[str]:
+        """Images for `action`. Don't modify the returned list."""
+        now = time.monotonic()
+        try:
+            images, mtime, checked = self._images[action]
+        except KeyError:
+            pass
+        else:
+            if now - checked < self.check_interval:
+                return images
+            file_mtime = self._mtime(action)
+            if file_mtime == mtime:
+                self._images[action] = (images, mtime, now)
+                return images
+
+        return self._load(action, now)
+
+    def _mtime(self, action: str) -> Optional[float]:
+        try:
+            return (self.path / f"{action}.json").stat().st_mtime
+        except OSError:
+            return None
+
+    def _load(self, action: str, now: float) -> List[str]:
+        file = self.path / f"{action}.json"
+        try:
+            mtime = file.stat().st_mtime
+            with file.open("r") as f:
+                images = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Failed to load interaction images from {file}", exc_info=e)
+            images, mtime = [], None
+        self._images[action] = (images, mtime, now)
+        return images
+
+
+class NekosBuffer:
+    """Small per action buffers of nekos images, refilled in the background.
+
+    Images are used once and the buffer is topped up by `fetch` whenever
+    it drops below `watermark`, so commands never wait on the API. If a
+    refill comes back empty the action isn't tried again for `retry_after`
+    seconds.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[List[str]]],
+        watermark: int = 5,
+        retry_after: float = 300,
+    ):
+        self.fetch = fetch
+        self.watermark = watermark
+        self.retry_after = retry_after
+        self._buffers: Dict[str, Deque[str]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._retry_at: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def size(self, action: str) -> int:
+        return len(self._buffers.get(action, ()))
+
+    def pop(self, action: str, index: int) -> str:
+        buffer = self._buffers[action]
+        url = buffer[index]
+        del buffer[index]
+        self.maybe_refill(action)
+        return url
+
+    def maybe_refill(self, action: str) -> None:
+        if self.size(action) >= self.watermark or action in self._tasks:
+            return
+        if time.monotonic() < self._retry_at.get(action, 0):
+            return
+        task = asyncio.create_task(self._refill(action))
+        self._tasks[action] = task
+        task.add_done_callback(lambda _: self._tasks.pop(action, None))
+
+    async def _refill(self, action: str) -> None:
+        try:
+            urls = await self.fetch(action)
+        except Exception as e:
+            log.debug(f"Failed to refill nekos buffer for {action}", exc_info=e)
+            urls = []
+        if not urls:
+            self._retry_at[action] = time.monotonic() + self.retry_after
+            return
+        buffer = self._buffers.setdefault(action, deque())
+        known = set(buffer)
+        buffer.extend(url for url in urls if url not in known)
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+
+
+def pick_image(images: List[str], nekos: Optional[NekosBuffer], action: str) -> Optional[str]:
+    """Pick a random image out of the bundled ones and whatever nekos has buffered."""
+    buffered = nekos.size(action) if nekos is not None else 0
+    total = len(images) + buffered
+    if total == 0:
+        if nekos is not None:
+            nekos.maybe_refill(action)
+        return None
+
+    index = randrange(total)
+    if index < len(images):
+        if nekos is not None:
+            nekos.maybe_refill(action)
+        return images[index]
+    return nekos.pop(action, index - len(images))
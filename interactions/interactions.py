@@ -1,22 +1,46 @@
 import asyncio
-import json
 import logging
-from random import randint
-from typing import Optional
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Union
 
 import aiohttp
 import discord
-from bs4 import BeautifulSoup
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.data_manager import bundled_data_path
+from redbot.core.utils.chat_formatting import humanize_number
+
+from .catalog import ImageCatalog, NekosBuffer, pick_image
+from .lovecalc import LoveCalculator, love_url
 
 log = logging.getLogger("red.angiedale.interactions")
 
+INTERACTIONS = (
+    "hug",
+    "cuddle",
+    "kiss",
+    "slap",
+    "pat",
+    "lick",
+    "highfive",
+    "feed",
+    "tickle",
+    "poke",
+    "smug",
+    "bonk",
+)
+NEKOS_ACTIONS = ("hug", "cuddle", "kiss", "slap", "pat", "feed", "tickle", "poke", "smug")
+
 
 class Interactions(commands.Cog):
     """Interact with people!"""
 
+    default_user_settings = {
+        "given": {},  # action: count
+        "received": {},  # action: count
+        "given_to": {},  # target id: {action: count}
+    }
+
     def __init__(self, bot: Red):
         super().__init__()
         self.bot = bot
@@ -24,50 +48,130 @@ class Interactions(commands.Cog):
         self.statsconfig = Config.get_conf(
             self, identifier=1387000, force_registration=True, cog_name="Stats"
         )
+        self.config = Config.get_conf(
+            self, identifier=1387000, force_registration=True, cog_name="Interactions"
+        )
+        self.config.register_user(**self.default_user_settings)
         self.bonks = 0
+        # (giver id, target id, action): count. Written out by updatestats
+        self.pending_interactions: Dict[Tuple[int, Optional[int], str], int] = Counter()
+        self.unwritten_stats: Dict[int, Dict[str, Union[Counter, Dict[str, Counter]]]] = {}
 
         self.statstask: Optional[asyncio.Task] = None
 
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.images = ImageCatalog(bundled_data_path(self) / "interactions")
+        self.nekos = NekosBuffer(self.fetch_nekos_life)
+        self.love_calculator: Optional[LoveCalculator] = None
+
     async def cog_load(self) -> None:
         """Should be called straight after cog instantiation."""
         self.statstask = asyncio.create_task(self.updatestats())
 
+        self.session = aiohttp.ClientSession(headers={"Connection": "keep-alive"})
+        self.love_calculator = LoveCalculator(self.session)
+        self.images.load_all()
+        for action in NEKOS_ACTIONS:
+            self.nekos.maybe_refill(action)
+
     def cog_unload(self):
         self.statstask.cancel()
+        self.nekos.cancel()
+        if self.love_calculator:
+            self.love_calculator.cancel()
+        if self.session:
+            asyncio.create_task(self.session.close())
+        asyncio.create_task(self.flush_stats())
+
+    async def red_delete_data_for_user(self, *, requester, user_id: int):
+        for key in [key for key in self.pending_interactions if user_id in key[:2]]:
+            del self.pending_interactions[key]
+        self.unwritten_stats.pop(user_id, None)
+
+        await self.config.user_from_id(user_id).clear()
+
+        for other_id, data in (await self.config.all_users()).items():
+            if str(user_id) in data["given_to"]:
+                async with self.config.user_from_id(other_id).given_to() as given_to:
+                    given_to.pop(str(user_id), None)
 
     async def updatestats(self):
         while True:
             try:
-                if self.bonks > 0:
-                    b = await self.statsconfig.bonk()
-                    await self.statsconfig.bonk.set(b + self.bonks)
-                    self.bonks = 0
+                await self.flush_stats()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 log.exception(e, exc_info=e)
             await asyncio.sleep(60 * 10)
 
+    def record_interaction(
+        self, author: discord.abc.User, action: str, target: Optional[discord.abc.User] = None
+    ) -> None:
+        """Count an interaction. Only kept in memory until the next flush."""
+        self.pending_interactions[(author.id, target.id if target else None, action)] += 1
+        if action == "bonk":
+            self.bonks += 1
+
+    async def flush_stats(self) -> None:
+        """Write buffered interaction counts to config in one go per user."""
+        if self.bonks > 0:
+            bonks, self.bonks = self.bonks, 0
+            try:
+                b = await self.statsconfig.bonk()
+                await self.statsconfig.bonk.set(b + bonks)
+            except Exception as e:
+                self.bonks += bonks
+                log.exception("Failed to write bonk count", exc_info=e)
+
+        if not self.pending_interactions and not self.unwritten_stats:
+            return
+
+        pending, self.pending_interactions = self.pending_interactions, Counter()
+        # user id: {"given": {action: count}, "received": {...}, "given_to": {target: {...}}}
+        updates, self.unwritten_stats = self.unwritten_stats, {}
+        for (author_id, target_id, action), count in pending.items():
+            author_update = updates.setdefault(author_id, self.empty_stats_update())
+            author_update["given"][action] += count
+            if target_id is not None:
+                author_update["given_to"].setdefault(str(target_id), Counter())[action] += count
+                target_update = updates.setdefault(target_id, self.empty_stats_update())
+                target_update["received"][action] += count
+
+        for user_id, update in updates.items():
+            try:
+                async with self.config.user_from_id(user_id).all() as data:
+                    for key in ("given", "received"):
+                        for action, count in update[key].items():
+                            data[key][action] = data[key].get(action, 0) + count
+                    for target_id, actions in update["given_to"].items():
+                        target = data["given_to"].setdefault(target_id, {})
+                        for action, count in actions.items():
+                            target[action] = target.get(action, 0) + count
+            except Exception as e:
+                # Kept around and tried again on the next flush
+                self.unwritten_stats[user_id] = update
+                log.exception(f"Failed to write interaction stats for {user_id}", exc_info=e)
+
+    @staticmethod
+    def empty_stats_update() -> Dict[str, Union[Counter, Dict[str, Counter]]]:
+        return {"given": Counter(), "received": Counter(), "given_to": {}}
+
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
     async def hug(self, ctx, *, user: discord.Member):
         """Hugs a user!"""
 
         author = ctx.message.author
-        images = self.get_images("hug")
-
-        nekos = await self.fetch_nekos_life(ctx, "hug")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("hug")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} hugs {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "hug", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -75,20 +179,15 @@ class Interactions(commands.Cog):
         """Cuddles a user!"""
 
         author = ctx.message.author
-        images = self.get_images("cuddle")
-
-        nekos = await self.fetch_nekos_life(ctx, "cuddle")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("cuddle")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} cuddles {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "cuddle", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -96,20 +195,15 @@ class Interactions(commands.Cog):
         """Kiss a user!"""
 
         author = ctx.message.author
-        images = self.get_images("kiss")
-
-        nekos = await self.fetch_nekos_life(ctx, "kiss")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("kiss")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} kisses {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "kiss", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -117,20 +211,15 @@ class Interactions(commands.Cog):
         """Slaps a user!"""
 
         author = ctx.message.author
-        images = self.get_images("slap")
-
-        nekos = await self.fetch_nekos_life(ctx, "slap")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("slap")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} slaps {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "slap", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -138,20 +227,15 @@ class Interactions(commands.Cog):
         """Pats a user!"""
 
         author = ctx.message.author
-        images = self.get_images("pat")
-
-        nekos = await self.fetch_nekos_life(ctx, "pat")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("pat")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} pats {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "pat", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -159,16 +243,15 @@ class Interactions(commands.Cog):
         """Licks a user!"""
 
         author = ctx.message.author
-        images = self.get_images("lick")
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("lick", use_nekos=False)
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} licks {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "lick", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -176,17 +259,15 @@ class Interactions(commands.Cog):
         """Highfives a user!"""
 
         author = ctx.message.author
-        images = await self.get_images("highfive")
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("highfive", use_nekos=False)
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} highfives {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "highfive", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -194,20 +275,15 @@ class Interactions(commands.Cog):
         """Feeds a user!"""
 
         author = ctx.message.author
-        images = self.get_images("feed")
-
-        nekos = await self.fetch_nekos_life(ctx, "feed")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("feed")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} feeds {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "feed", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -215,20 +291,15 @@ class Interactions(commands.Cog):
         """Tickles a user!"""
 
         author = ctx.message.author
-        images = self.get_images("tickle")
-
-        nekos = await self.fetch_nekos_life(ctx, "tickle")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("tickle")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} tickles {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "tickle", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -236,20 +307,15 @@ class Interactions(commands.Cog):
         """Pokes a user!"""
 
         author = ctx.message.author
-        images = self.get_images("poke")
-
-        nekos = await self.fetch_nekos_life(ctx, "poke")
-        images.extend(nekos)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("poke")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} pokes {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "poke", user)
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -257,20 +323,15 @@ class Interactions(commands.Cog):
         """Be smug towards someone!"""
 
         author = ctx.message.author
-        images = self.get_images("smug")
-
-        smug = await self.fetch_nekos_life(ctx, "smug")
-        images.extend(smug)
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("smug")
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} is smug**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
+        self.record_interaction(author, "smug")
 
     @commands.command()
     @commands.bot_has_permissions(embed_links=True)
@@ -278,44 +339,39 @@ class Interactions(commands.Cog):
         """Bonk a user!"""
 
         author = ctx.message.author
-        images = self.get_images("bonk")
-
-        mn = len(images)
-        i = randint(0, mn - 1)
+        image = self.pick_image("bonk", use_nekos=False)
 
         # Build Embed
         embed = discord.Embed()
         embed.description = f"**{author.mention} bonks {user.mention}**"
         embed.set_footer(text="Made with the help of nekos.life")
-        embed.set_image(url=images[i])
+        embed.set_image(url=image)
         await ctx.send(embed=embed)
-        self.bonks += 1
-
-    async def fetch_nekos_life(self, ctx, rp_action):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"https://api.nekos.dev/api/v3/images/sfw/gif/{rp_action}/?count=20"
-            ) as resp:
-                try:
-                    content = await resp.json(content_type=None)
-                except (ValueError, aiohttp.ContentTypeError) as ex:
-                    log.debug("Pruned by exception, error below:")
-                    log.debug(ex)
-                    return []
+        self.record_interaction(author, "bonk", user)
+
+    async def fetch_nekos_life(self, rp_action: str) -> List[str]:
+        async with self.session.get(
+            f"https://api.nekos.dev/api/v3/images/sfw/gif/{rp_action}/?count=20"
+        ) as resp:
+            try:
+                content = await resp.json(content_type=None)
+            except (ValueError, aiohttp.ContentTypeError) as ex:
+                log.debug("Pruned by exception, error below:")
+                log.debug(ex)
+                return []
 
         if content["data"]["status"]["code"] == 200:
             return content["data"]["response"]["urls"]
+        return []
 
-    def get_images(self, interaction):
-        path = bundled_data_path
+    def get_images(self, interaction: str) -> List[str]:
+        return self.images.get(interaction)
 
-        whichjson = interaction + ".json"
-
-        new_path = path(self) / "interactions" / whichjson
-
-        with new_path.open("r") as f:
-            self.imagelist = json.load(f)
-        return self.imagelist
+    def pick_image(self, interaction: str, use_nekos: bool = True) -> Optional[str]:
+        """Random image for the interaction, without touching disk or network."""
+        return pick_image(
+            self.get_images(interaction), self.nekos if use_nekos else None, interaction
+        )
 
     @commands.command(aliases=["lovecalc", "lovercalculator"])
     async def lovers(self, ctx: commands.Context, lover: discord.Member, loved: discord.Member):
@@ -324,26 +380,17 @@ class Interactions(commands.Cog):
         x = lover.display_name
         y = loved.display_name
 
-        url = "https://www.lovecalculator.com/love.php?name1={}&name2={}".format(
-            x.replace(" ", "+"), y.replace(" ", "+")
-        )
-        async with aiohttp.ClientSession(headers={"Connection": "keep-alive"}) as session:
-            async with session.get(url, ssl=False) as response:
-                assert response.status == 200
-                resp = await response.text()
-
-        log.debug(f"{resp=}")
-        soup_object = BeautifulSoup(resp, "html.parser")
-
-        description = soup_object.find("div", class_="result__score").get_text()
+        url = love_url(x, y)
+        try:
+            description, result_text = await self.love_calculator.get(lover.id, x, loved.id, y)
+        except aiohttp.ClientError as e:
+            log.debug("Failed to reach the love calculator", exc_info=e)
+            description, result_text = None, None
 
         if description is None:
             description = "Dr. Love is busy right now"
-        else:
-            description = description.strip()
-
-        result_text = soup_object.find("div", class_="result-text").get_text()
-        result_text = " ".join(result_text.split())
+        if result_text is None:
+            result_text = ""
 
         try:
             z = description[:2]
@@ -360,3 +407,59 @@ class Interactions(commands.Cog):
             title=title, description=result_text, color=discord.Color.red(), url=url
         )
         await ctx.send(embed=em)
+
+    @commands.command(aliases=["istats"])
+    @commands.guild_only()
+    @commands.bot_has_permissions(embed_links=True)
+    async def interactionstats(self, ctx: commands.Context, action: Optional[str] = None):
+        """See who gives and receives the most interactions in this server.
+
+        Give an interaction like `hug` to only count that one.
+        """
+        if action is not None:
+            action = action.lower()
+            if action not in INTERACTIONS:
+                return await ctx.send(
+                    f"That's not an interaction. Try one of: {', '.join(INTERACTIONS)}"
+                )
+
+        def count(actions: Dict[str, int]) -> int:
+            return sum(actions.values()) if action is None else actions.get(action, 0)
+
+        given: Counter = Counter()
+        received: Counter = Counter()
+        for user_id, data in (await self.config.all_users()).items():
+            given[user_id] += count(data["given"])
+            received[user_id] += count(data["received"])
+        # Include what hasn't been written yet
+        for user_id, update in self.unwritten_stats.items():
+            given[user_id] += count(update["given"])
+            received[user_id] += count(update["received"])
+        for (author_id, target_id, pending_action), amount in self.pending_interactions.items():
+            if action is None or pending_action == action:
+                given[author_id] += amount
+                if target_id is not None:
+                    received[target_id] += amount
+
+        def leaderboard(counts: Counter) -> str:
+            lines = []
+            for user_id, amount in counts.most_common():
+                if amount <= 0:
+                    break
+                member = ctx.guild.get_member(user_id)
+                if member is None:
+                    continue
+                lines.append(
+                    f"**{len(lines) + 1}.** {member.display_name} ◈ {humanize_number(amount)}"
+                )
+                if len(lines) == 10:
+                    break
+            return "\n".join(lines) or "Nobody yet!"
+
+        embed = discord.Embed(
+            color=await ctx.embed_color(),
+            title=f"Top {action if action else 'interaction'}s in {ctx.guild.name}",
+        )
+        embed.add_field(name="Givers", value=leaderboard(given))
+        embed.add_field(name="Receivers", value=leaderboard(received))
+        await ctx.send(embed=embed)
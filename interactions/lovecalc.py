@@ -0,0 +1,99 @@
+import asyncio
+import html
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Optional, Tuple
+
+import aiohttp
+
+LOVE_URL = "https://www.lovecalculator.com/love.php?name1={}&name2={}"
+
+SCORE_PATTERN = re.compile(
+    r'<div[^>]*class="[^"]*\bresult__score\b[^"]*"[^>]*>(?P<text>.*?)</div>', re.S
+)
+RESULT_TEXT_PATTERN = re.compile(
+    r'<div[^>]*class="[^"]*\bresult-text\b[^"]*"[^>]*>(?P<text>.*?)</div>', re.S
+)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+PairKey = FrozenSet[int]
+# Love percentage and Dr. Love's note
+LoveResult = Tuple[Optional[str], Optional[str]]
+
+
+def love_url(first_name: str, second_name: str) -> str:
+    return LOVE_URL.format(first_name.replace(" ", "+"), second_name.replace(" ", "+"))
+
+
+def _element_text(pattern: re.Pattern, page: str) -> Optional[str]:
+    match = pattern.search(page)
+    if match is None:
+        return None
+    return " ".join(html.unescape(TAG_PATTERN.sub(" ", match.group("text"))).split())
+
+
+def parse_love_page(page: str) -> LoveResult:
+    """Pull the score and note out of the page without building a whole parse tree."""
+    return _element_text(SCORE_PATTERN, page), _element_text(RESULT_TEXT_PATTERN, page)
+
+
+class LoveCalculator:
+    """Looks up and remembers how much two users love each other.
+
+    Results are kept per unordered pair of users for `ttl` seconds, at
+    most `max_size` of them. Lookups for a pair that is already being
+    fetched wait on that fetch instead of starting another one.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        max_size: int = 5000,
+        ttl: float = 7 * 24 * 60 * 60,
+    ):
+        self.session = session
+        self.max_size = max_size
+        self.ttl = ttl
+        self._results: "OrderedDict[PairKey, Tuple[LoveResult, float]]" = OrderedDict()
+        self._inflight: Dict[PairKey, asyncio.Task] = {}
+
+    async def get(
+        self, first_id: int, first_name: str, second_id: int, second_name: str
+    ) -> LoveResult:
+        key = frozenset((first_id, second_id))
+
+        try:
+            result, expires_at = self._results[key]
+        except KeyError:
+            pass
+        else:
+            if time.monotonic() < expires_at:
+                self._results.move_to_end(key)
+                return result
+            del self._results[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch(key, first_name, second_name))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def cancel(self) -> None:
+        for task in self._inflight.values():
+            task.cancel()
+
+    async def _fetch(self, key: PairKey, first_name: str, second_name: str) -> LoveResult:
+        async with self.session.get(love_url(first_name, second_name), ssl=False) as response:
+            response.raise_for_status()
+            page = await response.text()
+
+        result = await asyncio.get_running_loop().run_in_executor(None, parse_love_page, page)
+
+        if result[0] is not None:
+            self._results[key] = (result, time.monotonic() + self.ttl)
+            while len(self._results) > self.max_size:
+                self._results.popitem(last=False)
+
+        return result